@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+Benchmark: Document.find_word() and Document.find() with and without the inverted index
+Usage: python3 -m bench.bench_index [corpus.tsv]
+Latest version can be found at https://github.com/neocl/itctk
+
+@author: Le Tuan Anh <tuananh.ke@gmail.com>
+'''
+
+# Copyright (c) 2016, Le Tuan Anh <tuananh.ke@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+__author__ = "Le Tuan Anh <tuananh.ke@gmail.com>"
+__copyright__ = "Copyright 2016, itctk"
+__credits__ = ["Le Tuan Anh"]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "Le Tuan Anh"
+__email__ = "<tuananh.ke@gmail.com>"
+__status__ = "Prototype"
+
+########################################################################
+
+import sys
+import time
+import timeit
+
+from itctk import itc, ITC_DATA_FILE
+
+########################################################################
+
+QUERIES = ['mem.+', 'tidak', 'monyet', '^penge.+kan$', 'Indonesia', '[0-9]+']
+
+
+def bench(doc, use_index, repeat):
+    elapsed = timeit.timeit(lambda: [doc.find_word(q, use_index=use_index) for q in QUERIES], number=repeat)
+    return elapsed / (repeat * len(QUERIES))
+
+
+def main():
+    corpus = sys.argv[1] if len(sys.argv) > 1 else ITC_DATA_FILE
+    repeat = 5
+    print("Reading %s ..." % (corpus,))
+    doc = itc(corpus, cache=False)
+    print("Sentences: {:,} - Tokens: {:,}".format(len(doc), len(doc.words)))
+    start = time.perf_counter()
+    index = doc.build_index()
+    print("Index build    : {:10.4f} s ({:,} forms)".format(time.perf_counter() - start, len(index)))
+    scan = bench(doc, False, repeat)
+    indexed = bench(doc, True, repeat)
+    print("find_word scan : {:10.6f} s/query".format(scan))
+    print("find_word index: {:10.6f} s/query (x{:.1f})".format(indexed, scan / indexed))
+    scan = timeit.timeit(lambda: [doc.find(q, use_index=False) for q in QUERIES], number=repeat) / (repeat * len(QUERIES))
+    indexed = timeit.timeit(lambda: [doc.find(q, use_index=True) for q in QUERIES], number=repeat) / (repeat * len(QUERIES))
+    print("find scan      : {:10.6f} s/query".format(scan))
+    print("find index     : {:10.6f} s/query (x{:.1f})".format(indexed, scan / indexed))
+
+
+if __name__ == "__main__":
+    main()
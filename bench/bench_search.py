@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+Benchmark: per-sentence regular expression loop (the old itc.py lookup) vs. CorpusSearcher
+Usage: python3 -m bench.bench_search [corpus.tsv]
+Latest version can be found at https://github.com/neocl/itctk
+
+@author: Le Tuan Anh <tuananh.ke@gmail.com>
+'''
+
+# Copyright (c) 2016, Le Tuan Anh <tuananh.ke@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+__author__ = "Le Tuan Anh <tuananh.ke@gmail.com>"
+__copyright__ = "Copyright 2016, itctk"
+__credits__ = ["Le Tuan Anh"]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "Le Tuan Anh"
+__email__ = "<tuananh.ke@gmail.com>"
+__status__ = "Prototype"
+
+########################################################################
+
+import re
+import sys
+import time
+
+from itctk import itc, ITC_DATA_FILE
+from itctk.search import CorpusSearcher
+
+########################################################################
+
+PATTERNS = [r'aku/prp \w+/vb', r'tidak/neg', r'\w+/rb \w+/jj', r'^\w+/nnp', r'di/in\s+\w+/nn']
+
+
+def sentence_loop(doc, pattern_text):
+    pattern = re.compile(pattern_text)
+    return [sid for sid, sent in enumerate(doc) if pattern.search(str(sent).lower())]
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    corpus = sys.argv[1] if len(sys.argv) > 1 else ITC_DATA_FILE
+    print("Reading %s ..." % (corpus,))
+    doc = itc(corpus)
+    print("Sentences: {:,}".format(len(doc)))
+    elapsed, searcher = timed(CorpusSearcher, doc)
+    print("Render buffer: {:.4f} s".format(elapsed))
+    for pattern in PATTERNS:
+        loop_time, expected = timed(sentence_loop, doc, pattern)
+        search_time, actual = timed(searcher.search, pattern)
+        assert expected == actual
+        print("{:<24} hits: {:>8,} loop: {:8.4f} s searcher: {:8.4f} s (x{:.1f})".format(
+            pattern, len(actual), loop_time, search_time, loop_time / max(search_time, 1e-9)))
+
+
+if __name__ == "__main__":
+    main()
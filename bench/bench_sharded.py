@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+Benchmark ShardedExecutor against the serial queries for an increasing number of workers
+Usage: python3 -m bench.bench_sharded [corpus.tsv]
+Latest version can be found at https://github.com/neocl/itctk
+
+@author: Le Tuan Anh <tuananh.ke@gmail.com>
+'''
+
+# Copyright (c) 2016, Le Tuan Anh <tuananh.ke@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+__author__ = "Le Tuan Anh <tuananh.ke@gmail.com>"
+__copyright__ = "Copyright 2016, itctk"
+__credits__ = ["Le Tuan Anh"]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "Le Tuan Anh"
+__email__ = "<tuananh.ke@gmail.com>"
+__status__ = "Prototype"
+
+########################################################################
+
+import os
+import sys
+import time
+
+from itctk import itc, ITC_DATA_FILE, PosMatcher, CorpusSearcher
+from itctk.parallel import ShardedExecutor
+
+########################################################################
+
+QUERIES = [('find_word', '^penge.+kan$'), ('find', 'tidak'), ('lookup', r'\w+/rb \w+/jj'), ('lookup_c', 'PRP (MD|RB)? VB')]
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def ids(result):
+    return list(result.ids) if hasattr(result, 'ids') else result
+
+
+def main():
+    corpus = sys.argv[1] if len(sys.argv) > 1 else ITC_DATA_FILE
+    print("Reading %s ..." % (corpus,))
+    doc = itc(corpus)
+    print("Sentences: {:,}".format(len(doc)))
+    searcher = CorpusSearcher(doc)
+    matcher = PosMatcher(doc)
+    serial = {'find_word': lambda x: doc.find_word(x), 'find': lambda x: doc.find(x),
+              'lookup': searcher.search, 'lookup_c': matcher.search}
+    baseline = {}
+    for kind, query in QUERIES:
+        serial[kind](query)  # warm up (index, POS n-grams)
+        baseline[kind] = timed(serial[kind], query)
+        print("{:<10} {:<24} serial: {:8.4f} s".format(kind, query, baseline[kind][0]))
+    workers = 1
+    while workers <= max(2, os.cpu_count() or 1):
+        elapsed, executor = timed(ShardedExecutor, doc, workers)
+        print("Workers: {} (start: {:.4f} s)".format(workers, elapsed))
+        with executor:
+            for kind, query in QUERIES:
+                func = getattr(executor, kind)
+                func(query)  # warm up (per-worker index, searcher, matcher)
+                elapsed, result = timed(func, query)
+                assert ids(result) == ids(baseline[kind][1])
+                print("{:<10} {:<24} {:8.4f} s (x{:.1f})".format(kind, query, elapsed, baseline[kind][0] / max(elapsed, 1e-9)))
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+Benchmark suite: parsing, indexing, queries and export on synthetic corpora of several sizes.
+Each benchmark is timed (best of --repeat runs) and its peak memory is measured with tracemalloc in a separate run.
+Results are written as JSON and can be compared with a previous run, regressions make the command fail.
+Usage:
+    python3 -m bench.run --sizes 10k,100k,1m --output results.json
+    python3 -m bench.run --sizes 10k,100k,1m --output new.json --compare results.json [--threshold 1.25]
+Latest version can be found at https://github.com/neocl/itctk
+
+@author: Le Tuan Anh <tuananh.ke@gmail.com>
+'''
+# Copyright (c) 2016, Le Tuan Anh <tuananh.ke@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+__author__ = "Le Tuan Anh <tuananh.ke@gmail.com>"
+__copyright__ = "Copyright 2016, itctk"
+__credits__ = ["Le Tuan Anh"]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "Le Tuan Anh"
+__email__ = "<tuananh.ke@gmail.com>"
+__status__ = "Prototype"
+
+import os
+import sys
+import gc
+import json
+import time
+import argparse
+import platform
+import tempfile
+import tracemalloc
+
+from itctk import parse_data, PosMatcher, CorpusSearcher
+from itctk.export import export_file
+from bench.synthetic import corpus_file, parse_size, SEED
+
+########################################################################
+
+DEFAULT_SIZES = '10k,100k,1m'
+THRESHOLD = 1.25  # a benchmark regresses when it is this many times slower than the baseline ...
+MIN_DELTA = 0.005  # ... and at least this many seconds slower
+FIND_WORD_QUERIES = ['mem.+', 'monyet', '^pe.+an$', '[0-9]+']
+LOOKUP_PATTERNS = [r'\w+/prp \w+/vb', r'\w+/rb \w+/jj']
+POS_PATTERNS = ['NN VB', 'PRP (MD|RB)? VB', 'JJ+ NN']
+
+
+def benchmarks(path, tmpdir):
+    ''' Yield (name, setup, func): setup() returns the state passed to func(state), only func is measured '''
+    yield 'parse', lambda: None, lambda _: parse_data(path)
+    yield 'parse_compact', lambda: None, lambda _: parse_data(path, compact=True)
+
+    def cache_setup():
+        parse_data(path, cache=True)
+    yield 'cache_load', cache_setup, lambda _: parse_data(path, cache=True)
+
+    yield 'build_index', lambda: parse_data(path, compact=True), lambda doc: doc.build_index()
+    yield 'find_word_scan', lambda: parse_data(path), lambda doc: [doc.find_word(q, use_index=False) for q in FIND_WORD_QUERIES]
+
+    def indexed_doc():
+        doc = parse_data(path)
+        doc.build_index()
+        return doc
+    yield 'find_word_index', indexed_doc, lambda doc: [doc.find_word(q) for q in FIND_WORD_QUERIES]
+    yield 'find_index', indexed_doc, lambda doc: [doc.find(q) for q in FIND_WORD_QUERIES]
+    yield 'lookup', lambda: CorpusSearcher(parse_data(path, compact=True)), lambda searcher: [searcher.search(p) for p in LOOKUP_PATTERNS]
+    yield 'lookup_c', lambda: PosMatcher(parse_data(path, compact=True)), lambda matcher: [matcher.search(p) for p in POS_PATTERNS]
+    outputs = {'nltk': os.path.join(tmpdir, 'out.txt'), 'conllu': os.path.join(tmpdir, 'out.conllu'), 'jsonl': os.path.join(tmpdir, 'out.jsonl')}
+    yield 'export', lambda: None, lambda _: export_file(path, outputs)
+
+
+def measure(setup, func, repeat, memory=True):
+    ''' Return (best time in seconds, peak memory in bytes or None) '''
+    best = None
+    for _ in range(repeat):
+        state = setup()
+        gc.collect()
+        start = time.perf_counter()
+        func(state)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    peak = None
+    if memory:
+        state = setup()
+        gc.collect()
+        tracemalloc.start()
+        try:
+            func(state)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return best, peak
+
+
+def run(sizes, seed=SEED, repeat=3, memory=True, only=None, data_dir=None):
+    results = []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for tokens in sizes:
+            path = corpus_file(tokens, seed, data_dir)
+            for name, setup, func in benchmarks(path, tmpdir):
+                if only and name not in only:
+                    continue
+                seconds, peak = measure(setup, func, repeat, memory)
+                results.append({'name': name, 'tokens': tokens, 'seconds': seconds, 'peak_bytes': peak})
+                print("{:<16} {:>12,} tokens {:10.4f} s {:>14} peak".format(
+                    name, tokens, seconds, '-' if peak is None else '{:,} B'.format(peak)))
+    return {'meta': {'python': platform.python_version(), 'platform': platform.platform(), 'seed': seed,
+                     'repeat': repeat, 'time': time.strftime('%Y-%m-%dT%H:%M:%S')},
+            'results': results}
+
+
+def compare(report, baseline, threshold=THRESHOLD, min_delta=MIN_DELTA):
+    ''' Print the speed ratio of each benchmark against a baseline report, return the list of regressions '''
+    old = {(r['name'], r['tokens']): r for r in baseline['results']}
+    regressions = []
+    for result in report['results']:
+        before = old.get((result['name'], result['tokens']))
+        if before is None:
+            continue
+        ratio = result['seconds'] / max(before['seconds'], 1e-9)
+        regressed = ratio > threshold and result['seconds'] - before['seconds'] > min_delta
+        if regressed:
+            regressions.append(result)
+        print("{:<16} {:>12,} tokens {:10.4f} s -> {:10.4f} s (x{:.2f}){}".format(
+            result['name'], result['tokens'], before['seconds'], result['seconds'], ratio, '  REGRESSION' if regressed else ''))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ITCtk benchmark suite")
+    parser.add_argument('-s', '--sizes', help='Corpus sizes in tokens (default: %(default)s)', default=DEFAULT_SIZES)
+    parser.add_argument('--seed', help='Seed of the synthetic corpora', type=int, default=SEED)
+    parser.add_argument('-r', '--repeat', help='Runs per benchmark (best time is kept)', type=int, default=3)
+    parser.add_argument('-b', '--bench', help='Only run these benchmarks (comma separated)')
+    parser.add_argument('--no-memory', help='Do not measure peak memory', action='store_true')
+    parser.add_argument('-o', '--output', help='Write results into this JSON file')
+    parser.add_argument('-c', '--compare', help='Compare with the results of a previous run (JSON file)')
+    parser.add_argument('-t', '--threshold', help='Slowdown ratio reported as a regression', type=float, default=THRESHOLD)
+    parser.add_argument('--data', help='Directory of the generated corpora (default: bench/data)')
+    args = parser.parse_args()
+    sizes = [parse_size(size) for size in args.sizes.split(',')]
+    only = set(args.bench.split(',')) if args.bench else None
+    report = run(sizes, args.seed, args.repeat, not args.no_memory, only, args.data)
+    if args.output:
+        with open(args.output, 'w') as outfile:
+            json.dump(report, outfile, indent=2)
+        print("Results have been written to %s" % (args.output,))
+    if args.compare:
+        with open(args.compare) as infile:
+            regressions = compare(report, json.load(infile), args.threshold)
+        if regressions:
+            print("%s benchmark(s) regressed" % (len(regressions),))
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
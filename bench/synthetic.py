@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+Seeded generator of synthetic ITC-shaped corpora for benchmarks.
+POS tags follow a fixed distribution over POS_TAGSET, words of each tag follow a Zipf distribution and the
+vocabulary grows with the corpus size (Heaps' law). Closed-class tags use the examples of POS_TAGSET,
+open-class words are made of Indonesian-like syllables and affixes.
+Usage: python3 -m bench.synthetic tokens output.tsv [seed]
+Latest version can be found at https://github.com/neocl/itctk
+
+@author: Le Tuan Anh <tuananh.ke@gmail.com>
+'''
+# Copyright (c) 2016, Le Tuan Anh <tuananh.ke@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+__author__ = "Le Tuan Anh <tuananh.ke@gmail.com>"
+__copyright__ = "Copyright 2016, itctk"
+__credits__ = ["Le Tuan Anh"]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "Le Tuan Anh"
+__email__ = "<tuananh.ke@gmail.com>"
+__status__ = "Prototype"
+
+import os
+import sys
+import random
+from itertools import accumulate
+
+from itctk import POS_TAGSET
+
+########################################################################
+
+SEED = 42
+ZIPF_EXPONENT = 1.07
+SENTENCE_SHAPE = (4.0, 4.5)  # gamma distribution of sentence lengths (mean ~ 18 tokens + 3)
+# approximate share of each tag in a tagged Indonesian news corpus
+TAG_WEIGHTS = {'NN': 0.26, 'NNP': 0.12, 'VB': 0.13, 'Z': 0.09, 'IN': 0.07, 'JJ': 0.05, 'SC': 0.045, 'CD': 0.04,
+               'RB': 0.03, 'CC': 0.03, 'PRP': 0.025, 'MD': 0.015, 'DT': 0.01, 'NEG': 0.01, 'PR': 0.012, 'FW': 0.005,
+               'OD': 0.005, 'NND': 0.006, 'WH': 0.003, 'RP': 0.003, 'UH': 0.001, 'SYM': 0.002, 'X': 0.002}
+# share of the open-class vocabulary of each tag
+OPEN_CLASSES = {'NN': 0.42, 'NNP': 0.25, 'VB': 0.18, 'JJ': 0.07, 'RB': 0.02, 'FW': 0.02, 'X': 0.02, 'CD': 0.02}
+SYLLABLES = [c + v for c in ['', 'b', 'c', 'd', 'g', 'h', 'j', 'k', 'l', 'm', 'n', 'p', 'r', 's', 't', 'w', 'ng', 'ny']
+             for v in 'aaiueo']
+AFFIXES = {'VB': (['me', 'mem', 'men', 'meng', 'ber', 'di', 'ter', ''], ['kan', 'i', '', '', '']),
+           'NN': (['pe', 'pem', 'peng', 'ke', '', '', ''], ['an', '', '', '', '-nya']),
+           'JJ': (['', '', 'ter'], ['', '']), 'RB': (['', 'se'], ['', 'nya'])}
+
+
+def examples(tag):
+    ''' Example words of a tag from POS_TAGSET '''
+    words = [w.strip() for w in POS_TAGSET[tag].ex.split(',')]
+    return [w for w in words if w and '...' not in w and '-' != w[0]]
+
+
+def vocabulary_size(tokens):
+    ''' Open-class vocabulary size of a corpus (Heaps' law) '''
+    return max(200, int(30 * tokens ** 0.55))
+
+
+def make_word(rng, tag):
+    stem = ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3)))
+    if tag == 'CD':
+        return str(rng.randint(0, 10 ** rng.randint(1, 6)))
+    if tag == 'NNP':
+        return stem.capitalize() if rng.random() < 0.8 else stem.capitalize() + ' ' + rng.choice(SYLLABLES).capitalize() + rng.choice(SYLLABLES)
+    if tag == 'FW':
+        return stem + 'ing'
+    prefixes, suffixes = AFFIXES.get(tag, ([''], ['']))
+    return rng.choice(prefixes) + stem + rng.choice(suffixes)
+
+
+def lexicon(rng, tokens):
+    ''' Words of each tag, most frequent first '''
+    words = {}
+    open_size = vocabulary_size(tokens)
+    for tag in TAG_WEIGHTS:
+        words[tag] = examples(tag)
+        if tag in OPEN_CLASSES:
+            seen = set(words[tag])
+            target = len(seen) + int(open_size * OPEN_CLASSES[tag])
+            while len(words[tag]) < target:
+                word = make_word(rng, tag)
+                if word not in seen:
+                    seen.add(word)
+                    words[tag].append(word)
+    words['Z'] = [',', '"', '(', ')', '?', ':', '-', '!', ';'] + words['Z']
+    return words
+
+
+def zipf_weights(size, exponent=ZIPF_EXPONENT):
+    return list(accumulate(1.0 / (rank ** exponent) for rank in range(1, size + 1)))
+
+
+def generate_sentences(tokens, seed=SEED):
+    ''' Yield sentences (lists of (text, POS)) until about `tokens` tokens, always the same ones for a seed '''
+    rng = random.Random(seed)
+    words = lexicon(rng, tokens)
+    tags = list(TAG_WEIGHTS)
+    cum_tags = list(accumulate(TAG_WEIGHTS[tag] for tag in tags))
+    cum_words = {tag: zipf_weights(len(words[tag])) for tag in tags}
+    produced = 0
+    batch = 10000
+    pending = []
+    while produced < tokens:
+        if len(pending) < 1000:
+            new_tags = rng.choices(tags, cum_weights=cum_tags, k=batch)
+            samples = {tag: iter(rng.choices(words[tag], cum_weights=cum_words[tag], k=new_tags.count(tag))) for tag in tags}
+            # tokens are popped from the end
+            pending = [(next(samples[tag]), tag) for tag in reversed(new_tags)] + pending
+        length = min(int(rng.gammavariate(*SENTENCE_SHAPE)) + 2, tokens - produced)
+        sentence = [pending.pop() for _ in range(max(length - 1, 1))]
+        sentence.append(('.', 'Z'))
+        produced += len(sentence)
+        yield sentence
+
+
+def generate(path, tokens, seed=SEED):
+    ''' Write a synthetic corpus of about `tokens` tokens into an ITC file, return the number of sentences '''
+    count = 0
+    with open(path, 'w', encoding='utf-8') as outfile:
+        for sentence in generate_sentences(tokens, seed):
+            if count:
+                outfile.write('\n')
+            outfile.write(''.join('%s\t%s\n' % row for row in sentence))
+            count += 1
+    return count
+
+
+def corpus_file(tokens, seed=SEED, directory=None):
+    ''' Path of a synthetic corpus (generated only once, e.g. bench/data/synthetic-100000-42.tsv) '''
+    if directory is None:
+        directory = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, 'synthetic-%s-%s.tsv' % (tokens, seed))
+    if not os.path.isfile(path):
+        generate(path + '.tmp', tokens, seed)
+        os.replace(path + '.tmp', path)
+    return path
+
+
+def parse_size(text):
+    ''' 10k -> 10000, 1.5m -> 1500000 '''
+    text = text.strip().lower()
+    factor = {'k': 10 ** 3, 'm': 10 ** 6}.get(text[-1:], 1)
+    return int(float(text.rstrip('km')) * factor)
+
+
+def main():
+    if len(sys.argv) < 3:
+        print("Usage: python3 -m bench.synthetic tokens output.tsv [seed]")
+        return
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else SEED
+    count = generate(sys.argv[2], parse_size(sys.argv[1]), seed)
+    print("{:,} sentences have been written to {}".format(count, sys.argv[2]))
+
+
+if __name__ == "__main__":
+    main()
@@ -49,10 +49,12 @@ __status__ = "Prototype"
 ########################################################################
 
 import os
+import time
 from itctk import *
+from itctk import profiling
+from itctk.lazy import Lazy, resolve
 import re
 from collections import defaultdict as dd
-from barasa.barasa import gen_barasa, read_barasa, BARASA_FILE
 
 ########################################################################
 # Some useful methods
@@ -64,27 +66,144 @@ def dump(a_list):
 
 def pro_lookup(cond):
     global auto_dump
-    sents = [ x for x in doc if cond(x) ]
+    sents = DocumentView(resolve(doc)).filter(cond)
     if auto_dump: dump(sents)
-    return Document(sents)
+    return sents
+
+def pos_matcher():
+    '''POS pattern matcher of doc (see itctk.pospattern)'''
+    global _pos_matcher
+    corpus = resolve(doc)
+    if _pos_matcher is None or _pos_matcher.doc is not corpus or _pos_matcher.version != corpus.version:
+        _pos_matcher = PosMatcher(corpus)
+    return _pos_matcher
 
 # [ 2016-02-29 DM ] added a better lookup method
-def lookup_c(pattern_text):
-    pattern = re.compile(pattern_text)
-    return pro_lookup(lambda x: pattern.search(x.pos()))
+def lookup_c(pattern_text, regex=False):
+    '''to search sentences by a sequence of parts-of-speech
+    e.g. lookup_c("NEG _ VB"), lookup_c("(NN|NNP)+ VB"), lookup_c("kita/PRP VB"), lookup_c("@nominal VB")
+    The pattern is compiled and matched over POS IDs (see itctk.pospattern for the syntax),
+    a PosPatternError is raised when the pattern is malformed (e.g. an unknown @class).
+    Tags match whole POS tags: lookup_c("NN") no longer matches NNP or NND and "VB NN" does not match VB NNP,
+    use "(NN|NNP|NND)" or "@noun" for that.
+    With regex=True the pattern is a regular expression searched in sentence.pos() like before,
+    e.g. lookup_c("NN", regex=True) matches NN, NNP and NND'''
+    def compute():
+        if regex:
+            pattern = re.compile(pattern_text)
+            return DocumentView(resolve(doc)).filter(lambda x: pattern.search(x.pos()))
+        return pos_matcher().find(pattern_text)
+    sents = doc.cached_query('lookup_c', pattern_text, int(regex), compute)
+    if auto_dump: dump(sents)
+    return sents
+
+def searcher():
+    '''Regular expression searcher of doc (see itctk.search)'''
+    global _searcher
+    corpus = resolve(doc)
+    if _searcher is None or _searcher.doc is not corpus or _searcher.version != corpus.version:
+        _searcher = CorpusSearcher(corpus)
+    return _searcher
 
 def lookup(pattern_text):
     '''to search words with parts-of-speech
     e.g. lookup("aku/prp \w+/vb") to search for "aku makan", "aku minum" etc.
-    Do not use upper case in lookup() because sentences are in lower case.'''
-    pattern = re.compile(pattern_text)
-    return pro_lookup(lambda x: pattern.search(str(x).lower()))
+    Do not use upper case in lookup() because sentences are in lower case.
+    The whole corpus is searched in one pass, use lookup_hits() to get the matched spans.'''
+    sents = doc.cached_query('lookup', pattern_text, 0, lambda: searcher().find(pattern_text))
+    if auto_dump: dump(sents)
+    return sents
+
+def lookup_hits(pattern_text):
+    '''like lookup() but return the matches (sentence ID, start, end, matched text)
+    e.g. lookup_hits("\w+/rb \w+/jj")'''
+    hits = list(doc.cached_query('lookup_hits', pattern_text, 0, lambda: list(searcher().finditer(pattern_text))))
+    if auto_dump: dump(hits)
+    return hits
+
+def kwic(query, left=5, right=5, pos=None, limit=50):
+    '''to show words in context, e.g. kwic("makan", pos="VB"), kwic("^meng.+", 3, 3)
+    Print the first `limit` lines and return the generator of the remaining lines, e.g. dump(itertools.islice(rest, 50))'''
+    lines = doc.kwic(query, left, right, pos)
+    for idx, line in enumerate(lines):
+        print(line)
+        if idx + 1 >= limit:
+            break
+    return lines
+
+def near(first, second, within=5, first_pos=None, second_pos=None):
+    '''to search sentences where a word is near another word, e.g. near("tidak", "pernah", 2) or near("makan", ".+", 1, "VB", "NN")'''
+    sids = []
+    for hit in doc.proximity(first, second, within, first_pos, second_pos):
+        if not sids or sids[-1] != hit.sid:
+            sids.append(hit.sid)
+    sents = DocumentView(resolve(doc), sids)
+    if auto_dump: dump(sents)
+    return sents
+
+def compute_stats(doc, max_n=3, lower=False):
+    '''N-gram counts, frequencies and POS transition matrices of doc (see itctk.stats, numpy is imported on first use)'''
+    from itctk.stats import compute_stats
+    return compute_stats(resolve(doc), max_n, lower)
+
+def sentiment_scorer():
+    '''Barasa sentiment scorer of doc (see itctk.sentiment), the compiled Barasa lexicon is cached next to data/barasa.txt'''
+    global _sentiment_scorer
+    from itctk.sentiment import SentimentScorer
+    corpus = resolve(doc)
+    if _sentiment_scorer is None or _sentiment_scorer.doc is not corpus or _sentiment_scorer.version != corpus.version:
+        _sentiment_scorer = SentimentScorer(corpus, resolve(brs))
+    return _sentiment_scorer
+
+def sentiment(k=10, pos=None, normalize=False):
+    '''Score every sentence with Barasa and show the k most positive and the k most negative sentences
+    e.g. sentiment(5, pos=('JJ', 'VB', 'RB')), use normalize=True to divide scores by the number of scored words.
+    Return the scores (see itctk.sentiment.SentimentScores), e.g. scores.rank('negative', 100)'''
+    scores = sentiment_scorer().score(pos)
+    if auto_dump:
+        print("Most positive:")
+        dump(["%+.3f %s" % ranked for ranked in scores.most_positive(k, normalize)])
+        print("Most negative:")
+        dump(["%+.3f %s" % ranked for ranked in scores.most_negative(k, normalize)])
+    return scores
+
+def cache_info():
+    '''Show query cache statistics (hits, misses, evictions, entries, bytes)'''
+    if doc is None or doc.query_cache is None:
+        print("Query cache is disabled")
+        return None
+    info = doc.query_cache.info()
+    print("Query cache: {} hits, {} misses, {} evictions, {}/{} entries, {:,}/{:,} bytes".format(
+        info.hits, info.misses, info.evictions, info.entries, info.max_entries, info.bytes, info.max_bytes))
+    return info
+
+def profile(enabled=True):
+    '''Start (or stop with profile(False)) recording time, tokens and bytes of parsing, queries, etc. (see itctk.profiling)'''
+    if enabled:
+        profiling.enable()
+    else:
+        profiling.disable()
+
+def prof_stats(reset=False):
+    '''Show what has been recorded since profile() was called, slowest operations first.
+    Return the snapshot dict (op -> calls, seconds, tokens, bytes), use prof_stats(reset=True) to clear the counters'''
+    info = profiling.snapshot()
+    print(profiling.report(info))
+    if reset:
+        profiling.reset()
+    return info
 
 def stats(doc):
-    print("Sentence count: {:>12,}".format(len(doc)))
-    print("Token count   : {:>12,}".format(len(doc.words)))
-    print("Lexicon size  : {:>12,}".format(len(doc.word_list())))
-    print("POS tagset    : {}".format(doc.pos_list()))
+    '''Print corpus statistics.
+    doc can be a Document or a sentence stream, e.g. stats(itc(stream=True))'''
+    info = corpus_stats(resolve(doc))
+    print_stats(info)
+
+def print_stats(info):
+    print("Sentence count: {:>12,}".format(info.sentence_count))
+    print("Token count   : {:>12,}".format(info.token_count))
+    print("Lexicon size  : {:>12,}".format(info.lexicon_size))
+    print("POS tagset    : {}".format(info.pos_list))
     print()
 
 ########################################################################
@@ -92,6 +211,9 @@ def stats(doc):
 ########################################################################
 
 doc = None # ITC will be loaded into this variable
+_pos_matcher = None
+_searcher = None
+_sentiment_scorer = None
 brs = None # Barasa will be loaded into this variable
 auto_dump = True
 
@@ -100,12 +222,21 @@ def show_help():
              ,("brs", "`brs` is a special variable to access Barasa SentiWordNet")
              ,("doc", "`doc` is a special variable to access itc corpus")
              ,('sents = lookup(\'kita/prp \w+/vb\')', 'Look for sentences with kita as PRP that follows by any verb')
+             ,('hits = lookup_hits(\'\w+/rb \w+/jj\')', 'Look for adverbs followed by adjectives (matched spans)')
              ,("doc.pos_list()", "Get all POS that are used in this corpus")
              ,("doc.find('kita')", "Find all sentences with the word `kita`")
+             ,("doc.find_similar('monyt', 2)", "Find words within 2 typos of `monyt` (with POS and positions)")
+             ,("compute_stats(doc).frequencies('pos')", "POS frequencies (also n-grams, transition matrices, see itctk.stats)")
+             ,("kwic('makan', 4, 4, pos='VB')", "Show `makan` (as a verb) in context, 4 words on each side")
+             ,("near('tidak', 'pernah', 2)", "Look for sentences with `pernah` at most 2 words from `tidak`")
+             ,("cache_info()", "Show query cache hits and misses")
+             ,("profile(); prof_stats()", "Record time, tokens and bytes of each operation, then show them")
              ,("help(doc)", "Show everything about Document class")
              ,("help(lookup)", "How to use the lookup function")
              ,("POS_TAGSET['CC']", "Show information about the tag `CC`")
-             ,("brs['kebaikan']", "Show all scores for the word `kebaikan`")
+             ,("brs['kebaikan']", "Show the scores (positive, negative, objective, senses) of the word `kebaikan`")
+             ,("brs.synsets('kebaikan')", "Show the scores of each sense (synset) of the word `kebaikan`")
+             ,("sentiment(5, pos=('JJ', 'VB'))", "Show the 5 most positive and most negative sentences (Barasa scores)")
     ]
     max_lengths = [0,0]
     for row in usage:
@@ -117,37 +248,49 @@ def show_help():
         print(' '.join([ text.ljust(size) for size,text in zip(max_lengths, row)]))
     print("Try help(doc), help(Sentence), help(Word), help(lookup), etc. for more information")
 
-def main():
-    global doc
-    global brs
-
+def load_barasa():
+    '''Load the Barasa (Bahasa SentiWordNet) lexicon from its compiled cache (see itctk.sentiment), generate Barasa first if needed'''
+    from itctk.sentiment import load_lexicon, BARASA_FILE
     # Try to generate Barasa before trying to read it ...
     if not os.path.isfile(BARASA_FILE):
-        print("\t -> Barasa does not exist, attempting to create Barasa data ...")
         try:
+            from barasa.barasa import gen_barasa
             gen_barasa()
-        except:
-            print("\t\t -> Failed to generate Barasa. Please make sure that you ran >>>> ./config.sh <<<< in the terminal first")
-
-    # print("Reading Barasa (Bahasa SentiWordNet) ...")
-    try:
-        brs = read_barasa()
-        # Display some stats
-        if(brs):
-            print("Barasa has been read")
-            print("Lemma count: %s" % (len(brs),))
-        else:
-            print("Barasa couldn't be read")
-    except Exception as e:
-        print("Error: %s" % (e,))
-
-
-    print("Reading Indonesian Tagged Corpus ...")
-    doc = itc()
-    print("ITC document is now ready to be used in var `doc`")
-    stats(doc)
+        except Exception as e:
+            raise RuntimeError("Failed to generate Barasa ({}). Please make sure that you ran >>>> ./config.sh <<<< in the terminal first".format(e))
+    return load_lexicon(BARASA_FILE)
+
+def load_itc():
+    '''Read Indonesian Tagged Corpus (from its binary cache when possible)'''
+    corpus = itc()
+    corpus.enable_query_cache()
+    return corpus
+
+def _bind(name):
+    '''Replace a lazy global variable by its value once it is loaded (unless the variable was assigned in the meantime)'''
+    def on_load(value):
+        if isinstance(globals().get(name), Lazy):
+            globals()[name] = value
+    return on_load
+
+def main():
+    global doc
+    global brs
+
+    # doc and brs are read in background threads, the first access waits for them (e.g. len(doc))
+    started = time.time()
+    doc = Lazy(load_itc, 'ITC', _bind('doc')).start()
+    brs = Lazy(load_barasa, 'Barasa', _bind('brs')).start()
+    print("Reading Indonesian Tagged Corpus and Barasa in the background, `doc` and `brs` can be used right away")
+    info = cached_stats(ITC_DATA_FILE)
+    if info is not None:
+        print_stats(info)
+    else:
+        print("Corpus statistics will be available after the first start, use stats(doc)")
+        print()
     print('--')
     show_help()
+    print('(ready in {:.0f} ms)'.format((time.time() - started) * 1000))
     print('')
 
 if __name__ == '__main__':
@@ -49,6 +49,21 @@ __status__ = "Prototype"
 
 from .itctk import *
 from .tagset import *
+from .pospattern import PosMatcher, PosPatternError, compile_pos_pattern
+from .search import CorpusSearcher, SearchHit
 
-__all__ = [ 'ITC_DATA_FILE', 'itc', 'parse_data', 'Document', 'Sentence', 'Word', 'POS_TAGSET' ]
+__all__ = [ 'ITC_DATA_FILE', 'itc', 'parse_data', 'ParseError', 'iter_sentences', 'corpus_stats', 'cached_stats', 'DocStats', 'Document', 'DocumentView', 'Sentence', 'Word', 'CompactDocument', 'SentenceView', 'WordView', 'Vocabulary', 'PosMatcher', 'PosPatternError', 'compile_pos_pattern', 'CorpusSearcher', 'SearchHit', 'POS_TAGSET' ]
 
+
+# Modules with heavy dependencies (e.g. numpy) are only imported when one of their names is used
+_LAZY_NAMES = {'compute_stats': 'stats', 'CorpusStats': 'stats', 'collocations': 'colloc', 'Lazy': 'lazy'}
+
+
+def __getattr__(name):
+    module = _LAZY_NAMES.get(name)
+    if module is None:
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+    from importlib import import_module
+    value = getattr(import_module('.' + module, __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+Binary cache for parsed corpora.
+A parsed corpus is stored next to its source file (e.g. corpus.tsv -> corpus.tsv.itcc)
+so it can be memory-mapped on the next start instead of being parsed again.
+Latest version can be found at https://github.com/neocl/itctk
+
+Cache layout:
+    MAGIC (8 bytes) | header length (uint32) | header (JSON, utf-8) | padding | sections ...
+Sections are raw arrays in native byte order, each section starts at an 8-byte aligned offset:
+    token_ids (uint32), pos_ids (uint8), offsets (uint32), vocab (utf-8, one word per line)
+
+@author: Le Tuan Anh <tuananh.ke@gmail.com>
+'''
+
+# Copyright (c) 2016, Le Tuan Anh <tuananh.ke@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+__author__ = "Le Tuan Anh <tuananh.ke@gmail.com>"
+__copyright__ = "Copyright 2016, itctk"
+__credits__ = ["Le Tuan Anh"]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "Le Tuan Anh"
+__email__ = "<tuananh.ke@gmail.com>"
+__status__ = "Prototype"
+
+########################################################################
+
+import os
+import sys
+import mmap
+import json
+import struct
+import hashlib
+import threading
+
+from .itctk import CompactDocument, Vocabulary
+
+# -----------------------------------------------------------------------
+# CONFIGURATION
+# -----------------------------------------------------------------------
+
+CACHE_EXT = '.itcc'
+MAGIC = b'ITCC\x00\x00\x00\x03'  # the last byte is the format version
+ALIGNMENT = 8
+
+
+# ----------------------------------------------------------------------------
+# FUNCTIONS
+# ----------------------------------------------------------------------------
+
+def cache_path(source_path):
+    ''' Location of the cache file of a corpus file
+    '''
+    return source_path + CACHE_EXT
+
+
+def file_hash(file_path, chunk_size=1 << 20):
+    ''' SHA-1 hash of a file content
+    '''
+    sha1 = hashlib.sha1()
+    with open(file_path, 'rb') as infile:
+        for chunk in iter(lambda: infile.read(chunk_size), b''):
+            sha1.update(chunk)
+    return sha1.hexdigest()
+
+
+def source_key(source_path, with_hash=True):
+    ''' Information used to check whether a cache file is still valid for its source
+    '''
+    info = os.stat(source_path)
+    key = {'source': os.path.abspath(source_path), 'size': info.st_size, 'mtime': info.st_mtime_ns}
+    if with_hash:
+        key['sha1'] = file_hash(source_path)
+    return key
+
+
+def to_bytes(doc, header=None):
+    ''' Serialise a CompactDocument into the cache binary layout
+    '''
+    sections = [('token_ids', doc.token_ids), ('pos_ids', doc.pos_ids), ('offsets', doc.offsets),
+                ('vocab', '\n'.join(doc.vocab).encode('utf-8'))]
+    header = dict(header) if header else {}
+    pos_bytes = doc.pos_ids.tobytes()
+    header.update({'byteorder': sys.byteorder,
+                   'tagset': list(doc.tagset),
+                   'pos_list': [tag for pid, tag in enumerate(doc.tagset) if bytes((pid,)) in pos_bytes],
+                   'vocab_size': len(doc.vocab),
+                   'lexicon_size': len(set(word.lower() for word in doc.vocab)),
+                   'sentence_count': len(doc),
+                   'token_count': len(doc.token_ids)})
+    # compute section offsets relative to the end of the header block
+    layout = {}
+    position = 0
+    for name, data in sections:
+        size = len(memoryview(data).cast('B'))
+        layout[name] = [position, size]
+        position += size + (-size % ALIGNMENT)
+    header['sections'] = layout
+    header_bytes = json.dumps(header).encode('utf-8')
+    preamble = MAGIC + struct.pack('<I', len(header_bytes)) + header_bytes
+    preamble += b'\x00' * (-len(preamble) % ALIGNMENT)
+    chunks = [preamble]
+    for name, data in sections:
+        raw = memoryview(data).cast('B')
+        chunks.append(raw)
+        chunks.append(b'\x00' * (-len(raw) % ALIGNMENT))
+    return b''.join(chunks)
+
+
+def read_header(buf):
+    ''' Read the header of a cache buffer, return (header, data_start) or (None, None) if it's not a valid cache
+    '''
+    if len(buf) < len(MAGIC) + 4 or bytes(buf[:len(MAGIC)]) != MAGIC:
+        return None, None
+    header_len, = struct.unpack('<I', buf[len(MAGIC):len(MAGIC) + 4])
+    start = len(MAGIC) + 4
+    header = json.loads(bytes(buf[start:start + header_len]).decode('utf-8'))
+    data_start = start + header_len
+    data_start += -data_start % ALIGNMENT
+    return header, data_start
+
+
+def load_header(source_path):
+    ''' Read only the header of the cache of source_path, e.g. to get corpus statistics without loading the corpus.
+    Return None if the cache does not exist or is stale.
+    '''
+    path = cache_path(source_path)
+    if not os.path.isfile(path) or not os.path.isfile(source_path):
+        return None
+    try:
+        with open(path, 'rb') as infile:
+            preamble = infile.read(len(MAGIC) + 4)
+            if len(preamble) < len(MAGIC) + 4:
+                return None
+            header_len, = struct.unpack('<I', preamble[len(MAGIC):])
+            header, _ = read_header(preamble + infile.read(header_len))
+        if not is_valid(header, source_path):
+            return None
+        if header.get('mtime') != os.stat(source_path).st_mtime_ns:
+            with open(path, 'rb') as infile:
+                buf = mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ)
+            refresh_mtime(from_buffer(buf), source_path, header)
+        return header
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def from_buffer(buf):
+    ''' Create a read-only CompactDocument on top of a cache buffer (bytes, mmap, shared memory, etc.)
+    The columns are memoryviews into buf, nothing is copied except the vocabulary strings.
+    '''
+    header, data_start = read_header(buf)
+    if header is None or header.get('byteorder') != sys.byteorder:
+        return None
+    view = memoryview(buf)
+
+    def section(name):
+        offset, size = header['sections'][name]
+        return view[data_start + offset:data_start + offset + size]
+    doc = CompactDocument()
+    doc.token_ids = section('token_ids').cast('I')
+    doc.pos_ids = section('pos_ids').cast('B')
+    doc.offsets = section('offsets').cast('I')
+    vocab = str(section('vocab'), 'utf-8').split('\n') if header['vocab_size'] else []
+    doc.vocab = Vocabulary.from_list(vocab)
+    doc.tagset = Vocabulary(header['tagset'])
+    doc.header = header
+    return doc
+
+
+def is_valid(header, source_path):
+    ''' Check if a cache header still matches its source file.
+    Size and modification time are checked first, the content hash is only computed when the modification time changed.
+    '''
+    if header is None:
+        return False
+    key = source_key(source_path, with_hash=False)
+    if header.get('source') != key['source'] or header.get('size') != key['size']:
+        return False
+    if header.get('mtime') == key['mtime']:
+        return True
+    return header.get('sha1') == file_hash(source_path)
+
+
+def refresh_mtime(doc, source_path, header):
+    ''' Store the current modification time of source_path in its cache after is_valid() matched the content hash
+    (e.g. the file was touched or copied), so that the next load doesn't hash the file again.
+    '''
+    key = source_key(source_path, with_hash=False)
+    if doc is None or header.get('mtime') == key['mtime']:
+        return
+    key['sha1'] = header.get('sha1')
+    save_cache(doc, source_path, key)
+
+
+def save_cache(doc, source_path, key=None):
+    ''' Write a CompactDocument into the cache file of source_path. Return the cache file path or None if it can't be written
+    '''
+    if key is None:
+        key = source_key(source_path)
+    output_path = cache_path(source_path)
+    temp_path = '%s.%s.%s.tmp' % (output_path, os.getpid(), threading.get_ident())  # unique per process and thread
+    try:
+        with open(temp_path, 'wb') as outfile:
+            outfile.write(to_bytes(doc, key))
+        os.replace(temp_path, output_path)
+        return output_path
+    except OSError:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        return None
+
+
+def load_cache(source_path):
+    ''' Load the cache of source_path (memory-mapped). Return None if the cache does not exist or is stale.
+    '''
+    path = cache_path(source_path)
+    if not os.path.isfile(path) or not os.path.isfile(source_path):
+        return None
+    try:
+        with open(path, 'rb') as infile:
+            buf = mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    try:
+        header, _ = read_header(buf)
+        if not is_valid(header, source_path):
+            return None
+        doc = from_buffer(buf)
+        refresh_mtime(doc, source_path, header)
+        return doc
+    except (ValueError, KeyError, TypeError):
+        # broken cache file, it will be rebuilt
+        return None
+
+
+def cached_parse(source_path, parser):
+    ''' Load a corpus from its cache, or parse it with parser(source_path) (which returns a CompactDocument) and save the cache
+    '''
+    doc = load_cache(source_path)
+    if doc is not None:
+        return doc
+    key = source_key(source_path)
+    doc = parser(source_path)
+    save_cache(doc, source_path, key)
+    return doc
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+Collocation mining with association measures (requires NumPy).
+Word pairs (node, collocate) which occur within a window inside a sentence are counted in a sparse co-occurrence
+matrix (one int64 key per pair), optionally only for some POS pairs (e.g. VB+NN, JJ+NN).
+PMI, log-likelihood (G2) and t-score are computed for all pairs at once from the 2x2 contingency tables.
+Latest version can be found at https://github.com/neocl/itctk
+
+@author: Le Tuan Anh <tuananh.ke@gmail.com>
+'''
+
+# Copyright (c) 2016, Le Tuan Anh <tuananh.ke@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+__author__ = "Le Tuan Anh <tuananh.ke@gmail.com>"
+__copyright__ = "Copyright 2016, itctk"
+__credits__ = ["Le Tuan Anh"]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "Le Tuan Anh"
+__email__ = "<tuananh.ke@gmail.com>"
+__status__ = "Prototype"
+
+########################################################################
+
+from .stats import np, encode_document, _require_numpy
+from .tagset import POS_TAGSET
+
+# -----------------------------------------------------------------------
+# CONFIGURATION
+# -----------------------------------------------------------------------
+
+MEASURES = ('pmi', 'log_likelihood', 't_score', 'count')
+CHUNK_SIZE = 1 << 22  # tokens per chunk when counting pairs, bounds temporary arrays
+
+
+# ----------------------------------------------------------------------------
+# FUNCTIONS
+# ----------------------------------------------------------------------------
+
+def _pos_filter(pos_pairs, tags):
+    ''' Boolean matrix allowed[node tag, collocate tag] from pairs such as [('VB', 'NN'), ('JJ', 'NN')] '''
+    allowed = np.zeros((len(tags), len(tags)), dtype=bool)
+    for first, second in pos_pairs:
+        for tag in (first, second):
+            if tag not in POS_TAGSET:
+                raise ValueError("Unknown POS tag: {} (see POS_TAGSET)".format(tag))
+        allowed[tags.index(first), tags.index(second)] = True
+    return allowed
+
+
+def count_pairs(token_ids, pos_ids, offsets, window, base, allowed=None, keep=None):
+    ''' Count ordered pairs (token i, token i + d) for 1 <= d <= window inside sentences.
+    allowed: optional boolean matrix of POS pairs, keep: optional boolean mask of word IDs to count.
+    Return sorted pair keys (node * base + collocate) and their counts.
+    '''
+    size = len(token_ids)
+    ends = np.repeat(offsets[1:], np.diff(offsets))
+    keys = np.zeros(0, dtype=np.int64)
+    counts = np.zeros(0, dtype=np.int64)
+    for start in range(0, size, CHUNK_SIZE):
+        stop = min(start + CHUNK_SIZE, size)
+        for distance in range(1, window + 1):
+            positions = np.arange(start, stop)
+            valid = positions + distance < ends[start:stop]
+            left = positions[valid]
+            right = left + distance
+            if allowed is not None:
+                mask = allowed[pos_ids[left], pos_ids[right]]
+                left, right = left[mask], right[mask]
+            pairs_left = token_ids[left]
+            pairs_right = token_ids[right]
+            if keep is not None:
+                mask = keep[pairs_left] & keep[pairs_right]
+                pairs_left, pairs_right = pairs_left[mask], pairs_right[mask]
+            chunk_keys, chunk_counts = np.unique(pairs_left * base + pairs_right, return_counts=True)
+            keys, inverse = np.unique(np.concatenate([keys, chunk_keys]), return_inverse=True)
+            counts = np.bincount(inverse, weights=np.concatenate([counts, chunk_counts])).astype(np.int64)
+    return keys, counts
+
+
+def association_scores(counts, row_totals, col_totals, total):
+    ''' PMI (log2), log-likelihood (G2) and t-score of pairs from their counts and the marginal totals, as arrays
+    '''
+    o11 = counts.astype(np.float64)
+    r1 = row_totals.astype(np.float64)
+    c1 = col_totals.astype(np.float64)
+    n = float(total)
+    e11 = r1 * c1 / n
+    observed = [o11, r1 - o11, c1 - o11, n - r1 - c1 + o11]
+    expected = [e11, r1 * (n - c1) / n, (n - r1) * c1 / n, (n - r1) * (n - c1) / n]
+    ll = np.zeros_like(o11)
+    for o, e in zip(observed, expected):
+        positive = o > 0
+        ll[positive] += o[positive] * np.log(o[positive] / e[positive])
+    return {'pmi': np.log2(o11 / e11),
+            'log_likelihood': 2 * ll,
+            't_score': (o11 - e11) / np.sqrt(o11),
+            'count': o11}
+
+
+# ----------------------------------------------------------------------------
+# DATA STRUCTURES
+# ----------------------------------------------------------------------------
+
+class Collocations:
+    ''' Sparse co-occurrence matrix of (node, collocate) pairs with association scores.
+    - words: label of each word ID
+    - nodes, collocates, counts: pairs with count >= min_count
+    - row_totals, col_totals, total: marginal counts over all counted pairs (before min_count)
+    '''
+
+    def __init__(self, words, nodes, collocates, counts, row_totals, col_totals, total):
+        self.words = words
+        self.nodes = nodes
+        self.collocates = collocates
+        self.counts = counts
+        self.row_totals = row_totals
+        self.col_totals = col_totals
+        self.total = total
+        self._scores = None
+        self._ids = None
+
+    def __len__(self):
+        return len(self.counts)
+
+    def scores(self, measure='pmi'):
+        ''' Score of each pair (one of MEASURES) '''
+        if measure not in MEASURES:
+            raise ValueError("Unknown measure: {} (measures: {})".format(measure, ', '.join(MEASURES)))
+        if self._scores is None:
+            self._scores = association_scores(self.counts, self.row_totals[self.nodes], self.col_totals[self.collocates], self.total)
+        return self._scores[measure]
+
+    def most_associated(self, measure='pmi', k=20):
+        ''' Top k pairs of the whole matrix, [(node, collocate, score, count), ...] '''
+        scores = self.scores(measure)
+        order = np.argsort(-scores, kind='stable')[:k]
+        return [(self.words[self.nodes[i]], self.words[self.collocates[i]], float(scores[i]), int(self.counts[i])) for i in order.tolist()]
+
+    def top(self, word, measure='pmi', k=10):
+        ''' Top k collocates of a word, [(collocate, score, count), ...] '''
+        if self._ids is None:
+            self._ids = {w: wid for wid, w in enumerate(self.words)}
+        wid = self._ids.get(word)
+        if wid is None:
+            return []
+        scores = self.scores(measure)
+        rows = np.flatnonzero(self.nodes == wid)
+        rows = rows[np.argsort(-scores[rows], kind='stable')[:k]]
+        return [(self.words[self.collocates[i]], float(scores[i]), int(self.counts[i])) for i in rows.tolist()]
+
+    def top_k(self, measure='pmi', k=10):
+        ''' Top k collocates of every node word, {node: [(collocate, score, count), ...]} '''
+        scores = self.scores(measure)
+        order = np.lexsort((-scores, self.nodes))
+        nodes = self.nodes[order]
+        # rank of each pair inside its node group
+        starts = np.flatnonzero(np.r_[True, nodes[1:] != nodes[:-1]])
+        ranks = np.arange(len(order)) - np.repeat(starts, np.diff(np.r_[starts, len(order)]))
+        results = {}
+        for i in order[ranks < k].tolist():
+            results.setdefault(self.words[self.nodes[i]], []).append((self.words[self.collocates[i]], float(scores[i]), int(self.counts[i])))
+        return results
+
+
+def collocations(doc, window=2, pos_pairs=None, min_count=2, min_freq=1, lower=True):
+    ''' Count collocations of a document.
+    - window: collocates are the next 1..window tokens of the node in the same sentence
+    - pos_pairs: only count pairs of these (node POS, collocate POS), e.g. [('VB', 'NN'), ('JJ', 'NN')]
+    - min_count: drop pairs which occur less often (after the marginal totals are computed)
+    - min_freq: ignore words which occur less often in the corpus (they are never paired, which bounds memory)
+    - lower: lowercase words
+    '''
+    _require_numpy()
+    words, token_ids, tags, pos_ids, offsets = encode_document(doc, lower)
+    base = max(len(words), 1)
+    allowed = _pos_filter(pos_pairs, tags) if pos_pairs else None
+    keep = None
+    if min_freq > 1:
+        keep = np.bincount(token_ids, minlength=base) >= min_freq
+    keys, counts = count_pairs(token_ids, pos_ids, offsets, window, base, allowed, keep)
+    nodes, collocates = keys // base, keys % base
+    row_totals = np.bincount(nodes, weights=counts, minlength=base).astype(np.int64)
+    col_totals = np.bincount(collocates, weights=counts, minlength=base).astype(np.int64)
+    total = int(counts.sum())
+    frequent = counts >= min_count
+    return Collocations(words, nodes[frequent], collocates[frequent], counts[frequent], row_totals, col_totals, total)
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+Concordance (KWIC, keyword in context) and proximity queries.
+Both are driven by the positional postings of the inverted index (see itctk.index), so only the sentences
+which contain a hit are read. Results are generators: lines are produced one by one while they are consumed.
+Latest version can be found at https://github.com/neocl/itctk
+
+@author: Le Tuan Anh <tuananh.ke@gmail.com>
+'''
+
+# Copyright (c) 2016, Le Tuan Anh <tuananh.ke@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+__author__ = "Le Tuan Anh <tuananh.ke@gmail.com>"
+__copyright__ = "Copyright 2016, itctk"
+__credits__ = ["Le Tuan Anh"]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "Le Tuan Anh"
+__email__ = "<tuananh.ke@gmail.com>"
+__status__ = "Prototype"
+
+########################################################################
+
+from collections import namedtuple
+
+from .index import POSITION_BITS, POSITION_MASK
+
+# -----------------------------------------------------------------------
+# CONFIGURATION
+# -----------------------------------------------------------------------
+
+KWIC_WIDTH = 40  # characters of left context when a KwicLine is printed
+
+# first/second: positions of the two words in sentence sid
+ProximityHit = namedtuple('ProximityHit', ['sid', 'first', 'second'])
+
+
+# ----------------------------------------------------------------------------
+# DATA STRUCTURES
+# ----------------------------------------------------------------------------
+
+class KwicLine(namedtuple('KwicLine', ['sid', 'position', 'left', 'keyword', 'right'])):
+    ''' A concordance line: the keyword at (sid, position) with lists of tokens on its left and right
+    '''
+
+    __slots__ = ()
+
+    def __str__(self):
+        left = ' '.join(self.left)
+        if len(left) > KWIC_WIDTH:
+            left = left[-KWIC_WIDTH:]
+        return '{:>{}} [{}] {}'.format(left, KWIC_WIDTH, self.keyword, ' '.join(self.right))
+
+
+class _Tokens:
+    ''' Read tokens of sentences as "text" or "text/POS" strings, the last sentences read are kept '''
+
+    def __init__(self, doc, show_pos, cache_size=8):
+        self.doc = doc
+        self.show_pos = show_pos
+        self.cache = {}
+        self.cache_size = cache_size
+
+    def __call__(self, sid):
+        tokens = self.cache.get(sid)
+        if tokens is None:
+            if len(self.cache) >= self.cache_size:
+                self.cache.clear()
+            if self.show_pos:
+                tokens = ['%s/%s' % (w.text, w.pos) for w in self.doc[sid]]
+            else:
+                tokens = [w.text for w in self.doc[sid]]
+            self.cache[sid] = tokens
+        return tokens
+
+
+# ----------------------------------------------------------------------------
+# FUNCTIONS
+# ----------------------------------------------------------------------------
+
+def _get_index(doc):
+    return doc._index if doc._index is not None else doc.build_index()
+
+
+def _tag_filter(doc, pos):
+    ''' Return a function (sid, position) -> bool which checks the POS of a word, or None if pos is None '''
+    if pos is None:
+        return None
+    tags = {pos} if isinstance(pos, str) else set(pos)
+    if hasattr(doc, 'pos_ids'):
+        tag_ids = set(tid for tid, tag in enumerate(doc.tagset) if tag in tags)
+        pos_ids, offsets = doc.pos_ids, doc.offsets
+        return lambda sid, position: pos_ids[offsets[sid] + position] in tag_ids
+    return lambda sid, position: doc[sid][position].pos in tags
+
+
+def postings(doc, query, pos=None, case_sensitive=True):
+    ''' Yield sorted postings (sid << 32 | position) of words matching a regular expression (and a POS tag or tags)
+    '''
+    index = _get_index(doc)
+    check = _tag_filter(doc, pos)
+    for posting in index.search(query, case_sensitive):
+        if check is None or check(posting >> POSITION_BITS, posting & POSITION_MASK):
+            yield posting
+
+
+def kwic(doc, query, left=5, right=5, pos=None, case_sensitive=True, cross_sentence=False, show_pos=False):
+    ''' Generate KwicLine of every word which matches query (a regular expression, see Document.find_word).
+    - left, right: number of context tokens on each side
+    - pos: only words with this POS tag (or one of these tags)
+    - cross_sentence: take context from the previous/next sentences when the sentence is too short
+    - show_pos: context tokens and keyword are "text/POS"
+    '''
+    tokens = _Tokens(doc, show_pos)
+    size = len(doc)
+    for posting in postings(doc, query, pos, case_sensitive):
+        sid = posting >> POSITION_BITS
+        position = posting & POSITION_MASK
+        sent = tokens(sid)
+        left_tokens = sent[max(0, position - left):position]
+        right_tokens = sent[position + 1:position + 1 + right]
+        if cross_sentence:
+            before = sid - 1
+            while len(left_tokens) < left and before >= 0:
+                left_tokens = tokens(before)[-(left - len(left_tokens)):] + left_tokens
+                before -= 1
+            after = sid + 1
+            while len(right_tokens) < right and after < size:
+                right_tokens = right_tokens + tokens(after)[:right - len(right_tokens)]
+                after += 1
+        yield KwicLine(sid, position, left_tokens, sent[position], right_tokens)
+
+
+def proximity(doc, first, second, within=5, first_pos=None, second_pos=None, ordered=False, case_sensitive=True):
+    ''' Generate ProximityHit of a word matching first which has a word matching second at most `within` tokens
+    away in the same sentence (after it when ordered is True). first/second are regular expressions,
+    first_pos/second_pos optional POS tags. Postings of both words are merged sentence by sentence.
+    '''
+    first_postings = postings(doc, first, first_pos, case_sensitive)
+    second_postings = list(postings(doc, second, second_pos, case_sensitive))
+    start = 0
+    for posting in first_postings:
+        low = posting - (0 if ordered else within)
+        high = posting + within
+        # skip second postings which are too far before (postings of earlier sentences are always smaller)
+        while start < len(second_postings) and second_postings[start] < low:
+            start += 1
+        sid = posting >> POSITION_BITS
+        idx = start
+        while idx < len(second_postings) and second_postings[idx] <= high:
+            other = second_postings[idx]
+            if other != posting and other >> POSITION_BITS == sid:
+                yield ProximityHit(sid, posting & POSITION_MASK, other & POSITION_MASK)
+            idx += 1
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+Streaming export of ITC corpora into other formats.
+Sentences are read one at a time from the parser (see iter_sentences) and written with large buffered writes,
+several formats can be written in one read pass. Output files ending with .gz, .bz2 or .xz are compressed.
+Formats:
+    conllu  CoNLL-U style columns (the ITC tag is in the XPOS column)
+    nltk    one tagged sentence per line, e.g. Kera/NN untuk/SC amankan/VB
+    jsonl   one JSON object per line: {"id": 0, "tokens": [...], "pos": [...]}
+    text    one sentence per line without tags
+Latest version can be found at https://github.com/neocl/itctk
+
+@author: Le Tuan Anh <tuananh.ke@gmail.com>
+'''
+
+# Copyright (c) 2016, Le Tuan Anh <tuananh.ke@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+__author__ = "Le Tuan Anh <tuananh.ke@gmail.com>"
+__copyright__ = "Copyright 2016, itctk"
+__credits__ = ["Le Tuan Anh"]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "Le Tuan Anh"
+__email__ = "<tuananh.ke@gmail.com>"
+__status__ = "Prototype"
+
+########################################################################
+
+import io
+import os
+import bz2
+import gzip
+import json
+import lzma
+from contextlib import ExitStack
+
+from .itctk import ITC_DATA_FILE, _read_rows, corpus_files
+from . import profiling
+
+# -----------------------------------------------------------------------
+# CONFIGURATION
+# -----------------------------------------------------------------------
+
+BUFFER_SIZE = 1 << 20  # bytes
+BATCH_SIZE = 1000  # sentences rendered before each write
+DEFAULT_OUTPUT = 'data/itc'
+EXTENSIONS = {'conllu': '.conllu', 'nltk': '.txt', 'jsonl': '.jsonl', 'text': '.text.txt'}
+COMPRESSORS = {'.gz': gzip.open, '.bz2': bz2.open, '.xz': lzma.open}
+
+
+# ----------------------------------------------------------------------------
+# FORMATS
+# ----------------------------------------------------------------------------
+
+def to_conllu(sid, rows):
+    lines = ['# sent_id = %s' % (sid + 1,), '# text = %s' % (' '.join(text for text, _ in rows),)]
+    for idx, (text, pos) in enumerate(rows, 1):
+        lines.append('%s\t%s\t_\t_\t%s\t_\t_\t_\t_\t_' % (idx, text, pos))
+    return '\n'.join(lines) + '\n\n'
+
+
+def to_nltk(sid, rows):
+    return ' '.join('%s/%s' % (text, pos) for text, pos in rows) + '\n'
+
+
+def to_jsonl(sid, rows):
+    return json.dumps({'id': sid, 'tokens': [text for text, _ in rows], 'pos': [pos for _, pos in rows]}, ensure_ascii=False) + '\n'
+
+
+def to_text(sid, rows):
+    return ' '.join(text for text, _ in rows) + '\n'
+
+
+FORMATS = {'conllu': to_conllu, 'nltk': to_nltk, 'jsonl': to_jsonl, 'text': to_text}
+
+
+# ----------------------------------------------------------------------------
+# FUNCTIONS
+# ----------------------------------------------------------------------------
+
+def open_output(path):
+    ''' Open a text file for writing with a large buffer, compressed when path ends with .gz, .bz2 or .xz
+    '''
+    compressor = COMPRESSORS.get(os.path.splitext(path)[1])
+    if compressor is None:
+        return open(path, 'w', encoding='utf-8', buffering=BUFFER_SIZE)
+    return io.TextIOWrapper(io.BufferedWriter(compressor(path, 'wb'), BUFFER_SIZE), encoding='utf-8')
+
+
+def check_formats(formats):
+    ''' Raise a ValueError listing the supported formats when one of formats is unknown, or when a format is repeated
+    '''
+    seen = set()
+    for fmt in formats:
+        if fmt not in FORMATS:
+            raise ValueError("Unknown export format: {} (formats: {})".format(fmt, ', '.join(sorted(FORMATS))))
+        if fmt in seen:
+            raise ValueError("Duplicate export format: {}".format(fmt))
+        seen.add(fmt)
+
+
+def default_outputs(formats, prefix=DEFAULT_OUTPUT, compression=''):
+    ''' {format: path} with the default file names, e.g. data/itc.conllu (or data/itc.conllu.gz)
+    '''
+    check_formats(formats)
+    return {fmt: prefix + EXTENSIONS[fmt] + compression for fmt in formats}
+
+
+def _rows(sentences):
+    for sent in sentences:
+        yield sent if isinstance(sent, list) else [(w.text, w.pos) for w in sent]
+
+
+def export(sentences, outputs, batch_size=BATCH_SIZE):
+    ''' Write sentences (Sentence objects or lists of (text, pos)) into one or more outputs in one pass.
+    outputs is {format: path} (see FORMATS). Return the number of sentences written.
+    '''
+    check_formats(outputs)
+    count = 0
+    with ExitStack() as stack:
+        # the outputs opened so far are closed when a later one can't be opened
+        writers = [(FORMATS[fmt], stack.enter_context(open_output(path))) for fmt, path in outputs.items()]
+        batches = [[] for _ in writers]
+        for sid, rows in enumerate(_rows(sentences)):
+            for (render, _), batch in zip(writers, batches):
+                batch.append(render(sid, rows))
+            count += 1
+            if count % batch_size == 0:
+                for (_, outfile), batch in zip(writers, batches):
+                    outfile.write(''.join(batch))
+                    batch.clear()
+        for (_, outfile), batch in zip(writers, batches):
+            outfile.write(''.join(batch))
+    return count
+
+
+def export_file(source_path=ITC_DATA_FILE, outputs=None, batch_size=BATCH_SIZE):
+    ''' Export an ITC file (or the files of a directory or glob pattern, see parse_data) without loading it into memory,
+    outputs defaults to {'nltk': 'data/itc.txt'}
+    '''
+    if outputs is None:
+        outputs = default_outputs(['nltk'])
+    rows = _file_rows(source_path)
+    with profiling.section('export_file') as sec:
+        if sec.start is not None:
+            sec.nbytes = profiling.corpus_size(source_path)
+            rows = _counted(rows, sec)
+        return export(rows, outputs, batch_size)
+
+
+def _file_rows(source_path):
+    for path in corpus_files(source_path):
+        yield from _read_rows(path)
+
+
+def _counted(sentences, sec):
+    ''' Count the tokens of sentences into a profiling section '''
+    for rows in sentences:
+        sec.tokens += len(rows)
+        yield rows
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+Approximate (edit distance) search over the lexicon of ITC documents.
+The index is built with symmetric deletes (as in SymSpell): every form is stored under all strings obtained by
+deleting up to max_distance characters, a query only generates its own deletes and the candidates which share one
+are verified with the Levenshtein distance.
+Latest version can be found at https://github.com/neocl/itctk
+
+@author: Le Tuan Anh <tuananh.ke@gmail.com>
+'''
+
+# Copyright (c) 2016, Le Tuan Anh <tuananh.ke@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+__author__ = "Le Tuan Anh <tuananh.ke@gmail.com>"
+__copyright__ = "Copyright 2016, itctk"
+__credits__ = ["Le Tuan Anh"]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "Le Tuan Anh"
+__email__ = "<tuananh.ke@gmail.com>"
+__status__ = "Prototype"
+
+########################################################################
+
+from collections import defaultdict, namedtuple
+
+from .index import split_posting
+
+# -----------------------------------------------------------------------
+# CONFIGURATION
+# -----------------------------------------------------------------------
+
+MAX_DISTANCE = 2
+
+# text: lexicon entry (lowercased), pos: set of POS, postings: [(sentence ID, position), ...]
+SimilarWord = namedtuple('SimilarWord', ['text', 'distance', 'pos', 'postings'])
+
+
+# ----------------------------------------------------------------------------
+# FUNCTIONS
+# ----------------------------------------------------------------------------
+
+def edit_distance(a, b, max_distance=None):
+    ''' Levenshtein distance between two strings.
+    When max_distance is given, stop early and return max_distance + 1 once the distance is known to be larger.
+    '''
+    if len(a) < len(b):
+        a, b = b, a
+    if max_distance is not None and len(a) - len(b) > max_distance:
+        return max_distance + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        if max_distance is not None and min(current) > max_distance:
+            return max_distance + 1
+        previous = current
+    return previous[-1]
+
+
+def deletes(word, max_distance):
+    ''' All strings obtained by deleting up to max_distance characters from word (including word itself)
+    '''
+    results = {word}
+    edge = {word}
+    for _ in range(max_distance):
+        edge = {w[:i] + w[i + 1:] for w in edge for i in range(len(w))}
+        results |= edge
+    return results
+
+
+# ----------------------------------------------------------------------------
+# DATA STRUCTURES
+# ----------------------------------------------------------------------------
+
+class SimilarityIndex:
+    ''' Symmetric delete index over some forms (e.g. the keys of Document.lexicon)
+    '''
+
+    def __init__(self, forms, max_distance=MAX_DISTANCE):
+        self.max_distance = max_distance
+        self.forms = sorted(set(forms))
+        self.buckets = defaultdict(list)
+        for fid, form in enumerate(self.forms):
+            for key in deletes(form, max_distance):
+                self.buckets[key].append(fid)
+
+    def __len__(self):
+        return len(self.forms)
+
+    def search(self, word, max_distance=None):
+        ''' Return [(form, distance), ...] of forms within max_distance of word, sorted by distance then form
+        '''
+        if max_distance is None:
+            max_distance = self.max_distance
+        elif max_distance > self.max_distance:
+            raise ValueError("max_distance must not be greater than %s (the distance of the index)" % (self.max_distance,))
+        candidates = set()
+        buckets = self.buckets
+        for key in deletes(word, max_distance):
+            fids = buckets.get(key)
+            if fids:
+                candidates.update(fids)
+        results = []
+        for fid in candidates:
+            form = self.forms[fid]
+            distance = edit_distance(word, form, max_distance)
+            if distance <= max_distance:
+                results.append((form, distance))
+        results.sort(key=lambda x: (x[1], x[0]))
+        return results
+
+    def clusters(self, max_distance=None):
+        ''' Group forms which are within max_distance of each other (transitively, with union-find).
+        Return clusters with more than one form, each cluster is sorted, clusters are sorted by their first form.
+        '''
+        parent = list(range(len(self.forms)))
+
+        def root(fid):
+            while parent[fid] != fid:
+                parent[fid] = parent[parent[fid]]
+                fid = parent[fid]
+            return fid
+        fids = {form: fid for fid, form in enumerate(self.forms)}
+        for fid, form in enumerate(self.forms):
+            for other, _ in self.search(form, max_distance):
+                a, b = root(fid), root(fids[other])
+                if a != b:
+                    parent[max(a, b)] = min(a, b)
+        groups = defaultdict(list)
+        for fid, form in enumerate(self.forms):
+            groups[root(fid)].append(form)
+        return sorted((group for group in groups.values() if len(group) > 1), key=lambda g: g[0])
+
+
+def similarity_index(doc, max_distance=MAX_DISTANCE):
+    ''' SimilarityIndex over the lexicon of a document, kept on the document until it is changed
+    '''
+    cached = doc._similar
+    if cached is None or cached[0] != doc.version or cached[1].max_distance < max_distance:
+        cached = (doc.version, SimilarityIndex(doc.lexicon.keys(), max(max_distance, MAX_DISTANCE)))
+        doc._similar = cached
+    return cached[1]
+
+
+def find_similar(doc, word, max_distance=1):
+    ''' Find lexicon entries within max_distance edits of word, with their POS and postings (see Document.find_similar)
+    '''
+    index = doc._index if doc._index is not None else doc.build_index()
+    results = []
+    for form, distance in similarity_index(doc, max_distance).search(word.lower(), max_distance):
+        postings = index.lookup(index.lower_forms.get(form, ()))
+        results.append(SimilarWord(form, distance, doc.lexicon[form], [split_posting(p) for p in postings]))
+    return results
+
+
+def cluster_similar(doc, max_distance=1):
+    ''' Group near-duplicate lexicon entries (e.g. spelling variants and typos) of a document
+    '''
+    return similarity_index(doc, max_distance).clusters(max_distance)
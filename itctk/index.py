@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+Positional inverted index and prefix/suffix (affix) index for ITC documents.
+Latest version can be found at https://github.com/neocl/itctk
+
+@author: Le Tuan Anh <tuananh.ke@gmail.com>
+'''
+
+# Copyright (c) 2016, Le Tuan Anh <tuananh.ke@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+__author__ = "Le Tuan Anh <tuananh.ke@gmail.com>"
+__copyright__ = "Copyright 2016, itctk"
+__credits__ = ["Le Tuan Anh"]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "Le Tuan Anh"
+__email__ = "<tuananh.ke@gmail.com>"
+__status__ = "Prototype"
+
+########################################################################
+
+import re
+from array import array
+from bisect import bisect_left
+from collections import defaultdict
+try:
+    from re import _parser as sre_parse
+    from re import _constants as sre_constants
+except ImportError:  # Python < 3.11
+    import sre_parse
+    import sre_constants
+
+# -----------------------------------------------------------------------
+# CONFIGURATION
+# -----------------------------------------------------------------------
+
+# A posting is a (sentence ID, position) pair packed into one integer
+POSITION_BITS = 32
+POSITION_MASK = (1 << POSITION_BITS) - 1
+MAX_CHAR = '\U0010ffff'
+
+
+# ----------------------------------------------------------------------------
+# DATA STRUCTURES
+# ----------------------------------------------------------------------------
+
+def literal_affixes(text):
+    ''' Return (prefix, suffix): the literal text that every string matched by a regular expression (with re.match)
+    must start with, and must end with when the expression is anchored at the end ($ or \\Z). Either may be empty.
+    '''
+    try:
+        parsed = sre_parse.parse(text)
+    except (re.error, RecursionError):
+        return '', ''
+    if parsed.state.flags & sre_constants.SRE_FLAG_IGNORECASE:
+        return '', ''
+    items = list(parsed)
+    if items and items[0] == (sre_constants.AT, sre_constants.AT_BEGINNING):
+        items = items[1:]
+    prefix = []
+    for op, av in items:
+        if op is not sre_constants.LITERAL:
+            break
+        prefix.append(chr(av))
+    suffix = []
+    if len(prefix) < len(items) - 1 and items[-1] in ((sre_constants.AT, sre_constants.AT_END), (sre_constants.AT, sre_constants.AT_END_STRING)):
+        for op, av in reversed(items[:-1]):
+            if op is not sre_constants.LITERAL:
+                break
+            suffix.append(chr(av))
+    return ''.join(prefix), ''.join(reversed(suffix))
+
+
+class AffixIndex:
+    ''' Sorted arrays of some forms (e.g. the keys of Document.lexicon) and of their reversed strings,
+    to find all forms with a prefix and/or a suffix in O(log V + hits) with binary search.
+    '''
+
+    def __init__(self, forms):
+        self.forms = sorted(set(forms))
+        self.reversed_forms = sorted(form[::-1] for form in self.forms)
+
+    def __len__(self):
+        return len(self.forms)
+
+    @staticmethod
+    def _range(keys, prefix):
+        return bisect_left(keys, prefix), bisect_left(keys, prefix + MAX_CHAR)
+
+    def prefix(self, prefix):
+        ''' Forms which start with prefix, in sorted order
+        '''
+        start, end = self._range(self.forms, prefix)
+        return self.forms[start:end]
+
+    def suffix(self, suffix):
+        ''' Forms which end with suffix (sorted by their reversed string, e.g. all -lah then all -nya)
+        '''
+        start, end = self._range(self.reversed_forms, suffix[::-1])
+        return [form[::-1] for form in self.reversed_forms[start:end]]
+
+    def affix(self, prefix='', suffix=''):
+        ''' Forms which start with prefix and end with suffix, only the smaller of the two ranges is scanned
+        '''
+        if not suffix:
+            return self.prefix(prefix)
+        pstart, pend = self._range(self.forms, prefix)
+        sstart, send = self._range(self.reversed_forms, suffix[::-1])
+        min_len = len(prefix) + len(suffix)
+        if pend - pstart <= send - sstart:
+            return [form for form in self.forms[pstart:pend] if form.endswith(suffix) and len(form) >= min_len]
+        forms = [form[::-1] for form in self.reversed_forms[sstart:send]]
+        return sorted(form for form in forms if form.startswith(prefix) and len(form) >= min_len)
+
+    def candidates(self, text):
+        ''' Forms which may match a regular expression (by its literal prefix/suffix), or None if all forms may match
+        '''
+        prefix, suffix = literal_affixes(text)
+        if not prefix and not suffix:
+            return None
+        return self.affix(prefix, suffix)
+
+    def match(self, text):
+        ''' Forms which match a regular expression (re.match), using the literal prefix/suffix to skip other forms
+        '''
+        pattern = re.compile(text)
+        forms = self.candidates(text)
+        return [form for form in (self.forms if forms is None else forms) if pattern.match(form)]
+
+
+def make_posting(sid, position):
+    return (sid << POSITION_BITS) | position
+
+
+def split_posting(posting):
+    ''' Return (sentence ID, position) of a posting
+    '''
+    return posting >> POSITION_BITS, posting & POSITION_MASK
+
+
+class InvertedIndex:
+    ''' Map each word form of a document to its postings, i.e. where the form occurs (sentence ID, position).
+    - postings: surface form -> sorted array of postings
+    - lower_forms: lowercased form -> list of surface forms
+    Regular expressions are matched against the distinct forms only, then the postings of the matched forms are merged.
+    '''
+
+    def __init__(self, doc):
+        self.doc = doc
+        self.postings = {}
+        self.lower_forms = defaultdict(list)
+        self._affix = {}
+        if hasattr(doc, 'token_ids'):
+            self._index_compact(doc)
+        else:
+            self._index_sentences(doc)
+        for form in self.postings:
+            self.lower_forms[form.lower()].append(form)
+
+    def _index_sentences(self, doc):
+        postings = defaultdict(lambda: array('Q'))
+        for sid, sent in enumerate(doc):
+            for position, word in enumerate(sent):
+                postings[word.text].append(make_posting(sid, position))
+        self.postings = dict(postings)
+
+    def _index_compact(self, doc):
+        ''' Build postings straight from the token arrays of a CompactDocument
+        '''
+        postings = defaultdict(lambda: array('Q'))
+        token_ids = doc.token_ids
+        offsets = doc.offsets
+        for sid in range(len(offsets) - 1):
+            start = offsets[sid]
+            for idx in range(start, offsets[sid + 1]):
+                postings[token_ids[idx]].append(make_posting(sid, idx - start))
+        vocab = doc.vocab
+        self.postings = {vocab[tid]: plist for tid, plist in postings.items()}
+
+    def __len__(self):
+        return len(self.postings)
+
+    def __contains__(self, form):
+        return form in self.postings
+
+    def forms(self, case_sensitive=True):
+        ''' Distinct forms (surface forms, or lowercased forms when case_sensitive is False)
+        '''
+        return self.postings.keys() if case_sensitive else self.lower_forms.keys()
+
+    def affix_index(self, case_sensitive=True):
+        ''' AffixIndex over the surface forms (or the lowercased forms), built on first use
+        '''
+        if case_sensitive not in self._affix:
+            self._affix[case_sensitive] = AffixIndex(self.forms(case_sensitive))
+        return self._affix[case_sensitive]
+
+    def match_forms(self, text, case_sensitive=True):
+        ''' Return surface forms whose form matches a regular expression (same semantics as Document.find_word).
+        Expressions with a literal prefix (e.g. 'mem.+') or a literal suffix (e.g. '.+nya$') only check the forms
+        with that prefix/suffix (see AffixIndex).
+        '''
+        pattern = re.compile(text)
+        if literal_affixes(text) != ('', ''):
+            forms = self.affix_index(case_sensitive).match(text)
+            if case_sensitive:
+                return forms
+            return [surface for lower in forms for surface in self.lower_forms[lower]]
+        if case_sensitive:
+            return [form for form in self.postings if pattern.match(form)]
+        forms = []
+        for lower, surface_forms in self.lower_forms.items():
+            if pattern.match(lower):
+                forms.extend(surface_forms)
+        return forms
+
+    def lookup(self, forms):
+        ''' Return the merged and sorted postings of some surface forms
+        '''
+        merged = array('Q')
+        for form in forms:
+            plist = self.postings.get(form)
+            if plist:
+                merged.extend(plist)
+        return sorted(merged)
+
+    def search(self, text, case_sensitive=True):
+        ''' Return sorted postings of words that match a regular expression
+        '''
+        return self.lookup(self.match_forms(text, case_sensitive))
+
+    def sentence_ids(self, postings):
+        ''' Return distinct sentence IDs of sorted postings, in document order
+        '''
+        sids = []
+        last = -1
+        for posting in postings:
+            sid = posting >> POSITION_BITS
+            if sid != last:
+                sids.append(sid)
+                last = sid
+        return sids
+
+    def words(self, postings):
+        ''' Return word objects of postings
+        '''
+        doc = self.doc
+        return [doc[posting >> POSITION_BITS][posting & POSITION_MASK] for posting in postings]
@@ -50,21 +50,53 @@ __status__ = "Prototype"
 
 import sys
 import os
+import gc
 import argparse
 import re
+import bz2
+import glob
+import gzip
+import lzma
+from array import array
+from bisect import bisect_right
 from collections import defaultdict
 from collections import namedtuple
+from contextlib import contextmanager
+
+from .index import InvertedIndex, AffixIndex, POSITION_BITS, literal_affixes
+from .qcache import QueryCache, MAX_ENTRIES, MAX_BYTES
+from .tagset import POS_TAGS
+from . import fuzzy
+from . import concordance
 
 # -----------------------------------------------------------------------
 # CONFIGURATION
 # -----------------------------------------------------------------------
 ITC_DATA_FILE = 'data/itcdata/Indonesian_Manually_Tagged_Corpus.tsv'
+CHUNK_SIZE = 1 << 24  # ITC files are read 16MB at a time
+ENGINES = ('default', 'fast')  # see parse_data, both use the same parser
+DECOMPRESSORS = {'.gz': gzip.open, '.bz2': bz2.open, '.xz': lzma.open}
+CORPUS_PATTERNS = ('*.tsv', '*.tsv.gz', '*.tsv.bz2', '*.tsv.xz')  # files of a corpus directory
 
 
 # ----------------------------------------------------------------------------
 # DATA STRUCTURES
 # ----------------------------------------------------------------------------
 
+class ParseError(ValueError):
+    ''' A malformed line in an ITC file (a line must contain exactly one tab: text\tPOS)
+    '''
+
+    def __init__(self, lineno, line, path=None):
+        self.lineno = lineno
+        self.line = line
+        self.path = path
+        ValueError.__init__(self, "Malformed line %s%s: %r (expected text<TAB>POS)" % (lineno, ' in %s' % (path,) if path else '', line))
+
+    def __reduce__(self):
+        return (ParseError, (self.lineno, self.line, self.path))
+
+
 class Document:
     ''' A document contains many sentences
     '''
@@ -73,15 +105,21 @@ class Document:
         self.words = []
         self.lexicon = defaultdict(set)
         self.pos = defaultdict(set)
+        self._index = None
+        self._affix = None
+        self._similar = None
+        self.shards = []  # [(file path, first sentence ID, end sentence ID), ...] when parsed from files
+        self.version = 0  # increased whenever the document is changed
+        self.query_cache = None
 
         if sentences is None:
             self.sentences = []
         else:
             self.sentences = sentences
-            # auto add all words in provided sentences into this doc
+            # auto add all words in provided sentences into this doc, lexicon and POS maps are built once
             for sent in sentences:
-                for word in sent:
-                    self.add_word(word)
+                self.words.extend(sent)
+            _fill_lexicon(self, set((w.text, w.pos) for w in self.words))
 
     def __len__(self):
         return len(self.sentences)
@@ -101,11 +139,23 @@ class Document:
         '''
         sent = Sentence(self)
         self.sentences.append(sent)
+        self._changed()
         return sent
 
+    def _changed(self):
+        self.version += 1
+        self._index = None
+        if self.query_cache is not None:
+            self.query_cache.clear()
+
     def add_word(self, word):
         ''' Add a word into sentence. Normally you should NOT call this method.
+        Parsers build documents in bulk (see _bulk_document), this is only used when a document is edited.
         '''
+        self.version += 1
+        self._index = None
+        if self.query_cache is not None:
+            self.query_cache.clear()
         self.words.append(word)
         self.lexicon[word.text.lower()].add(word.pos)
         self.pos[word.pos].add(word.text.lower())
@@ -126,18 +176,94 @@ class Document:
         '''
         return '\n'.join([x.text() for x in self])
 
-    def find(self, text, case_sensitive=True):
-        words = self.find_word(text, case_sensitive)
-        sents = set([x.sentence for x in words])
-        subdoc = Document(list(sents))
-        return subdoc
+    def build_index(self):
+        ''' Build an inverted index (see itctk.index) which is used by find() and find_word() afterwards.
+        The index is dropped when a new word is added.
+        '''
+        self._index = InvertedIndex(self)
+        return self._index
+
+    def find_affix(self, prefix='', suffix=''):
+        ''' Return sorted lexicon entries (lowercased forms) which start with prefix and end with suffix,
+        e.g. find_affix('ber', 'an') or find_affix(suffix='lah'). Binary search over the lexicon, O(log V + hits).
+        '''
+        return _lexicon_affix(self).affix(prefix.lower(), suffix.lower())
+
+    def find_similar(self, word, max_distance=1):
+        ''' Find lexicon entries within max_distance edits (Levenshtein) of word, e.g. typos and spelling variants.
+        Return a list of SimilarWord(text, distance, pos, postings) sorted by distance, where postings are
+        (sentence ID, position) pairs. The approximate-match index is built on first use (see itctk.fuzzy).
+        '''
+        return fuzzy.find_similar(self, word, max_distance)
+
+    def cluster_similar(self, max_distance=1):
+        ''' Group all lexicon entries which are within max_distance edits of each other, return a list of clusters
+        '''
+        return fuzzy.cluster_similar(self, max_distance)
+
+    def shard_of(self, sid):
+        ''' Return the file which a sentence was parsed from (see parse_data), or None
+        '''
+        return _shard_of(self, sid)
+
+    def kwic(self, query, left=5, right=5, pos=None, case_sensitive=True, cross_sentence=False, show_pos=False):
+        ''' Keyword in context: generate a KwicLine(sid, position, left, keyword, right) for each word which matches
+        query (a regular expression, optionally only with the POS tag(s) pos). Uses the inverted index.
+        e.g. for line in doc.kwic('makan', 3, 3, pos='VB'): print(line)
+        '''
+        return concordance.kwic(self, query, left, right, pos, case_sensitive, cross_sentence, show_pos)
+
+    def proximity(self, first, second, within=5, first_pos=None, second_pos=None, ordered=False, case_sensitive=True):
+        ''' Generate a ProximityHit(sid, first, second) for each word matching first with a word matching second
+        at most `within` tokens away in the same sentence (see itctk.concordance)
+        '''
+        return concordance.proximity(self, first, second, within, first_pos, second_pos, ordered, case_sensitive)
+
+    def enable_query_cache(self, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES):
+        ''' Cache results of find(), find_word() and cached_query() in a bounded LRU cache (see itctk.qcache).
+        The cache is cleared when the document is changed.
+        '''
+        self.query_cache = QueryCache(max_entries, max_bytes)
+        return self.query_cache
+
+    def cached_query(self, kind, pattern, flags, compute):
+        ''' Return the cached result of a query (kind, pattern, flags), or compute() it
+        '''
+        return _cached_query(self, kind, pattern, flags, compute)
+
+    def find(self, text, case_sensitive=True, use_index=None):
+        ''' Find sentences which contain a word that matches a regular expression.
+        Return a DocumentView (in document order), chained queries such as doc.find('kita').find('makan')
+        only search the sentences found before.
+        '''
+        return _cached_query(self, 'find', text, case_sensitive, lambda: self._find(text, case_sensitive, use_index))
+
+    def _find(self, text, case_sensitive, use_index):
+        index = _get_index(self, use_index, text)
+        if index is not None:
+            return DocumentView(self, index.sentence_ids(index.search(text, case_sensitive)))
+        pattern = re.compile(text)
+        if case_sensitive:
+            sids = [sid for sid, sent in enumerate(self.sentences) if any(pattern.match(w.text) for w in sent)]
+        else:
+            sids = [sid for sid, sent in enumerate(self.sentences) if any(pattern.match(w.text.lower()) for w in sent)]
+        return DocumentView(self, sids)
 
     def filter(self, pattern_text):
         pattern = re.compile(pattern_text)
 
-    def find_word(self, text, case_sensitive=True):
+    def find_word(self, text, case_sensitive=True, use_index=None):
         ''' Find a word by regular expression
+        use_index: True to use the inverted index (build it if needed), False to scan all words,
+                   None (default) to use the index if it has been built or if the expression has a literal
+                   prefix/suffix (e.g. 'mem.+', '.+nya$'), which is then found with a binary search
         '''
+        return list(_cached_query(self, 'find_word', text, case_sensitive, lambda: self._find_word(text, case_sensitive, use_index)))
+
+    def _find_word(self, text, case_sensitive, use_index):
+        index = _get_index(self, use_index, text)
+        if index is not None:
+            return index.words(index.search(text, case_sensitive))
         pattern = re.compile(text)
         if case_sensitive:
             return [w for w in self.words if pattern.match(w.text)]
@@ -145,6 +271,154 @@ class Document:
             return [w for w in self.words if pattern.match(w.text.lower())]
 
 
+class DocumentView:
+    ''' A sub-document which refers to some sentences of a parent document by their IDs (positions).
+    Nothing is copied: words, lexicon and pos are computed on demand.
+    Views over the same parent can be combined with & (and), | (or), - (and not) and ~ (not).
+    '''
+
+    def __init__(self, parent, ids=None):
+        if isinstance(parent, DocumentView):
+            parent = parent.parent
+        self.parent = parent
+        self.ids = array('I', range(len(parent)) if ids is None else ids)
+        self._idset = None
+        self._words = None
+        self._lexicon = None
+        self._pos = None
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.parent[sid] for sid in self.ids[index]]
+        return self.parent[self.ids[index]]
+
+    def __iter__(self):
+        parent = self.parent
+        for sid in self.ids:
+            yield parent[sid]
+
+    def __repr__(self):
+        return str(self.sentences)
+
+    def __contains__(self, sid):
+        return sid in self.idset
+
+    @property
+    def idset(self):
+        if self._idset is None:
+            self._idset = frozenset(self.ids)
+        return self._idset
+
+    @property
+    def sentences(self):
+        return list(self)
+
+    @property
+    def words(self):
+        if self._words is None:
+            self._words = [w for sent in self for w in sent]
+        return self._words
+
+    @property
+    def lexicon(self):
+        if self._lexicon is None:
+            self._build_maps()
+        return self._lexicon
+
+    @property
+    def pos(self):
+        if self._pos is None:
+            self._build_maps()
+        return self._pos
+
+    def _build_maps(self):
+        lexicon = defaultdict(set)
+        pos = defaultdict(set)
+        for text, tag in set((w.text, w.pos) for w in self.words):
+            lexicon[text.lower()].add(tag)
+            pos[tag].add(text.lower())
+        self._lexicon = lexicon
+        self._pos = pos
+
+    def word_list(self):
+        ''' Return a list of distinct word (as string, not word object) in this view
+        '''
+        return list(sorted(self.lexicon.keys()))
+
+    def pos_list(self):
+        ''' Return a list of all POS that are used in this view
+        '''
+        return list(sorted(self.pos.keys()))
+
+    def text(self):
+        ''' Return a text-only version of this view
+        '''
+        return '\n'.join([x.text() for x in self])
+
+    def find(self, text, case_sensitive=True, use_index=None):
+        ''' Find sentences of this view which contain a word that matches a regular expression.
+        When the parent document has an inverted index, the cost depends on the number of hits only.
+        '''
+        index = _get_index(self.parent, use_index, text)
+        if index is not None:
+            idset = self.idset
+            sids = [sid for sid in index.sentence_ids(index.search(text, case_sensitive)) if sid in idset]
+        else:
+            pattern = re.compile(text)
+            if case_sensitive:
+                sids = [sid for sid in self.ids if any(pattern.match(w.text) for w in self.parent[sid])]
+            else:
+                sids = [sid for sid in self.ids if any(pattern.match(w.text.lower()) for w in self.parent[sid])]
+        return DocumentView(self.parent, sids)
+
+    def find_word(self, text, case_sensitive=True, use_index=None):
+        ''' Find words of this view by regular expression (see Document.find_word)
+        '''
+        index = _get_index(self.parent, use_index, text)
+        if index is not None:
+            idset = self.idset
+            return index.words([p for p in index.search(text, case_sensitive) if (p >> POSITION_BITS) in idset])
+        pattern = re.compile(text)
+        if case_sensitive:
+            return [w for w in self.words if pattern.match(w.text)]
+        else:
+            return [w for w in self.words if pattern.match(w.text.lower())]
+
+    def filter(self, condition):
+        ''' Return a view of sentences for which condition(sentence) is true
+        '''
+        parent = self.parent
+        return DocumentView(parent, [sid for sid in self.ids if condition(parent[sid])])
+
+    def to_document(self):
+        ''' Copy the sentences of this view into a new Document
+        '''
+        return Document(list(self))
+
+    def _check(self, other):
+        if not isinstance(other, DocumentView) or other.parent is not self.parent:
+            raise ValueError("Only views of the same document can be combined")
+
+    def __and__(self, other):
+        self._check(other)
+        return DocumentView(self.parent, sorted(self.idset.intersection(other.ids)))
+
+    def __or__(self, other):
+        self._check(other)
+        return DocumentView(self.parent, sorted(self.idset.union(other.ids)))
+
+    def __sub__(self, other):
+        self._check(other)
+        return DocumentView(self.parent, sorted(self.idset.difference(other.ids)))
+
+    def __invert__(self):
+        idset = self.idset
+        return DocumentView(self.parent, [sid for sid in range(len(self.parent)) if sid not in idset])
+
+
 class Sentence:
     ''' Sentence structure
     Words can be accessed by using sent.words (as a list)
@@ -225,57 +499,794 @@ class Word:
         return (self.text, self.pos) < (other.text, other.pos)
 
 
+# ----------------------------------------------------------------------------
+# COMPACT (COLUMNAR) DATA STRUCTURES
+# ----------------------------------------------------------------------------
+
+class Vocabulary:
+    ''' An interned list of distinct strings. Each string is identified by its position in the list.
+    '''
+
+    def __init__(self, items=None):
+        self.items = []
+        self._ids = {}
+        if items:
+            for item in items:
+                self.intern(item)
+
+    @staticmethod
+    def from_list(items):
+        ''' Create a vocabulary from a list of distinct strings (the lookup table is built on first use)
+        '''
+        vocab = Vocabulary()
+        vocab.items = items
+        vocab._ids = None
+        return vocab
+
+    @property
+    def ids(self):
+        if self._ids is None:
+            self._ids = {item: idx for idx, item in enumerate(self.items)}
+        return self._ids
+
+    def __len__(self):
+        return len(self.items)
+
+    def __getitem__(self, index):
+        return self.items[index]
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __contains__(self, item):
+        return item in self.ids
+
+    def __repr__(self):
+        return 'Vocabulary(%s)' % (len(self),)
+
+    def get_id(self, item, default=None):
+        ''' Return ID of an item (or default if the item does not exist)
+        '''
+        return self.ids.get(item, default)
+
+    def intern(self, item):
+        ''' Return ID of an item, add it into this vocabulary if needed
+        '''
+        idx = self.ids.get(item)
+        if idx is None:
+            idx = len(self.items)
+            self.items.append(item)
+            self.ids[item] = idx
+        return idx
+
+
+class CompactDocument:
+    ''' A memory efficient document which stores its tokens in typed arrays instead of Word objects.
+    - token_ids: ID of each token's text in vocab
+    - pos_ids: ID of each token's POS in tagset, the tagset starts with POS_TAGS so known tags have their stable IDs
+      (see itctk.tagset.TAG_IDS) and unknown tags are appended
+    - offsets: token index where each sentence starts (plus one extra item for the end of the last sentence)
+    Sentences and words are created on demand as light-weight views (SentenceView and WordView)
+    and the Document API (find, find_word, lexicon, pos, word_list, etc.) is available.
+    '''
+
+    def __init__(self):
+        self.vocab = Vocabulary()
+        self.tagset = Vocabulary(POS_TAGS)
+        self.token_ids = array('I')
+        self.pos_ids = array('B')
+        self.offsets = array('I', [0])
+        self._lexicon = None
+        self._pos = None
+        self._index = None
+        self._affix = None
+        self._similar = None
+        self.shards = []
+        self.version = 0
+        self.query_cache = None
+
+    @staticmethod
+    def from_sentences(sentences):
+        ''' Build a compact document from a Document or any iterable of sentences (e.g. iter_sentences())
+        '''
+        doc = CompactDocument()
+        for sent in sentences:
+            doc.add_sentence((w.text, w.pos) for w in sent)
+        return doc
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [SentenceView(self, sid) for sid in range(len(self))[index]]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('sentence index out of range')
+        return SentenceView(self, index)
+
+    def __iter__(self):
+        for sid in range(len(self)):
+            yield SentenceView(self, sid)
+
+    def __repr__(self):
+        return str(self.sentences)
+
+    @property
+    def sentences(self):
+        return self[:]
+
+    @property
+    def words(self):
+        return _WordList(self)
+
+    @property
+    def lexicon(self):
+        if self._lexicon is None:
+            self._build_maps()
+        return self._lexicon
+
+    @property
+    def pos(self):
+        if self._pos is None:
+            self._build_maps()
+        return self._pos
+
+    def _build_maps(self):
+        ''' Build lexicon and pos maps from distinct (token, POS) pairs, each word is lowercased only once
+        '''
+        lexicon = defaultdict(set)
+        pos = defaultdict(set)
+        for tid, pid in set(zip(self.token_ids, self.pos_ids)):
+            text = self.vocab[tid].lower()
+            tag = self.tagset[pid]
+            lexicon[text].add(tag)
+            pos[tag].add(text)
+        self._lexicon = lexicon
+        self._pos = pos
+
+    def _changed(self):
+        self._lexicon = None
+        self._pos = None
+        self._index = None
+        self.version += 1
+        if self.query_cache is not None:
+            self.query_cache.clear()
+        if not isinstance(self.token_ids, array):
+            # columns are read-only views (e.g. memory-mapped from a cache file), copy before writing
+            self.token_ids = array('I', self.token_ids)
+            self.pos_ids = array('B', self.pos_ids)
+            self.offsets = array('I', self.offsets)
+
+    def new_sentence(self):
+        ''' Create a new (empty) sentence at the end of this document
+        '''
+        self._changed()
+        self.offsets.append(len(self.token_ids))
+        return SentenceView(self, len(self) - 1)
+
+    def add_sentence(self, rows):
+        ''' Add a new sentence from a list of (text, pos) tuples
+        '''
+        self._changed()
+        vocab_ids = self.vocab.ids
+        tag_ids = self.tagset.ids
+        for text, pos in rows:
+            tid = vocab_ids.get(text)
+            if tid is None:
+                tid = self.vocab.intern(text)
+            pid = tag_ids.get(pos)
+            if pid is None:
+                pid = self.tagset.intern(pos)
+            self.token_ids.append(tid)
+            self.pos_ids.append(pid)
+        self.offsets.append(len(self.token_ids))
+
+    def add_word(self, text, pos):
+        ''' Add a word into the last sentence. Normally you should NOT call this method.
+        '''
+        self._changed()
+        self.token_ids.append(self.vocab.intern(text))
+        self.pos_ids.append(self.tagset.intern(pos))
+        self.offsets[-1] = len(self.token_ids)
+
+    def word_list(self):
+        ''' Return a list of distinct word (as string, not word object) in this document
+        '''
+        return list(sorted(self.lexicon.keys()))
+
+    def pos_list(self):
+        ''' Return a list of all POS that are used in this document
+        '''
+        return list(sorted(self.pos.keys()))
+
+    def text(self):
+        ''' Return a text-only version of this doc
+        '''
+        return '\n'.join([x.text() for x in self])
+
+    def build_index(self):
+        ''' Build an inverted index (see itctk.index) which is used by find() and find_word() afterwards
+        '''
+        self._index = InvertedIndex(self)
+        return self._index
+
+    def find_affix(self, prefix='', suffix=''):
+        ''' Return sorted lexicon entries (lowercased forms) which start with prefix and end with suffix,
+        e.g. find_affix('ber', 'an') or find_affix(suffix='lah'). Binary search over the lexicon, O(log V + hits).
+        '''
+        return _lexicon_affix(self).affix(prefix.lower(), suffix.lower())
+
+    def find_similar(self, word, max_distance=1):
+        ''' Find lexicon entries within max_distance edits (Levenshtein) of word, e.g. typos and spelling variants.
+        Return a list of SimilarWord(text, distance, pos, postings) sorted by distance, where postings are
+        (sentence ID, position) pairs. The approximate-match index is built on first use (see itctk.fuzzy).
+        '''
+        return fuzzy.find_similar(self, word, max_distance)
+
+    def cluster_similar(self, max_distance=1):
+        ''' Group all lexicon entries which are within max_distance edits of each other, return a list of clusters
+        '''
+        return fuzzy.cluster_similar(self, max_distance)
+
+    def shard_of(self, sid):
+        ''' Return the file which a sentence was parsed from (see parse_data), or None
+        '''
+        return _shard_of(self, sid)
+
+    def kwic(self, query, left=5, right=5, pos=None, case_sensitive=True, cross_sentence=False, show_pos=False):
+        ''' Keyword in context: generate a KwicLine(sid, position, left, keyword, right) for each word which matches
+        query (a regular expression, optionally only with the POS tag(s) pos). Uses the inverted index.
+        e.g. for line in doc.kwic('makan', 3, 3, pos='VB'): print(line)
+        '''
+        return concordance.kwic(self, query, left, right, pos, case_sensitive, cross_sentence, show_pos)
+
+    def proximity(self, first, second, within=5, first_pos=None, second_pos=None, ordered=False, case_sensitive=True):
+        ''' Generate a ProximityHit(sid, first, second) for each word matching first with a word matching second
+        at most `within` tokens away in the same sentence (see itctk.concordance)
+        '''
+        return concordance.proximity(self, first, second, within, first_pos, second_pos, ordered, case_sensitive)
+
+    def enable_query_cache(self, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES):
+        ''' See Document.enable_query_cache()
+        '''
+        self.query_cache = QueryCache(max_entries, max_bytes)
+        return self.query_cache
+
+    def cached_query(self, kind, pattern, flags, compute):
+        ''' Return the cached result of a query (kind, pattern, flags), or compute() it
+        '''
+        return _cached_query(self, kind, pattern, flags, compute)
+
+    def find(self, text, case_sensitive=True, use_index=None):
+        ''' Find sentences which contain a word that matches a regular expression, return a DocumentView
+        '''
+        return _cached_query(self, 'find', text, case_sensitive, lambda: self._find(text, case_sensitive, use_index))
+
+    def _find(self, text, case_sensitive, use_index):
+        index = _get_index(self, use_index, text)
+        if index is not None:
+            sids = index.sentence_ids(index.search(text, case_sensitive))
+        else:
+            sids = []
+            for w in self._find_word(text, case_sensitive, False):
+                if not sids or sids[-1] != w.sid:
+                    sids.append(w.sid)
+        return DocumentView(self, sids)
+
+    def find_word(self, text, case_sensitive=True, use_index=None):
+        ''' Find a word by regular expression.
+        The pattern is matched against the distinct vocabulary only, not against every token.
+        See Document.find_word() for use_index.
+        '''
+        return list(_cached_query(self, 'find_word', text, case_sensitive, lambda: self._find_word(text, case_sensitive, use_index)))
+
+    def _find_word(self, text, case_sensitive, use_index):
+        index = _get_index(self, use_index, text)
+        if index is not None:
+            return index.words(index.search(text, case_sensitive))
+        pattern = re.compile(text)
+        if case_sensitive:
+            matched = set(idx for idx, w in enumerate(self.vocab) if pattern.match(w))
+        else:
+            matched = set(idx for idx, w in enumerate(self.vocab) if pattern.match(w.lower()))
+        if not matched:
+            return []
+        words = []
+        sid = 0
+        offsets = self.offsets
+        for idx, tid in enumerate(self.token_ids):
+            if tid in matched:
+                while offsets[sid + 1] <= idx:
+                    sid += 1
+                words.append(WordView(self, sid, idx))
+        return words
+
+    def to_document(self):
+        ''' Convert this compact document into a normal Document.
+        Word objects are created directly and lexicon and POS maps are built once from the distinct (token, POS) ID pairs.
+        '''
+        texts = list(self.vocab)
+        tags = list(self.tagset)
+        token_ids = self.token_ids
+        pos_ids = self.pos_ids
+        offsets = self.offsets
+        doc = Document()
+        sentences = doc.sentences
+        words = doc.words
+        with _paused_gc():
+            for sid in range(len(offsets) - 1):
+                start = offsets[sid]
+                end = offsets[sid + 1]
+                sentence = Sentence(doc)
+                sentence.words = [Word(texts[tid], tags[pid], sentence) for tid, pid in zip(token_ids[start:end], pos_ids[start:end])]
+                sentences.append(sentence)
+                words.extend(sentence.words)
+            _fill_lexicon(doc, ((texts[tid], tags[pid]) for tid, pid in set(zip(token_ids, pos_ids))))
+        doc.shards = list(self.shards)
+        return doc
+
+
+class _WordList:
+    ''' A read-only list of all words in a compact document, WordViews are created on demand
+    '''
+
+    def __init__(self, doc):
+        self.doc = doc
+
+    def __len__(self):
+        return len(self.doc.token_ids)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(len(self))[index]]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('word index out of range')
+        # empty sentences share their offset with the next sentence, bisect_right skips them
+        sid = bisect_right(self.doc.offsets, index) - 1
+        return WordView(self.doc, sid, index)
+
+    def __iter__(self):
+        offsets = self.doc.offsets
+        for sid in range(len(offsets) - 1):
+            for idx in range(offsets[sid], offsets[sid + 1]):
+                yield WordView(self.doc, sid, idx)
+
+    def __repr__(self):
+        return str(list(self))
+
+
+class SentenceView:
+    ''' A light-weight sentence of a CompactDocument, created on demand
+    '''
+
+    __slots__ = ('doc', 'ID')
+
+    def __init__(self, doc, sid):
+        self.doc = doc
+        self.ID = sid
+
+    @property
+    def words(self):
+        return [WordView(self.doc, self.ID, idx) for idx in self._range()]
+
+    def _range(self):
+        return range(self.doc.offsets[self.ID], self.doc.offsets[self.ID + 1])
+
+    def __str__(self):
+        return " ".join([str(x) for x in self])
+
+    def __repr__(self):
+        return str(self)
+
+    def __eq__(self, other):
+        return isinstance(other, SentenceView) and self.doc is other.doc and self.ID == other.ID
+
+    def __ne__(self, other):
+        return not (self == other)
+
+    def __hash__(self):
+        return hash((id(self.doc), self.ID))
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.words[index]
+        size = len(self)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError('word index out of range')
+        return WordView(self.doc, self.ID, self.doc.offsets[self.ID] + index)
+
+    def __len__(self):
+        return self.doc.offsets[self.ID + 1] - self.doc.offsets[self.ID]
+
+    def __iter__(self):
+        for idx in self._range():
+            yield WordView(self.doc, self.ID, idx)
+
+    def new_word(self, text, pos):
+        ''' Add a new word into this sentence (only the last sentence of a document can be extended)
+        '''
+        if self.ID != len(self.doc) - 1:
+            raise ValueError("Only the last sentence of a CompactDocument can be extended")
+        self.doc.add_word(text, pos)
+        return WordView(self.doc, self.ID, len(self.doc.token_ids) - 1)
+
+    def text(self):
+        ''' Return text-only version of this sentence
+        '''
+        vocab = self.doc.vocab
+        token_ids = self.doc.token_ids
+        return " ".join([vocab[token_ids[idx]] for idx in self._range()])
+
+    def pos(self):
+        ''' Return sentence structure (a sequence of POS as a string)
+        '''
+        tagset = self.doc.tagset
+        pos_ids = self.doc.pos_ids
+        return " ".join([tagset[pos_ids[idx]] for idx in self._range()])
+
+
+class WordView:
+    ''' A light-weight word of a CompactDocument, created on demand
+    '''
+
+    __slots__ = ('doc', 'sid', 'idx')
+
+    def __init__(self, doc, sid, idx):
+        self.doc = doc
+        self.sid = sid
+        self.idx = idx
+
+    @property
+    def text(self):
+        return self.doc.vocab[self.doc.token_ids[self.idx]]
+
+    @property
+    def pos(self):
+        return self.doc.tagset[self.doc.pos_ids[self.idx]]
+
+    @property
+    def sentence(self):
+        return SentenceView(self.doc, self.sid)
+
+    def __str__(self):
+        return "%s/%s" % (self.text, self.pos)
+
+    def __repr__(self):
+        return str(self)
+
+    def __eq__(self, other):
+        return isinstance(other, WordView) and self.doc is other.doc and self.idx == other.idx
+
+    def __ne__(self, other):
+        return not (self == other)
+
+    def __hash__(self):
+        return hash((self.text, self.pos))
+
+    def __lt__(self, other):
+        return (self.text, self.pos) < (other.text, other.pos)
+
+
 # ----------------------------------------------------------------------------
 # FUNCTIONS
 # ----------------------------------------------------------------------------
 
-def parse_data(datafile_path):
+def _cached_query(doc, kind, pattern, flags, compute):
+    ''' Run a query through the query cache of a document (if it is enabled).
+    Results are keyed by (query type, pattern, flags, document version).
+    A cached DocumentView is never handed out: each call gets a new view over the cached IDs, so the words and maps
+    that a caller computes on its view are not held by the cache (its size is only accounted when it is stored).
+    '''
+    if doc.query_cache is None:
+        return compute()
+    result = doc.query_cache.lookup((kind, pattern, flags, doc.version), compute)
+    if isinstance(result, DocumentView):
+        return DocumentView(result.parent, result.ids)
+    return result
+
+
+def _get_index(doc, use_index, text=None):
+    ''' Return the inverted index that a document should use for a query (or None to scan).
+    By default (use_index is None) the index is built for expressions with a literal prefix or suffix,
+    which are then answered from the affix index of the word forms.
+    '''
+    if use_index is False:
+        return None
+    if doc._index is None and (use_index or (text is not None and literal_affixes(text) != ('', ''))):
+        doc.build_index()
+    return doc._index
+
+
+def _lexicon_affix(doc):
+    ''' AffixIndex over the keys of doc.lexicon, rebuilt when the document is changed
+    '''
+    cached = doc._affix
+    if cached is None or cached[0] != doc.version:
+        cached = (doc.version, AffixIndex(doc.lexicon.keys()))
+        doc._affix = cached
+    return cached[1]
+
+
+def _shard_of(doc, sid):
+    starts = [start for _, start, _ in doc.shards]
+    idx = bisect_right(starts, sid) - 1
+    if idx < 0 or sid >= doc.shards[idx][2]:
+        return None
+    return doc.shards[idx][0]
+
+
+def open_corpus(path, mode='rt'):
+    ''' Open an ITC file for reading (text mode by default), .gz, .bz2 and .xz files are decompressed on the fly
+    '''
+    opener = DECOMPRESSORS.get(os.path.splitext(path)[1], open)
+    if 'b' in mode:
+        return opener(path, 'rb')
+    return opener(path, 'rt', encoding='utf-8')
+
+
+def corpus_files(path):
+    ''' Return the sorted list of ITC files of a path: a file, a directory (see CORPUS_PATTERNS) or a glob pattern
+    '''
+    if os.path.isdir(path):
+        files = sorted(set(f for pattern in CORPUS_PATTERNS for f in glob.glob(os.path.join(path, pattern))))
+    elif glob.has_magic(path):
+        files = sorted(f for f in glob.glob(path) if os.path.isfile(f))
+    else:
+        return [path]
+    if not files:
+        raise FileNotFoundError("No ITC file found in %s" % (path,))
+    return files
+
+
+def _read_blocks(datafile_path, chunk_size=CHUNK_SIZE):
+    ''' Read a file in large binary chunks and yield decoded text blocks which end at a sentence break.
+    Line endings are normalised like the text mode of open() does (\r\n and \r become \n).
+    '''
+    with open_corpus(datafile_path, 'rb') as datafile:
+        rest = b''
+        while True:
+            chunk = datafile.read(chunk_size)
+            if not chunk:
+                break
+            if b'\r' in chunk:
+                while chunk.endswith(b'\r'):
+                    # the \n of this \r\n may be in the next chunk
+                    extra = datafile.read(1)
+                    if not extra:
+                        break
+                    chunk += extra
+                chunk = chunk.replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+            data = rest + chunk if rest else chunk
+            cut = data.rfind(b'\n\n')
+            if cut < 0:
+                rest = data
+                continue
+            yield data[:cut].decode('utf-8')
+            rest = data[cut + 2:]
+        if rest:
+            yield rest.decode('utf-8')
+
+
+def _read_rows(datafile_path):
+    ''' Yield each sentence of an ITC file as a list of [text, pos] lists, the file is read in large blocks.
+    Sentences are separated by an empty line, lines without a tab are ignored and empty sentences are dropped.
+    '''
+    first_line = 1  # line number of the first line of the current block
+    for block in _read_blocks(datafile_path):
+        yield from _block_rows(block, datafile_path, first_line)
+        # blocks are separated by an empty line
+        first_line += block.count('\n') + 2
+
+
+def _block_rows(block, datafile_path=None, first_line=1):
+    ''' Split a block of ITC text (with \n line endings) into sentences, see _read_rows.
+    A ParseError is raised for a malformed line, first_line is the line number of the first line of the block.
+    '''
+    position = 0  # offset of the current sentence in the block
+    for sentence_raw in block.split('\n\n'):
+        rows = [line.split('\t') for line in sentence_raw.split('\n') if '\t' in line]
+        if rows:
+            for row in rows:
+                if len(row) != 2:
+                    _report_malformed(datafile_path, sentence_raw, first_line + block.count('\n', 0, position))
+            yield rows
+        position += len(sentence_raw) + 2
+
+
+def _report_malformed(datafile_path, sentence_raw, first_line):
+    ''' Raise a ParseError for the first malformed line of a sentence which starts at line number first_line
+    '''
+    for offset, line in enumerate(sentence_raw.split('\n')):
+        if '\t' in line and line.count('\t') != 1:
+            raise ParseError(first_line + offset, line, datafile_path)
+
+
+@contextmanager
+def _paused_gc():
+    ''' Pause the cyclic garbage collector while many objects are created '''
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+def _bulk_document(sentence_rows):
+    ''' Build a Document from sentences given as lists of (text, POS) rows.
+    Word objects are created directly, without add_word() and its cache invalidation,
+    and lexicon and POS maps are built once from the distinct (text, POS) pairs.
+    '''
     doc = Document()
-    with open(datafile_path, 'r') as datafile:
-        # Read file content
-        content = datafile.read()
-
-        # Split into sentences
-        sentences_raw = content.split('\n\n')  # Sentences are separated by an empty line (\n\n)
-        for sentence_raw in sentences_raw:
-            words_raw = sentence_raw.split('\n')
-            sentence = doc.new_sentence()
-            for word_raw in words_raw:
-                if '\t' not in word_raw:
-                    continue
-                text, pos = word_raw.split('\t')  # Word features are seperated by tabs \t
-                word = sentence.new_word(text, pos)
+    sentences = doc.sentences
+    words = doc.words
+    for rows in sentence_rows:
+        sentence = Sentence(doc)
+        sentence.words = [Word(text, pos, sentence) for text, pos in rows]
+        sentences.append(sentence)
+        words.extend(sentence.words)
+    _fill_lexicon(doc, set((w.text, w.pos) for w in words))
+    return doc
+
+
+def _fill_lexicon(doc, pairs):
+    ''' Build doc.lexicon and doc.pos from distinct (text, POS) pairs '''
+    lowered = {}
+    for text, pos in pairs:
+        lower = lowered.get(text)
+        if lower is None:
+            lower = lowered[text] = text.lower()
+        doc.lexicon[lower].add(pos)
+        doc.pos[pos].add(lower)
 
+
+def iter_sentences(datafile_path):
+    ''' Iterate through an ITC file and yield one Sentence at a time.
+    Only the current block of the file (see CHUNK_SIZE) is kept in memory so this can be used on corpora of any size.
+    The yielded sentences do not belong to any Document.
+    datafile_path can be compressed, a directory or a glob pattern (see parse_data).
+    '''
+    for path in corpus_files(datafile_path):
+        for rows in _read_rows(path):
+            sentence = Sentence()
+            for text, pos in rows:
+                sentence.new_word(text, pos)
+            yield sentence
+
+
+def parse_data(datafile_path, compact=False, cache=False, workers=None, engine='default'):
+    ''' Parse an ITC file into a Document (or a CompactDocument when compact is True)
+    datafile_path can also be a directory (all *.tsv[.gz|.bz2|.xz] files) or a glob pattern, the files are parsed
+    concurrently (see itctk.parallel.parse_files) and merged in sorted order. Files ending with .gz, .bz2 or .xz
+    are decompressed on the fly. doc.shards records the file of each range of sentences (see doc.shard_of()).
+    When cache is True, each file is loaded from (or saved into) a binary cache file next to it,
+    the corpus is converted into a Document unless compact is True. A stale cache is rebuilt automatically.
+    When workers is more than 1, the file is parsed by that many processes (see itctk.parallel).
+    engine is kept for compatibility, 'default' and 'fast' use the same parser (files are read in large blocks).
+    A ParseError is raised when a line is malformed (e.g. it contains more than one tab).
+    '''
+    if engine not in ENGINES:
+        raise ValueError("Unknown parse engine: %s (engines: %s)" % (engine, ', '.join(ENGINES)))
+    files = corpus_files(datafile_path)
+    if len(files) > 1:
+        from .parallel import parse_files
+        doc = parse_files(files, workers, engine, cache)
+        return doc if compact else doc.to_document()
+    if cache:
+        from .cache import cached_parse
+        doc = cached_parse(files[0], lambda path: _parse_file(path, True, workers, engine))
+        if not compact:
+            doc = doc.to_document()
+    else:
+        doc = _parse_file(files[0], compact, workers, engine)
+    doc.shards = [(files[0], 0, len(doc))]
     return doc
 
 
-########################################################################
+def _parse_file(datafile_path, compact, workers, engine):
+    if workers is not None and workers > 1 and datafile_path.endswith(tuple(DECOMPRESSORS)):
+        # a compressed file can't be split into byte ranges
+        workers = None
+    if workers is not None and workers > 1:
+        from .parallel import parse_parallel
+        doc = parse_parallel(datafile_path, workers)
+        return doc if compact else doc.to_document()
+    # both engines use the same parser: the file is read and split in bulk, Word objects are created directly
+    # and lexicon and POS maps are built once, the cyclic garbage collector is paused while the objects are created
+    with _paused_gc():
+        if compact:
+            doc = CompactDocument()
+            for rows in _read_rows(datafile_path):
+                doc.add_sentence(rows)
+            return doc
+        return _bulk_document(_read_rows(datafile_path))
+
+
+DocStats = namedtuple('DocStats', ['sentence_count', 'token_count', 'lexicon_size', 'pos_list'])
+
+
+def corpus_stats(sentences):
+    ''' Compute corpus statistics (sentence count, token count, lexicon size and POS list) in a single pass.
+    sentences can be a Document or any iterable of sentences (e.g. iter_sentences(path)),
+    memory usage is bounded by the size of the lexicon, not by the size of the corpus.
+    '''
+    sentence_count = 0
+    token_count = 0
+    lexicon = set()
+    pos = set()
+    for sent in sentences:
+        sentence_count += 1
+        for word in sent:
+            token_count += 1
+            lexicon.add(word.text.lower())
+            pos.add(word.pos)
+    return DocStats(sentence_count, token_count, len(lexicon), list(sorted(pos)))
+
+
+def cached_stats(datafile_path=ITC_DATA_FILE):
+    ''' Corpus statistics (see corpus_stats) from the header of the binary cache of a corpus file (see itctk.cache),
+    the corpus itself is not read. Return None when there is no valid cache (e.g. before the first itc() call).
+    '''
+    from .cache import load_header
+    header = load_header(datafile_path)
+    if header is None:
+        return None
+    return DocStats(header['sentence_count'], header['token_count'], header['lexicon_size'], sorted(header['pos_list']))
 
-def itc(file_name=ITC_DATA_FILE):
-    return parse_data(file_name)
 
+########################################################################
 
-def export_itc():
-    print("Reading ITC ...")
-    doc = itc()
-    output_loc = 'data/itc.txt'
+def itc(file_name=ITC_DATA_FILE, stream=False, compact=False, cache=True, shared=None):
+    ''' Read Indonesian Tagged Corpus into a Document.
+    By default the corpus is loaded from its binary cache (see itctk.cache) instead of parsing the text file,
+    the cache is created on first use. Use cache=False to parse the text file again.
+    When stream is True, return a sentence iterator (see iter_sentences) instead of a Document.
+    When compact is True, return a memory efficient CompactDocument (memory-mapped from the cache).
+    file_name can be a compressed file (.gz, .bz2, .xz), a directory or a glob pattern (see parse_data).
+    When shared is the name of a corpus published with itctk.shared.publish(), attach to it instead of reading file_name.
+    '''
+    if shared:
+        from .shared import attach
+        return attach(shared)
+    if stream:
+        return iter_sentences(file_name)
+    return parse_data(file_name, compact=compact, cache=cache)
 
+
+def export_itc(source_path=ITC_DATA_FILE, formats=('nltk',), outputs=None, compression=''):
+    ''' Export ITC into one or more formats (see itctk.export) in one streaming pass.
+    outputs: output paths in the same order as formats (default: data/itc.<ext>, plus compression e.g. '.gz')
+    '''
+    from .export import export_file, default_outputs, check_formats
+    check_formats(formats)
+    if outputs:
+        if len(outputs) != len(formats):
+            raise ValueError("Expected one output path per format ({} formats, {} paths)".format(len(formats), len(outputs)))
+        outputs = dict(zip(formats, outputs))
+    else:
+        outputs = default_outputs(formats, compression=compression)
     print("Exporting ITC ...")
-    with open(output_loc, 'w') as itc_output:
-        for sent in doc:
-            itc_output.write('%s\n' % (sent,))
-    print("ITC has been exported to %s" % (output_loc,))
+    count = export_file(source_path, outputs)
+    for fmt, path in outputs.items():
+        print("%s sentences have been exported to %s (%s)" % (count, path, fmt))
 
 
 def dev_mode():
     print("Find negative words")
-    doc = all_ict()
+    doc = itc()
     neg_words = ['tidak', 'tak', 'non', 'bukan', 'jangan', 'belum']
     word_list = set()
-    for sent in doc.sentences:
-        for word in sent.words:
-            if word.text[:5] in neg_words or word.text[:3] in neg_words:
-                word_list.add(str(word).lower())
+    for neg in neg_words:
+        for text in doc.find_affix(neg):
+            for pos in doc.lexicon[text]:
+                word_list.add('%s/%s' % (text, pos.lower()))
     print(word_list)
 
 
@@ -291,9 +1302,14 @@ def main():
 
     # Positional argument(s)
     parser.add_argument('-d', '--dev_mode', help='Quick dev method', action='store_true')
-    parser.add_argument('-x', '--export', help='Export ITC to NTLK format', action='store_true')
+    parser.add_argument('-x', '--export', help='Export ITC (NLTK format by default, see --format)', action='store_true')
 
     # Optional argument(s)
+    parser.add_argument('-i', '--input', help='ITC file (default: %(default)s)', default=ITC_DATA_FILE)
+    parser.add_argument('-f', '--format', help='Export format(s), comma separated: conllu, nltk, jsonl, text', default='nltk')
+    parser.add_argument('-o', '--output', help='Export output path (once per format)', action='append')
+    parser.add_argument('-z', '--compress', help='Compress default export outputs', choices=['gz', 'bz2', 'xz'])
+    parser.add_argument('--profile', help='Print call counts, time, tokens and bytes of each operation (see itctk.profiling)', action='store_true')
     group = parser.add_mutually_exclusive_group()
     group.add_argument("-v", "--verbose", action="store_true")
     group.add_argument("-q", "--quiet", action="store_true")
@@ -305,13 +1321,24 @@ def main():
     else:
         # Parse input arguments
         args = parser.parse_args()
+        if args.profile:
+            from . import profiling
+            profiling.enable()
         # Now do something ...
         if args.dev_mode:
             dev_mode()
         if args.export:
-            export_itc()
+            formats = [fmt.strip() for fmt in args.format.split(',') if fmt.strip()]
+            from .export import check_formats
+            try:
+                check_formats(formats)
+            except ValueError as e:
+                parser.error(str(e))
+            export_itc(args.input, formats, args.output, '.' + args.compress if args.compress else '')
         else:
             parser.print_help()
+        if args.profile:
+            print(profiling.report())
     pass
 
 
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+Lazy values which are loaded in a background thread, e.g. to make the interactive shell (itc.py) usable
+while the corpus and Barasa are still being read.
+
+Usage:
+    doc = Lazy(itc, name='ITC').start()  # returns immediately
+    doc.find('kita')                     # blocks until itc() has returned, then works like the document itself
+
+@author: Le Tuan Anh <tuananh.ke@gmail.com>
+'''
+
+# Copyright (c) 2016, Le Tuan Anh <tuananh.ke@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+__author__ = "Le Tuan Anh <tuananh.ke@gmail.com>"
+__copyright__ = "Copyright 2016, itctk"
+__credits__ = ["Le Tuan Anh"]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "Le Tuan Anh"
+__email__ = "<tuananh.ke@gmail.com>"
+__status__ = "Prototype"
+
+########################################################################
+
+import threading
+
+# ----------------------------------------------------------------------------
+# DATA STRUCTURES
+# ----------------------------------------------------------------------------
+
+class Lazy:
+    ''' A proxy of the value returned by load().
+    start() calls load() in a daemon thread, the first access to the value (attributes, items, len(), iteration, etc.)
+    waits for it (or calls load() in the caller's thread when the proxy was not started).
+    An exception raised by load() is raised again on every access.
+    on_load(value) is called once, in the loading thread, e.g. to replace the proxy by the value itself.
+    Use resolve(obj) to get the value when the real type matters (e.g. isinstance() checks).
+    '''
+
+    def __init__(self, load, name=None, on_load=None):
+        self._lazy_load = load
+        self._lazy_name = name or getattr(load, '__name__', 'value')
+        self._lazy_on_load = on_load
+        self._lazy_lock = threading.Lock()
+        self._lazy_done = threading.Event()
+        self._lazy_thread = None
+        self._lazy_value = None
+        self._lazy_error = None
+
+    def start(self):
+        ''' Start loading in the background, return self
+        '''
+        with self._lazy_lock:
+            if self._lazy_thread is None and not self._lazy_done.is_set():
+                self._lazy_thread = threading.Thread(target=self._lazy_run, name='lazy-%s' % self._lazy_name, daemon=True)
+                self._lazy_thread.start()
+        return self
+
+    def _lazy_run(self):
+        try:
+            self._lazy_value = self._lazy_load()
+            if self._lazy_on_load is not None:
+                self._lazy_on_load(self._lazy_value)
+        except BaseException as e:
+            self._lazy_error = e
+        finally:
+            self._lazy_done.set()
+
+    @property
+    def ready(self):
+        ''' True when the value has been loaded (or loading failed)
+        '''
+        return self._lazy_done.is_set()
+
+    def result(self, timeout=None):
+        ''' Wait for the value and return it. A TimeoutError is raised when it's not loaded after timeout seconds.
+        '''
+        if not self._lazy_done.is_set():
+            with self._lazy_lock:
+                if self._lazy_thread is None and not self._lazy_done.is_set():
+                    self._lazy_run()
+            if not self._lazy_done.wait(timeout):
+                raise TimeoutError("%s is still loading" % (self._lazy_name,))
+        if self._lazy_error is not None:
+            raise self._lazy_error
+        return self._lazy_value
+
+    def __getattr__(self, name):
+        if name.startswith('_lazy_'):
+            raise AttributeError(name)
+        return getattr(self.result(), name)
+
+    def __getitem__(self, key):
+        return self.result()[key]
+
+    def __contains__(self, item):
+        return item in self.result()
+
+    def __len__(self):
+        return len(self.result())
+
+    def __iter__(self):
+        return iter(self.result())
+
+    def __bool__(self):
+        return bool(self.result())
+
+    def __str__(self):
+        return str(self.result())
+
+    def __repr__(self):
+        if not self.ready:
+            return '<%s (loading ...)>' % (self._lazy_name,)
+        if self._lazy_error is not None:
+            return '<%s (failed: %s)>' % (self._lazy_name, self._lazy_error)
+        return repr(self._lazy_value)
+
+
+def resolve(obj):
+    ''' Return the value of a Lazy proxy (waiting for it if needed), other objects are returned as they are
+    '''
+    return obj.result() if isinstance(obj, Lazy) else obj
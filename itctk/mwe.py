@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+Multiword expression (MWE) matcher for raw text.
+ITC tokens can be multiword units (e.g. "pesta olahraga"/NN, "di mana"/WH). MWEMatcher builds an Aho-Corasick
+automaton over word tokens from the lexicon of a document and segments raw text with leftmost-longest matches
+in one pass, each match carries the POS tags of the unit in the corpus.
+Latest version can be found at https://github.com/neocl/itctk
+
+@author: Le Tuan Anh <tuananh.ke@gmail.com>
+'''
+
+# Copyright (c) 2016, Le Tuan Anh <tuananh.ke@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+__author__ = "Le Tuan Anh <tuananh.ke@gmail.com>"
+__copyright__ = "Copyright 2016, itctk"
+__credits__ = ["Le Tuan Anh"]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "Le Tuan Anh"
+__email__ = "<tuananh.ke@gmail.com>"
+__status__ = "Prototype"
+
+########################################################################
+
+import re
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+# -----------------------------------------------------------------------
+# CONFIGURATION
+# -----------------------------------------------------------------------
+
+TOKEN_PATTERN = re.compile(r'\w+(?:[-\'.]\w+)*|[^\w\s]', re.UNICODE)
+BATCH_SIZE = 1000  # lines per task in match_lines(workers=N)
+IN_FLIGHT_PER_WORKER = 4  # batches submitted ahead per worker in match_lines(workers=N)
+
+# start/end are token indices (match_tokens) or character offsets (match_text), end is exclusive
+MWEMatch = namedtuple('MWEMatch', ['start', 'end', 'text', 'pos'])
+
+
+# ----------------------------------------------------------------------------
+# DATA STRUCTURES
+# ----------------------------------------------------------------------------
+
+class MWEMatcher:
+    ''' Aho-Corasick automaton over tokens.
+    States are numbered, goto[state] maps a token ID to the next state, fail[state] is the longest proper suffix state
+    and out[state] is the next state on the fail chain which ends an entry (0 if none).
+    '''
+
+    def __init__(self, entries=None):
+        self.token_ids = {}
+        self.goto = [{}]
+        self.fail = [0]
+        self.out = [0]
+        self.depth = [0]
+        self.entries = {}  # final state -> (text, pos)
+        self._compiled = True
+        if entries:
+            for text, pos in entries:
+                self.add(text, pos)
+
+    @staticmethod
+    def from_document(doc, min_tokens=1):
+        ''' Build a matcher from the lexicon of a document (lowercased forms and their POS).
+        Use min_tokens=2 to match multiword units only.
+        '''
+        return MWEMatcher((text, pos) for text, pos in doc.lexicon.items() if len(text.split()) >= min_tokens)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def add(self, text, pos=()):
+        ''' Add an entry (tokens are separated by spaces, matching is case insensitive) '''
+        tokens = text.lower().split()
+        if not tokens:
+            return
+        state = 0
+        for token in tokens:
+            tid = self.token_ids.setdefault(token, len(self.token_ids))
+            next_state = self.goto[state].get(tid)
+            if next_state is None:
+                next_state = len(self.goto)
+                self.goto[state][tid] = next_state
+                self.goto.append({})
+                self.fail.append(0)
+                self.out.append(0)
+                self.depth.append(self.depth[state] + 1)
+            state = next_state
+        old_pos = self.entries[state][1] if state in self.entries else ()
+        self.entries[state] = (' '.join(tokens), tuple(sorted(set(old_pos) | set(pos))))
+        self._compiled = False
+
+    def compile(self):
+        ''' Compute fail and output links (breadth first), called automatically before matching '''
+        goto, fail, out, entries = self.goto, self.fail, self.out, self.entries
+        queue = deque()
+        for state in goto[0].values():
+            fail[state] = 0
+            out[state] = 0
+            queue.append(state)
+        while queue:
+            state = queue.popleft()
+            for tid, child in goto[state].items():
+                f = fail[state]
+                while f and tid not in goto[f]:
+                    f = fail[f]
+                f = goto[f].get(tid, 0)
+                fail[child] = f
+                out[child] = f if f in entries else out[f]
+                queue.append(child)
+        self._compiled = True
+
+    def match_tokens(self, tokens):
+        ''' Return leftmost-longest, non-overlapping MWEMatch of a list of tokens (start/end are token indices).
+        Tokens are compared in lowercase.
+        '''
+        if not self._compiled:
+            self.compile()
+        goto, fail, out, depth, entries = self.goto, self.fail, self.out, self.depth, self.entries
+        token_ids = self.token_ids
+        if not isinstance(tokens, (list, tuple)):
+            tokens = list(tokens)
+        longest = [0] * len(tokens)  # start -> final state of the longest entry which starts there
+        state = 0
+        for position, token in enumerate(tokens):
+            tid = token_ids.get(token.lower())
+            if tid is None:
+                state = 0
+                continue
+            while state and tid not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(tid, 0)
+            end = position + 1
+            final = state if state in entries else out[state]
+            while final:
+                start = end - depth[final]
+                if depth[final] > depth[longest[start]]:
+                    longest[start] = final
+                final = out[final]
+        matches = []
+        start = 0
+        while start < len(longest):
+            final = longest[start]
+            if final:
+                text, pos = entries[final]
+                matches.append(MWEMatch(start, start + depth[final], text, pos))
+                start += depth[final]
+            else:
+                start += 1
+        return matches
+
+    def match_text(self, text):
+        ''' Tokenize raw text and return MWEMatch with character offsets '''
+        spans = [m.span() for m in TOKEN_PATTERN.finditer(text)]
+        return [MWEMatch(spans[m.start][0], spans[m.end - 1][1], m.text, m.pos)
+                for m in self.match_tokens([text[s:e] for s, e in spans])]
+
+    def segment(self, text):
+        ''' Split raw text into units: matched entries (longest first) and single tokens '''
+        tokens = [m.group() for m in TOKEN_PATTERN.finditer(text)]
+        units = []
+        position = 0
+        for m in self.match_tokens(tokens):
+            units.extend(tokens[position:m.start])
+            units.append(' '.join(tokens[m.start:m.end]))
+            position = m.end
+        units.extend(tokens[position:])
+        return units
+
+    def match_lines(self, lines, workers=None, batch_size=BATCH_SIZE):
+        ''' Match a stream of lines (e.g. an opened file), yield one list of MWEMatch per line, in order.
+        With workers > 1 batches of lines are matched in a process pool, at most IN_FLIGHT_PER_WORKER batches
+        per worker are read ahead so the input is consumed as a stream.
+        '''
+        if not self._compiled:
+            self.compile()
+        if not workers or workers < 2:
+            for line in lines:
+                yield self.match_text(line)
+            return
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(self,)) as executor:
+            pending = deque()
+            for batch in _batches(lines, batch_size):
+                pending.append(executor.submit(_match_batch, batch))
+                if len(pending) >= workers * IN_FLIGHT_PER_WORKER:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+
+
+# ----------------------------------------------------------------------------
+# FUNCTIONS
+# ----------------------------------------------------------------------------
+
+_worker_matcher = None
+
+
+def _init_worker(matcher):
+    ''' The matcher is sent once to each worker process '''
+    global _worker_matcher
+    _worker_matcher = matcher
+
+
+def _match_batch(lines):
+    return [_worker_matcher.match_text(line) for line in lines]
+
+
+def _batches(lines, batch_size):
+    batch = []
+    for line in lines:
+        batch.append(line)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+Parallel parsing and querying of large ITC corpora.
+- parse_parallel: a file is split into byte ranges aligned to sentence boundaries (empty lines), each range is parsed
+  in a worker process which sends back compact columns (vocabulary, token/POS ID arrays, sentence offsets)
+  and the parent merges them into one CompactDocument.
+- ShardedExecutor: the sentences of a document are split into shards held by long-lived worker processes,
+  queries are sent to every worker and the results are gathered in document order.
+
+@author: Le Tuan Anh <tuananh.ke@gmail.com>
+'''
+
+# Copyright (c) 2016, Le Tuan Anh <tuananh.ke@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+__author__ = "Le Tuan Anh <tuananh.ke@gmail.com>"
+__copyright__ = "Copyright 2016, itctk"
+__credits__ = ["Le Tuan Anh"]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "Le Tuan Anh"
+__email__ = "<tuananh.ke@gmail.com>"
+__status__ = "Prototype"
+
+########################################################################
+
+
+import os
+import multiprocessing
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .itctk import CompactDocument, DocumentView, ParseError, Vocabulary, _block_rows, _parse_file
+from .cache import cached_parse
+from .index import POSITION_BITS, POSITION_MASK
+
+# -----------------------------------------------------------------------
+# CONFIGURATION
+# -----------------------------------------------------------------------
+
+CHUNKS_PER_WORKER = 4
+SENTENCE_BREAK = b'\n\n'
+
+
+# ----------------------------------------------------------------------------
+# FUNCTIONS
+# ----------------------------------------------------------------------------
+
+def _next_break(datafile, position, block_size=1 << 16):
+    ''' Return the offset right after the first sentence break (an empty line) at or after position, or -1
+    '''
+    datafile.seek(position)
+    carry = b''
+    while True:
+        block = datafile.read(block_size)
+        if not block:
+            return -1
+        data = carry + block
+        idx = data.find(SENTENCE_BREAK)
+        if idx >= 0:
+            return position - len(carry) + idx + len(SENTENCE_BREAK)
+        # keep the last byte in case a break is split between two blocks
+        carry = data[-1:]
+        position += len(block)
+
+
+def split_ranges(datafile_path, parts):
+    ''' Split a file into at most `parts` (start, end) byte ranges, each range ends right after an empty line
+    '''
+    size = os.path.getsize(datafile_path)
+    boundaries = [0]
+    with open(datafile_path, 'rb') as datafile:
+        for i in range(1, parts):
+            target = size * i // parts
+            if target <= boundaries[-1]:
+                continue
+            # the break may start right before target
+            found = _next_break(datafile, target - 1)
+            if found < 0:
+                break
+            if found > boundaries[-1]:
+                boundaries.append(found)
+    if boundaries[-1] < size:
+        boundaries.append(size)
+    return list(zip(boundaries, boundaries[1:]))
+
+
+def parse_range(datafile_path, start, end):
+    ''' Parse a byte range of an ITC file.
+    Return compact columns: (vocab, tagset, token IDs, POS IDs, sentence offsets) with the arrays as bytes
+    '''
+    with open(datafile_path, 'rb') as datafile:
+        datafile.seek(start)
+        content = datafile.read(end - start).decode('utf-8')
+    doc = CompactDocument()
+    try:
+        for rows in _block_rows(content.replace('\r\n', '\n').replace('\r', '\n'), datafile_path):
+            doc.add_sentence(rows)
+    except ParseError as e:
+        # line numbers are relative to the range
+        with open(datafile_path, 'rb') as datafile:
+            lineno = datafile.read(start).count(b'\n') + e.lineno
+        raise ParseError(lineno, e.line, datafile_path)
+    return (doc.vocab.items, doc.tagset.items, doc.token_ids.tobytes(), doc.pos_ids.tobytes(), doc.offsets.tobytes())
+
+
+def merge_columns(doc, columns):
+    ''' Append parsed columns (see parse_range) into a CompactDocument.
+    Local IDs are remapped into the document's vocabulary and tagset, so merging in file order
+    gives the same IDs as a serial parse.
+    '''
+    vocab, tagset, token_bytes, pos_bytes, offset_bytes = columns
+    token_map = [doc.vocab.intern(w) for w in vocab]
+    pos_map = [doc.tagset.intern(p) for p in tagset]
+    doc._changed()
+    base = len(doc.token_ids)
+    doc.token_ids.frombytes(_remap_tokens(token_bytes, token_map))
+    # POS IDs are single bytes, a translation table remaps them in one call
+    doc.pos_ids.frombytes(pos_bytes if _is_identity(pos_map) else pos_bytes.translate(bytes(pos_map + [0] * (256 - len(pos_map)))))
+    offsets = array('I')
+    offsets.frombytes(offset_bytes)
+    if base:
+        offsets = array('I', map(base.__add__, offsets))
+    doc.offsets.extend(offsets[1:])
+    return doc
+
+
+def _is_identity(id_map):
+    ''' True when local IDs are the same as the global ones, e.g. for the first chunk '''
+    return all(local == glob for local, glob in enumerate(id_map))
+
+
+def _remap_tokens(token_bytes, token_map):
+    ''' Map an array of local token IDs (as bytes) to global IDs, with a NumPy gather when NumPy is available '''
+    if _is_identity(token_map):
+        return token_bytes
+    if np is not None:
+        return np.asarray(token_map, dtype=np.uint32)[np.frombuffer(token_bytes, dtype=np.uint32)].tobytes()
+    token_ids = array('I')
+    token_ids.frombytes(token_bytes)
+    return array('I', map(token_map.__getitem__, token_ids)).tobytes()
+
+
+def parse_parallel(datafile_path, workers=None):
+    ''' Parse an ITC file with a pool of worker processes and return a CompactDocument
+    '''
+    if workers is None:
+        workers = os.cpu_count() or 1
+    ranges = split_ranges(datafile_path, max(workers, 1) * CHUNKS_PER_WORKER)
+    doc = CompactDocument()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(parse_range, datafile_path, start, end) for start, end in ranges]
+        for future in futures:
+            merge_columns(doc, future.result())
+    return doc
+
+
+def parse_file(datafile_path, engine='default', cache=False):
+    ''' Parse a whole ITC file (which may be compressed, see open_corpus) into compact columns (see parse_range)
+    with the given parse engine. When cache is True the file is loaded from (or saved into) its binary cache (see itctk.cache).
+    '''
+    def parse(path):
+        return _parse_file(path, True, None, engine)
+    try:
+        doc = cached_parse(datafile_path, parse) if cache else parse(datafile_path)
+    except ParseError as e:
+        raise ParseError(e.lineno, e.line, datafile_path)
+    return (list(doc.vocab), list(doc.tagset), doc.token_ids.tobytes(), doc.pos_ids.tobytes(), doc.offsets.tobytes())
+
+
+def parse_files(paths, workers=None, engine='default', cache=False):
+    ''' Parse several ITC files concurrently (one file per task) and merge them in the given order.
+    engine and cache are used for each file (see parse_file).
+    Return a CompactDocument, doc.shards is [(path, first sentence ID, end sentence ID), ...]
+    '''
+    if workers is None:
+        workers = os.cpu_count() or 1
+    doc = CompactDocument()
+    shards = []
+
+    def merge(path, columns):
+        start = len(doc)
+        merge_columns(doc, columns)
+        shards.append((path, start, len(doc)))
+    if workers > 1 and len(paths) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(paths))) as executor:
+            futures = [executor.submit(parse_file, path, engine, cache) for path in paths]
+            for path, future in zip(paths, futures):
+                merge(path, future.result())
+    else:
+        for path in paths:
+            merge(path, parse_file(path, engine, cache))
+    doc.shards = shards
+    return doc
+
+
+# ----------------------------------------------------------------------------
+# SHARDED QUERIES
+# ----------------------------------------------------------------------------
+
+def _shard_columns(cdoc, first, last):
+    ''' Columns of sentences [first, last) of a CompactDocument (the vocabulary is shared) '''
+    start = cdoc.offsets[first]
+    end = cdoc.offsets[last]
+    offsets = array('I', [x - start for x in cdoc.offsets[first:last + 1]])
+    return (array('I', cdoc.token_ids[start:end]).tobytes(), array('B', cdoc.pos_ids[start:end]).tobytes(), offsets.tobytes())
+
+
+def _run_query(doc, tools, first_sid, query):
+    ''' Run a query on a shard, sentence IDs in the result are global '''
+    kind = query[0]
+    if kind in ('find', 'find_word'):
+        if 'index' not in tools:
+            tools['index'] = doc.build_index()
+        index = tools['index']
+        postings = index.search(query[1], query[2])
+        if kind == 'find':
+            return [sid + first_sid for sid in index.sentence_ids(postings)]
+        shift = first_sid << POSITION_BITS
+        return array('Q', [p + shift for p in postings]).tobytes()
+    if kind in ('lookup', 'lookup_hits'):
+        if 'searcher' not in tools:
+            from .search import CorpusSearcher
+            tools['searcher'] = CorpusSearcher(doc)
+        if kind == 'lookup':
+            return [sid + first_sid for sid in tools['searcher'].search(query[1], query[2])]
+        return [tuple(hit._replace(sid=hit.sid + first_sid)) for hit in tools['searcher'].finditer(query[1], query[2])]
+    if kind == 'lookup_c':
+        if 'matcher' not in tools:
+            from .pospattern import PosMatcher
+            tools['matcher'] = PosMatcher(doc)
+        return [sid + first_sid for sid in tools['matcher'].search(query[1])]
+    raise ValueError("Unknown query type: %s" % (kind,))
+
+
+def _shard_worker(conn, vocab, tagset, columns, first_sid):
+    ''' Main loop of a shard worker process: receive queries, send back (ok, result) '''
+    doc = CompactDocument()
+    doc.vocab = Vocabulary.from_list(vocab)
+    doc.tagset = Vocabulary(tagset)
+    doc.token_ids.frombytes(columns[0])
+    doc.pos_ids.frombytes(columns[1])
+    doc.offsets = array('I')
+    doc.offsets.frombytes(columns[2])
+    tools = {}
+    while True:
+        query = conn.recv()
+        if query is None:
+            break
+        try:
+            conn.send((True, _run_query(doc, tools, first_sid, query)))
+        except Exception as e:
+            conn.send((False, e))
+    conn.close()
+
+
+class ShardedExecutor:
+    ''' Run queries on a document with a pool of long-lived worker processes.
+    Each worker holds a contiguous shard of the sentences (as compact columns), so the corpus is sent
+    to the workers only once. Results are the same as the serial queries and refer to the objects of doc.
+    Use as a context manager or call close() to stop the workers.
+    '''
+
+    def __init__(self, doc, workers=None):
+        self.doc = doc
+        cdoc = doc if isinstance(doc, CompactDocument) else CompactDocument.from_sentences(doc)
+        if workers is None:
+            workers = os.cpu_count() or 1
+        self.shards = self._split(cdoc, max(1, workers))
+        self.connections = []
+        self.processes = []
+        vocab = list(cdoc.vocab)
+        tagset = list(cdoc.tagset)
+        for first, last in self.shards:
+            parent_conn, child_conn = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=_shard_worker, args=(child_conn, vocab, tagset, _shard_columns(cdoc, first, last), first))
+            process.daemon = True
+            process.start()
+            child_conn.close()
+            self.connections.append(parent_conn)
+            self.processes.append(process)
+
+    @staticmethod
+    def _split(cdoc, workers):
+        ''' Split sentences into at most `workers` shards with about the same number of tokens '''
+        total = len(cdoc.token_ids)
+        shards = []
+        first = 0
+        for i in range(1, workers + 1):
+            if first >= len(cdoc):
+                break
+            target = total * i // workers
+            last = first + 1
+            while last < len(cdoc) and cdoc.offsets[last] < target:
+                last += 1
+            if i == workers:
+                last = len(cdoc)
+            shards.append((first, last))
+            first = last
+        return shards
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self):
+        return len(self.processes)
+
+    def close(self):
+        for conn in self.connections:
+            try:
+                conn.send(None)
+                conn.close()
+            except (OSError, EOFError):
+                pass
+        for process in self.processes:
+            process.join()
+        self.connections = []
+        self.processes = []
+
+    def _scatter(self, query):
+        ''' Send a query to all workers and return their results in shard order '''
+        if not self.connections:
+            raise ValueError("ShardedExecutor has been closed")
+        for conn in self.connections:
+            conn.send(query)
+        replies = [conn.recv() for conn in self.connections]
+        for ok, result in replies:
+            if not ok:
+                raise result
+        return [result for _, result in replies]
+
+    def find_word(self, text, case_sensitive=True):
+        postings = array('Q')
+        for result in self._scatter(('find_word', text, case_sensitive)):
+            postings.frombytes(result)
+        doc = self.doc
+        return [doc[p >> POSITION_BITS][p & POSITION_MASK] for p in postings]
+
+    def find(self, text, case_sensitive=True):
+        return DocumentView(self.doc, [sid for result in self._scatter(('find', text, case_sensitive)) for sid in result])
+
+    def lookup(self, pattern_text, flags=0):
+        ''' Regular expression search over lowercased 'word/pos' sentences (see itctk.search) '''
+        return DocumentView(self.doc, [sid for result in self._scatter(('lookup', pattern_text, flags)) for sid in result])
+
+    def lookup_hits(self, pattern_text, flags=0):
+        from .search import SearchHit
+        return [SearchHit(*hit) for result in self._scatter(('lookup_hits', pattern_text, flags)) for hit in result]
+
+    def lookup_c(self, pattern_text):
+        ''' POS pattern search (see itctk.pospattern) '''
+        return DocumentView(self.doc, [sid for result in self._scatter(('lookup_c', pattern_text)) for sid in result])
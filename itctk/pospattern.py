@@ -0,0 +1,678 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+POS pattern matcher: a small pattern language over POS sequences compiled into an automaton
+which runs over the integer POS arrays of a CompactDocument.
+
+Pattern syntax (tokens are separated by spaces):
+    NN              a POS tag
+    @nominal        a tag class (see itctk.tagset.TAG_CLASSES), e.g. @nominal = (NN|NNP|NND|PRP)
+    _ . \\w+        any POS
+    kita/PRP        a word (case-insensitive) with a POS, kita/_ is the word with any POS
+    A B             sequence
+    A|B             alternation, (A B|C) groups
+    X* X+ X? X{m} X{m,} X{m,n}
+                    repetition
+    ^ $             anchor the match to the start / end of the sentence
+E.g. "NEG _ VB", "(NN|NNP)+ kita/PRP", "(NNP ){12}", "^PRP MD? VB", "@nominal VB"
+Tags match whole POS tags: NN does not match NNP (use (NN|NNP|NND) or @noun).
+Fixed-length sequences of tags and tag classes (e.g. "@nominal VB") are matched with bitwise operations over
+position bitmaps of the whole document (see TagBitmap), other patterns run a DFA sentence by sentence.
+Latest version can be found at https://github.com/neocl/itctk
+
+@author: Le Tuan Anh <tuananh.ke@gmail.com>
+'''
+
+# Copyright (c) 2016, Le Tuan Anh <tuananh.ke@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+__author__ = "Le Tuan Anh <tuananh.ke@gmail.com>"
+__copyright__ = "Copyright 2016, itctk"
+__credits__ = ["Le Tuan Anh"]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "Le Tuan Anh"
+__email__ = "<tuananh.ke@gmail.com>"
+__status__ = "Prototype"
+
+########################################################################
+
+import re
+from array import array
+from bisect import bisect_right
+from collections import defaultdict
+from collections import namedtuple
+
+from .itctk import CompactDocument, DocumentView
+from .tagset import TAG_IDS, class_mask, mask_tags
+
+# -----------------------------------------------------------------------
+# CONFIGURATION
+# -----------------------------------------------------------------------
+
+WILDCARDS = ('_', '.', '\\w+', '\\S+')
+TOKEN_PATTERN = re.compile(r'\s*(?:(\\[wS]\+)|(\{\d+(?:,\d*)?\})|([()|*+?^$])|([^\s()|*+?{}^$]+))')
+TAG_PATTERN = re.compile(r'^[A-Za-z]+$')
+
+
+# ----------------------------------------------------------------------------
+# DATA STRUCTURES
+# ----------------------------------------------------------------------------
+
+class PosPatternError(ValueError):
+    pass
+
+
+Term = namedtuple('Term', ['tags', 'word'])  # tags: frozenset of POS (None = any POS), word: lowercased word or None
+Seq = namedtuple('Seq', ['items'])
+Alt = namedtuple('Alt', ['options'])
+Repeat = namedtuple('Repeat', ['node', 'min', 'max'])  # max = None means unlimited
+PosMatch = namedtuple('PosMatch', ['sid', 'start', 'end'])
+
+
+def tokenize(text):
+    tokens = []
+    position = 0
+    text = text.rstrip()
+    while position < len(text):
+        m = TOKEN_PATTERN.match(text, position)
+        if not m:
+            raise PosPatternError("Invalid POS pattern at position %s: %s" % (position, text))
+        tokens.append(m.group(m.lastindex))
+        position = m.end()
+    return tokens
+
+
+class _Parser:
+    ''' Recursive descent parser for POS patterns
+    '''
+
+    def __init__(self, text):
+        self.text = text
+        self.tokens = tokenize(text)
+        self.position = 0
+
+    def peek(self):
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def next(self):
+        token = self.peek()
+        self.position += 1
+        return token
+
+    def error(self, message):
+        return PosPatternError("%s in POS pattern: %s" % (message, self.text))
+
+    def parse(self):
+        ''' Return (node, anchored_start, anchored_end)
+        '''
+        anchored_start = anchored_end = False
+        if self.peek() == '^':
+            self.next()
+            anchored_start = True
+        node = self.parse_alt()
+        if self.peek() == '$':
+            self.next()
+            anchored_end = True
+        if self.peek() is not None:
+            raise self.error("Unexpected `%s`" % (self.peek(),))
+        return node, anchored_start, anchored_end
+
+    def parse_alt(self):
+        options = [self.parse_seq()]
+        while self.peek() == '|':
+            self.next()
+            options.append(self.parse_seq())
+        if len(options) == 1:
+            return options[0]
+        if all(isinstance(x, Term) and x.word is None for x in options):
+            # (NN|NNP) is a single term with two tags
+            if any(x.tags is None for x in options):
+                return Term(None, None)
+            return Term(frozenset().union(*[x.tags for x in options]), None)
+        return Alt(options)
+
+    def parse_seq(self):
+        items = []
+        while self.peek() not in (None, '|', ')', '$'):
+            items.append(self.parse_item())
+        if not items:
+            raise self.error("Empty sequence")
+        return items[0] if len(items) == 1 else Seq(items)
+
+    def parse_item(self):
+        token = self.next()
+        if token == '(':
+            node = self.parse_alt()
+            if self.next() != ')':
+                raise self.error("Missing `)`")
+        elif token in ('*', '+', '?', '^') or token.startswith('{'):
+            raise self.error("Unexpected `%s`" % (token,))
+        else:
+            node = self.parse_term(token)
+        while True:
+            token = self.peek()
+            if token == '*':
+                node = Repeat(node, 0, None)
+            elif token == '+':
+                node = Repeat(node, 1, None)
+            elif token == '?':
+                node = Repeat(node, 0, 1)
+            elif token is not None and token.startswith('{'):
+                bounds = token[1:-1].split(',')
+                low = int(bounds[0])
+                high = low if len(bounds) == 1 else (int(bounds[1]) if bounds[1] else None)
+                if high is not None and high < low:
+                    raise self.error("Invalid repetition `%s`" % (token,))
+                node = Repeat(node, low, high)
+            else:
+                return node
+            self.next()
+
+    def parse_term(self, token):
+        word = None
+        tag = token
+        if '/' in token:
+            word, _, tag = token.rpartition('/')
+            if not word:
+                raise self.error("Missing word in `%s`" % (token,))
+            word = word.lower()
+        if tag in WILDCARDS:
+            return Term(None, word)
+        if tag.startswith('@'):
+            try:
+                return Term(frozenset(mask_tags(class_mask(tag[1:]))), word)
+            except ValueError as e:
+                raise self.error(str(e))
+        if not TAG_PATTERN.match(tag):
+            raise self.error("Invalid POS `%s`" % (tag,))
+        return Term(frozenset([tag.upper()]), word)
+
+
+def _single_tag(node):
+    if isinstance(node, Term) and node.tags is not None and len(node.tags) == 1:
+        return next(iter(node.tags))
+    return None
+
+
+def _first_tag(node):
+    ''' The POS that every match of node must start with (or None) '''
+    if isinstance(node, Repeat):
+        return _first_tag(node.node) if node.min > 0 else None
+    if isinstance(node, Seq):
+        return _first_tag(node.items[0]) if node.items else None
+    if isinstance(node, Alt):
+        tags = set(_first_tag(x) for x in node.options)
+        return tags.pop() if len(tags) == 1 else None
+    return _single_tag(node)
+
+
+def _last_tag(node):
+    ''' The POS that every match of node must end with (or None) '''
+    if isinstance(node, Repeat):
+        return _last_tag(node.node) if node.min > 0 else None
+    if isinstance(node, Seq):
+        return _last_tag(node.items[-1]) if node.items else None
+    if isinstance(node, Alt):
+        tags = set(_last_tag(x) for x in node.options)
+        return tags.pop() if len(tags) == 1 else None
+    return _single_tag(node)
+
+
+def _requirements(node):
+    ''' Return (unigrams, bigrams) of POS that must occur in every sentence that matches node
+    '''
+    if isinstance(node, Term):
+        tag = _single_tag(node)
+        return (set([tag]) if tag else set()), set()
+    if isinstance(node, Repeat):
+        if node.min == 0:
+            return set(), set()
+        unigrams, bigrams = _requirements(node.node)
+        if node.min > 1 and _first_tag(node.node) and _last_tag(node.node):
+            bigrams.add((_last_tag(node.node), _first_tag(node.node)))
+        return unigrams, bigrams
+    if isinstance(node, Alt):
+        reqs = [_requirements(x) for x in node.options]
+        return set.intersection(*[x[0] for x in reqs]), set.intersection(*[x[1] for x in reqs])
+    unigrams, bigrams = set(), set()
+    for item in node.items:
+        u, b = _requirements(item)
+        unigrams |= u
+        bigrams |= b
+    for left, right in zip(node.items, node.items[1:]):
+        if _last_tag(left) and _first_tag(right):
+            bigrams.add((_last_tag(left), _first_tag(right)))
+    return unigrams, bigrams
+
+
+class PosPattern:
+    ''' A compiled POS pattern (a Thompson NFA, see compile_pos_pattern)
+    '''
+
+    def __init__(self, text):
+        self.text = text
+        self.node, self.anchored_start, self.anchored_end = _Parser(text).parse()
+        self.terms = []  # term of each state, None for epsilon states
+        self.edges = []  # next states of each state
+        self.accept = self._new(None)
+        self.start = self._build(self.node, self.accept)
+        self.words = sorted(set(t.word for t in self.terms if t is not None and t.word is not None))
+        self.unigrams, self.bigrams = _requirements(self.node)
+
+    def __repr__(self):
+        return 'PosPattern(%r)' % (self.text,)
+
+    def _new(self, term, edges=()):
+        self.terms.append(term)
+        self.edges.append(list(edges))
+        return len(self.terms) - 1
+
+    def _build(self, node, nxt):
+        ''' Build the states of node which continue to state nxt, return the start state '''
+        if isinstance(node, Term):
+            return self._new(node, [nxt])
+        if isinstance(node, Seq):
+            for item in reversed(node.items):
+                nxt = self._build(item, nxt)
+            return nxt
+        if isinstance(node, Alt):
+            return self._new(None, [self._build(x, nxt) for x in node.options])
+        # Repeat
+        if node.max is None:
+            loop = self._new(None)
+            self.edges[loop] = [self._build(node.node, loop), nxt]
+            tail = loop
+        else:
+            tail = nxt
+            for _ in range(node.max - node.min):
+                tail = self._new(None, [self._build(node.node, tail), nxt])
+        for _ in range(node.min):
+            tail = self._build(node.node, tail)
+        return tail
+
+    def closure(self, states):
+        ''' Follow epsilon edges, return the frozenset of reachable term states (and the accept state)
+        '''
+        result = set()
+        stack = list(states)
+        seen = set(stack)
+        while stack:
+            state = stack.pop()
+            if self.terms[state] is not None or state == self.accept:
+                result.add(state)
+                continue
+            for nxt in self.edges[state]:
+                if nxt not in seen:
+                    seen.add(nxt)
+                    stack.append(nxt)
+        return frozenset(result)
+
+
+_PATTERN_CACHE = {}
+
+
+def compile_pos_pattern(text):
+    ''' Compile a POS pattern (compiled patterns are cached). Raise PosPatternError if the pattern is invalid.
+    '''
+    pattern = _PATTERN_CACHE.get(text)
+    if pattern is None:
+        pattern = PosPattern(text)
+        if len(_PATTERN_CACHE) > 512:
+            _PATTERN_CACHE.clear()
+        _PATTERN_CACHE[text] = pattern
+    return pattern
+
+
+class _DFA:
+    ''' A lazily built DFA of a PosPattern bound to the POS and word IDs of a document.
+    Input symbols are POS ID * (word class count) + word class, where word class is 1 + the index
+    of the token's word in pattern.words (0 if the pattern does not mention that word).
+    When floating is True the start states are added at every step (unanchored search).
+    '''
+
+    DEAD = 0
+
+    def __init__(self, pattern, tagset, floating):
+        self.pattern = pattern
+        self.floating = floating
+        self.classes = len(pattern.words) + 1
+        word_classes = dict((w, i + 1) for i, w in enumerate(pattern.words))
+        self.tag_ids = []
+        self.word_ids = []
+        for term in pattern.terms:
+            if term is None:
+                self.tag_ids.append(None)
+                self.word_ids.append(None)
+                continue
+            self.tag_ids.append(None if term.tags is None else frozenset(tagset.get_id(t) for t in term.tags if t in tagset))
+            self.word_ids.append(None if term.word is None else word_classes[term.word])
+        self.start_set = pattern.closure([pattern.start])
+        self.sets = []
+        self.set_ids = {}
+        self.trans = []
+        self.accepting = []
+        self._intern(frozenset())  # DEAD
+        self.start = self._intern(self.start_set)
+
+    def _intern(self, states):
+        sid = self.set_ids.get(states)
+        if sid is None:
+            sid = len(self.sets)
+            self.sets.append(states)
+            self.set_ids[states] = sid
+            self.trans.append({})
+            self.accepting.append(self.pattern.accept in states)
+        return sid
+
+    def step(self, state, symbol):
+        ''' Compute (and cache) the next state of state on an input symbol '''
+        pos_id, word_class = divmod(symbol, self.classes)
+        targets = []
+        for nfa_state in self.sets[state]:
+            if nfa_state == self.pattern.accept:
+                continue
+            tags = self.tag_ids[nfa_state]
+            word = self.word_ids[nfa_state]
+            if (tags is None or pos_id in tags) and (word is None or word == word_class):
+                targets.extend(self.pattern.edges[nfa_state])
+        states = self.pattern.closure(targets)
+        if self.floating:
+            states = states | self.start_set
+        nxt = self._intern(states)
+        self.trans[state][symbol] = nxt
+        return nxt
+
+
+def tag_sequence(pattern):
+    ''' Tag masks of a pattern which is a fixed-length sequence of tags, tag classes and wildcards (None = any POS),
+    e.g. "@nominal _ VB" -> [mask of NN|NNP|NND|PRP, None, mask of VB]. Return None for other patterns.
+    '''
+    node = pattern.node
+    items = node.items if isinstance(node, Seq) else [node]
+    masks = []
+    for item in items:
+        if not isinstance(item, Term) or item.word is not None:
+            return None
+        if item.tags is None:
+            masks.append(None)
+            continue
+        mask = 0
+        for tag in item.tags:
+            if tag not in TAG_IDS:
+                return None
+            mask |= 1 << TAG_IDS[tag]
+        masks.append(mask)
+    return masks or None
+
+
+class TagBitmap:
+    ''' Position bitmaps of a CompactDocument: for each POS tag, a Python int with bit i set when token i has that tag.
+    A sequence of tag masks is matched over the whole document at once with shifts and ANDs (see sequence()),
+    sentence boundaries are bitmaps too.
+    '''
+
+    def __init__(self, cdoc):
+        self.offsets = cdoc.offsets
+        self.size = len(cdoc.pos_ids)
+        self.tokens = (1 << self.size) - 1
+        # bit i of int(text, 2) is character -i-1 of text, so the POS IDs are reversed once
+        pos_ids = bytes(cdoc.pos_ids)[::-1]
+        self.tags = {}  # stable tag ID -> bitmap
+        for pid, tag in enumerate(cdoc.tagset):
+            tid = TAG_IDS.get(tag)
+            if tid is None or bytes((pid,)) not in pos_ids:
+                continue
+            table = bytearray(b'0' * 256)
+            table[pid] = ord('1')
+            self.tags[tid] = self.tags.get(tid, 0) | int(pos_ids.translate(table) or b'0', 2)
+        starts = bytearray(b'0' * self.size)
+        ends = bytearray(b'0' * self.size)
+        last = self.size - 1
+        for sid in range(len(self.offsets) - 1):
+            start, end = self.offsets[sid], self.offsets[sid + 1]
+            if end > start:
+                starts[last - start] = ord('1')
+                ends[last - end + 1] = ord('1')
+        self.starts = int(starts or b'0', 2)  # first token of each sentence
+        self.ends = int(ends or b'0', 2)  # last token of each sentence
+        self._positions = {}
+
+    def positions(self, mask):
+        ''' Bitmap of the tokens whose tag is in a tag mask (None = any token)
+        '''
+        if mask is None:
+            return self.tokens
+        bits = self._positions.get(mask)
+        if bits is None:
+            bits = 0
+            for tid, tag_bits in self.tags.items():
+                if mask >> tid & 1:
+                    bits |= tag_bits
+            if len(self._positions) > 64:
+                self._positions.clear()
+            self._positions[mask] = bits
+        return bits
+
+    def sequence(self, masks, anchored_start=False, anchored_end=False):
+        ''' Bitmap of the positions where a sequence of tag masks starts (inside one sentence)
+        '''
+        hits = self.positions(masks[0])
+        for k in range(1, len(masks)):
+            hits &= (self.positions(masks[k]) >> k) & ~(self.starts >> k)
+        if anchored_start:
+            hits &= self.starts
+        if anchored_end:
+            hits &= self.ends >> (len(masks) - 1)
+        return hits
+
+    def matches(self, masks, anchored_start=False, anchored_end=False):
+        ''' Yield PosMatch(sid, start, end) for each non-overlapping match of a sequence of tag masks
+        '''
+        offsets = self.offsets
+        length = len(masks)
+        text = bin(self.sequence(masks, anchored_start, anchored_end))[:1:-1]
+        position = text.find('1')
+        while position >= 0:
+            sid = bisect_right(offsets, position) - 1
+            first, end = offsets[sid], offsets[sid + 1]
+            while position >= 0:
+                yield PosMatch(sid, position - first, position - first + length)
+                position = text.find('1', position + length, end)
+            position = text.find('1', end)
+
+    def sentence_ids(self, masks, anchored_start=False, anchored_end=False):
+        ''' IDs of the sentences which contain a sequence of tag masks, in document order
+        '''
+        offsets = self.offsets
+        sids = []
+        text = bin(self.sequence(masks, anchored_start, anchored_end))[:1:-1]
+        position = text.find('1')
+        while position >= 0:
+            sid = bisect_right(offsets, position) - 1
+            sids.append(sid)
+            # continue from the next sentence
+            position = text.find('1', offsets[sid + 1])
+        return sids
+
+
+class PosMatcher:
+    ''' Match POS patterns against a document.
+    Plain Documents are encoded into a CompactDocument once, then every query runs over integer POS arrays.
+    A POS unigram/bigram index (POS -> sentence IDs) is used to skip sentences which cannot match.
+    Tags match whole POS tags: NN does not match NNP (use (NN|NNP|NND) or @noun).
+Fixed-length sequences of tags and tag classes are matched with the position bitmaps of the document (see TagBitmap).
+    '''
+
+    def __init__(self, doc):
+        self.doc = doc
+        self.version = getattr(doc, 'version', None)  # results are stale when the document changes
+        self.cdoc = doc if isinstance(doc, CompactDocument) else CompactDocument.from_sentences(doc)
+        self._ngrams = None
+        self._bitmap = None
+        self._lower_vocab = None
+        self._bound = {}
+
+    @property
+    def ngrams(self):
+        ''' POS unigram and bigram index: tag ID (or a pair of tag IDs) -> array of sentence IDs '''
+        if self._ngrams is None:
+            ngrams = defaultdict(lambda: array('I'))
+            pos_ids = self.cdoc.pos_ids
+            offsets = self.cdoc.offsets
+            for sid in range(len(offsets) - 1):
+                tags = pos_ids[offsets[sid]:offsets[sid + 1]]
+                for key in set(tags).union(zip(tags, tags[1:])):
+                    ngrams[key].append(sid)
+            self._ngrams = dict(ngrams)
+        return self._ngrams
+
+    @property
+    def bitmap(self):
+        ''' Position bitmaps of each POS tag (see TagBitmap) '''
+        if self._bitmap is None:
+            self._bitmap = TagBitmap(self.cdoc)
+        return self._bitmap
+
+    def _bind(self, pattern):
+        bound = self._bound.get(pattern.text)
+        if bound is None:
+            if len(self._bound) > 256:
+                self._bound.clear()
+            floating = _DFA(pattern, self.cdoc.tagset, True)
+            anchored = _DFA(pattern, self.cdoc.tagset, False)
+            word_classes = None
+            if pattern.words:
+                if self._lower_vocab is None:
+                    self._lower_vocab = [w.lower() for w in self.cdoc.vocab]
+                classes = dict((w, i + 1) for i, w in enumerate(pattern.words))
+                word_classes = array('B', [classes.get(w, 0) for w in self._lower_vocab])
+            bound = (floating, anchored, word_classes)
+            self._bound[pattern.text] = bound
+        return bound
+
+    def candidates(self, pattern):
+        ''' Sentence IDs that may match pattern according to the POS n-gram index '''
+        tagset = self.cdoc.tagset
+        keys = []
+        for a, b in pattern.bigrams:
+            keys.append((tagset.get_id(a), tagset.get_id(b)))
+        if not keys:
+            keys = [tagset.get_id(t) for t in pattern.unigrams]
+        if not keys:
+            return range(len(self.cdoc))
+        if any(k is None or (isinstance(k, tuple) and None in k) for k in keys):
+            return []
+        postings = sorted((self.ngrams.get(k, ()) for k in keys), key=len)
+        result = set(postings[0])
+        for plist in postings[1:]:
+            result.intersection_update(plist)
+        return sorted(result)
+
+    def _symbols(self, start, end, dfa, word_classes):
+        pos_ids = self.cdoc.pos_ids
+        if word_classes is None:
+            return pos_ids[start:end]
+        classes = dfa.classes
+        token_ids = self.cdoc.token_ids
+        return [pos_ids[i] * classes + word_classes[token_ids[i]] for i in range(start, end)]
+
+    def _match_at(self, dfa, symbols, start, anchored_end):
+        ''' Return end of the longest match starting at start, or -1 '''
+        state = dfa.start
+        trans = dfa.trans
+        accepting = dfa.accepting
+        last = start if accepting[state] else -1
+        for i in range(start, len(symbols)):
+            nxt = trans[state].get(symbols[i])
+            if nxt is None:
+                nxt = dfa.step(state, symbols[i])
+            if nxt == dfa.DEAD:
+                break
+            state = nxt
+            if accepting[state]:
+                last = i + 1
+        if anchored_end and last != len(symbols):
+            return -1
+        return last
+
+    def _search(self, dfa, symbols, anchored_end):
+        ''' Check if a floating DFA matches somewhere in symbols '''
+        state = dfa.start
+        trans = dfa.trans
+        accepting = dfa.accepting
+        if accepting[state] and not anchored_end:
+            return True
+        for symbol in symbols:
+            nxt = trans[state].get(symbol)
+            if nxt is None:
+                nxt = dfa.step(state, symbol)
+            state = nxt
+            if accepting[state] and not anchored_end:
+                return True
+        return accepting[state]
+
+    def search(self, pattern_text):
+        ''' Return IDs of sentences which match a POS pattern
+        '''
+        pattern = compile_pos_pattern(pattern_text)
+        masks = tag_sequence(pattern)
+        if masks is not None:
+            return self.bitmap.sentence_ids(masks, pattern.anchored_start, pattern.anchored_end)
+        floating, anchored, word_classes = self._bind(pattern)
+        offsets = self.cdoc.offsets
+        sids = []
+        for sid in self.candidates(pattern):
+            symbols = self._symbols(offsets[sid], offsets[sid + 1], floating, word_classes)
+            if pattern.anchored_start:
+                found = self._match_at(anchored, symbols, 0, pattern.anchored_end) >= 0
+            else:
+                found = self._search(floating, symbols, pattern.anchored_end)
+            if found:
+                sids.append(sid)
+        return sids
+
+    def finditer(self, pattern_text):
+        ''' Yield PosMatch(sid, start, end) for each (leftmost-longest, non-overlapping) match of a POS pattern
+        '''
+        pattern = compile_pos_pattern(pattern_text)
+        masks = tag_sequence(pattern)
+        if masks is not None:
+            yield from self.bitmap.matches(masks, pattern.anchored_start, pattern.anchored_end)
+            return
+        floating, anchored, word_classes = self._bind(pattern)
+        offsets = self.cdoc.offsets
+        for sid in self.search(pattern_text):
+            symbols = self._symbols(offsets[sid], offsets[sid + 1], anchored, word_classes)
+            starts = [0] if pattern.anchored_start else range(len(symbols) + 1)
+            position = 0
+            for start in starts:
+                if start < position:
+                    continue
+                end = self._match_at(anchored, symbols, start, pattern.anchored_end)
+                if end >= 0:
+                    yield PosMatch(sid, start, end)
+                    position = end if end > start else start + 1
+
+    def find(self, pattern_text):
+        ''' Return a view of sentences which match a POS pattern
+        '''
+        return DocumentView(self.doc, self.search(pattern_text))
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+Opt-in profiling of the hot paths (parsing, cache loading, indexing and queries).
+When profiling is enabled the instrumented functions are wrapped to record call counts, wall time, tokens processed
+and bytes read per operation. When it is disabled the original functions are put back, so there is no overhead.
+
+Usage:
+    from itctk import profiling
+    profiling.enable()
+    doc = itc()
+    doc.find_word('makan')
+    print(profiling.report())  # or profiling.snapshot() to get a dict
+
+@author: Le Tuan Anh <tuananh.ke@gmail.com>
+'''
+
+# Copyright (c) 2016, Le Tuan Anh <tuananh.ke@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+__author__ = "Le Tuan Anh <tuananh.ke@gmail.com>"
+__copyright__ = "Copyright 2016, itctk"
+__credits__ = ["Le Tuan Anh"]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "Le Tuan Anh"
+__email__ = "<tuananh.ke@gmail.com>"
+__status__ = "Prototype"
+
+########################################################################
+
+import os
+import sys
+import time
+import threading
+from collections import namedtuple
+
+# -----------------------------------------------------------------------
+# CONFIGURATION
+# -----------------------------------------------------------------------
+
+FIELDS = ('calls', 'seconds', 'tokens', 'bytes')
+
+Target = namedtuple('Target', ['owner', 'name', 'op', 'measure'])
+
+_lock = threading.Lock()
+_counters = {}  # op -> [calls, seconds, tokens, bytes]
+_installed = []  # [(owner, attribute name, original function), ...] while profiling is enabled
+
+
+# ----------------------------------------------------------------------------
+# FUNCTIONS
+# ----------------------------------------------------------------------------
+
+def record(op, seconds, tokens=0, nbytes=0):
+    ''' Add one call of an operation to the counters
+    '''
+    with _lock:
+        counter = _counters.get(op)
+        if counter is None:
+            counter = _counters[op] = [0, 0.0, 0, 0]
+        counter[0] += 1
+        counter[1] += seconds
+        counter[2] += tokens
+        counter[3] += nbytes
+
+
+def snapshot():
+    ''' Return a copy of the counters: op -> {'calls': ..., 'seconds': ..., 'tokens': ..., 'bytes': ...}
+    Wall time is inclusive, e.g. parse_data also contains the time of the add_sentence calls it made.
+    '''
+    with _lock:
+        return {op: dict(zip(FIELDS, counter)) for op, counter in _counters.items()}
+
+
+def reset():
+    ''' Clear all counters
+    '''
+    with _lock:
+        _counters.clear()
+
+
+def report(stats=None):
+    ''' Format a snapshot as a table, slowest operations first
+    '''
+    if stats is None:
+        stats = snapshot()
+    if not stats:
+        return "No profiling data (call itctk.profiling.enable() first)"
+    width = max(len('Operation'), max(len(op) for op in stats))
+    lines = ['{} {:>9} {:>10} {:>13} {:>14} {:>13}'.format('Operation'.ljust(width), 'Calls', 'Seconds', 'Tokens', 'Bytes', 'Tokens/s')]
+    for op, info in sorted(stats.items(), key=lambda item: -item[1]['seconds']):
+        rate = info['tokens'] / info['seconds'] if info['seconds'] else 0
+        lines.append('{} {:>9,} {:>10.4f} {:>13,} {:>14,} {:>13,.0f}'.format(
+            op.ljust(width), info['calls'], info['seconds'], info['tokens'], info['bytes'], rate))
+    return '\n'.join(lines)
+
+
+def is_enabled():
+    return bool(_installed)
+
+
+def enable():
+    ''' Start profiling by wrapping the instrumented functions (see targets()).
+    Counters are kept between runs, use reset() to clear them.
+    Functions are looked up through their module, a name imported before (e.g. from itctk import parse_data) is not profiled.
+    '''
+    if _installed:
+        return
+    for target in targets():
+        original = getattr(target.owner, target.name)
+        setattr(target.owner, target.name, instrument(original, target.op, target.measure))
+        _installed.append((target.owner, target.name, original))
+    # module functions which are also re-exported by the package
+    package = sys.modules.get(__package__)
+    for owner, name, original in list(_installed):
+        if getattr(package, name, None) is original:
+            setattr(package, name, getattr(owner, name))
+            _installed.append((package, name, original))
+
+
+def disable():
+    ''' Stop profiling and restore the original functions. Counters are kept.
+    '''
+    while _installed:
+        owner, name, original = _installed.pop()
+        setattr(owner, name, original)
+
+
+def instrument(func, op, measure=None):
+    ''' Wrap func to record each call as op.
+    measure(args, kwargs, result) returns (tokens, bytes), it is called after the clock is stopped.
+    '''
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+        tokens, nbytes = measure(args, kwargs, result) if measure is not None else (0, 0)
+        record(op, elapsed, tokens, nbytes)
+        return result
+    for attr in ('__module__', '__name__', '__qualname__', '__doc__'):
+        setattr(wrapper, attr, getattr(func, attr, None))
+    wrapper.__wrapped__ = func
+    return wrapper
+
+
+# ----------------------------------------------------------------------------
+# DATA STRUCTURES
+# ----------------------------------------------------------------------------
+
+class section:
+    ''' Time a block of code as an operation, only when profiling is enabled. e.g.
+        with profiling.section('my_step') as sec:
+            for sent in doc:
+                sec.tokens += len(sent)
+    '''
+
+    def __init__(self, op, tokens=0, nbytes=0):
+        self.op = op
+        self.tokens = tokens
+        self.nbytes = nbytes
+        self.start = None
+
+    def __enter__(self):
+        if _installed:
+            self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.start is not None:
+            record(self.op, time.perf_counter() - self.start, self.tokens, self.nbytes)
+
+
+# ----------------------------------------------------------------------------
+# INSTRUMENTED FUNCTIONS
+# ----------------------------------------------------------------------------
+
+def token_count(doc):
+    ''' Number of tokens of a Document, CompactDocument or DocumentView
+    '''
+    if doc is None:
+        return 0
+    token_ids = getattr(doc, 'token_ids', None)
+    if token_ids is not None:
+        return len(token_ids)
+    return len(doc.words)
+
+
+def file_size(path):
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def _one_token(args, kwargs, result):
+    return 1, 0
+
+
+def _sentence_tokens(args, kwargs, result):
+    offsets = args[0].offsets
+    return offsets[-1] - offsets[-2], 0
+
+
+def _doc_tokens(args, kwargs, result):
+    return token_count(args[0]), 0
+
+
+def corpus_size(path):
+    ''' Total size of the files of a corpus path (a file, directory or glob pattern, see corpus_files) '''
+    from .itctk import corpus_files
+    return sum(file_size(f) for f in corpus_files(path))
+
+
+def _parsed(args, kwargs, result):
+    return token_count(result), corpus_size(args[0] if args else kwargs['datafile_path'])
+
+
+def _cache_loaded(args, kwargs, result):
+    if result is None:
+        return 0, 0
+    from .cache import cache_path
+    return token_count(result), file_size(cache_path(args[0]))
+
+
+def _searched(args, kwargs, result):
+    searcher = args[0]
+    return token_count(searcher.doc), len(searcher.buffer)
+
+
+def _matched(args, kwargs, result):
+    return len(args[0].cdoc.pos_ids), 0
+
+
+def targets():
+    ''' Functions which are wrapped by enable(): [Target(owner, attribute name, operation name, measure), ...]
+    export_file is not wrapped, it records itself with a section to count the tokens it streams.
+    '''
+    from . import itctk as core
+    from . import cache
+    from .search import CorpusSearcher
+    from .pospattern import PosMatcher
+    items = [Target(core, 'parse_data', 'parse_data', _parsed),
+             Target(cache, 'load_cache', 'load_cache', _cache_loaded),
+             Target(core.Document, 'add_word', 'Document.add_word', _one_token),
+             Target(core.CompactDocument, 'add_sentence', 'CompactDocument.add_sentence', _sentence_tokens),
+             Target(CorpusSearcher, 'search', 'CorpusSearcher.search', _searched),
+             Target(PosMatcher, 'search', 'PosMatcher.search', _matched)]
+    for cls in (core.Document, core.CompactDocument, core.DocumentView):
+        for name in ('find', 'find_word', 'build_index'):
+            if name in vars(cls):
+                items.append(Target(cls, name, '%s.%s' % (cls.__name__, name), _doc_tokens))
+    return items
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+Bounded LRU cache for query results (find, find_word, lookup, lookup_c, ...)
+Entries are evicted by count and by (estimated) memory size.
+
+@author: Le Tuan Anh <tuananh.ke@gmail.com>
+'''
+
+# Copyright (c) 2016, Le Tuan Anh <tuananh.ke@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+__author__ = "Le Tuan Anh <tuananh.ke@gmail.com>"
+__copyright__ = "Copyright 2016, itctk"
+__credits__ = ["Le Tuan Anh"]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "Le Tuan Anh"
+__email__ = "<tuananh.ke@gmail.com>"
+__status__ = "Prototype"
+
+########################################################################
+
+
+import sys
+from array import array
+from collections import OrderedDict
+from collections import namedtuple
+
+# -----------------------------------------------------------------------
+# CONFIGURATION
+# -----------------------------------------------------------------------
+
+MAX_ENTRIES = 256
+MAX_BYTES = 64 * 1024 * 1024
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'evictions', 'entries', 'bytes', 'max_entries', 'max_bytes'])
+
+
+# ----------------------------------------------------------------------------
+# FUNCTIONS
+# ----------------------------------------------------------------------------
+
+def estimate_size(value):
+    ''' Estimate memory owned by a query result: the result itself, the ID array of a DocumentView
+    and the items of a list (e.g. WordViews, or SearchHit tuples with their text).
+    Word objects of a Document are counted too although they belong to the document, so this is an upper bound.
+    '''
+    size = sys.getsizeof(value)
+    ids = getattr(value, 'ids', None)
+    if isinstance(ids, array):
+        size += sys.getsizeof(ids)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            size += sys.getsizeof(item)
+            if isinstance(item, tuple):
+                size += sum(sys.getsizeof(field) for field in item if isinstance(field, (str, int)))
+    return size
+
+
+# ----------------------------------------------------------------------------
+# DATA STRUCTURES
+# ----------------------------------------------------------------------------
+
+class QueryCache:
+    ''' A least-recently-used cache of query results.
+    Keys are usually (query type, pattern, flags, corpus version), see Document.cached_query()
+    '''
+
+    _MISSING = object()
+
+    def __init__(self, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # key -> (value, size)
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def __repr__(self):
+        return 'QueryCache(%s)' % (self.info(),)
+
+    def get(self, key, default=None):
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key, value):
+        size = estimate_size(value)
+        if key in self.entries:
+            self.bytes -= self.entries.pop(key)[1]
+        if size > self.max_bytes:
+            # too big to be cached
+            return
+        self.entries[key] = (value, size)
+        self.bytes += size
+        while len(self.entries) > self.max_entries or self.bytes > self.max_bytes:
+            _, (_, old_size) = self.entries.popitem(last=False)
+            self.bytes -= old_size
+            self.evictions += 1
+
+    def lookup(self, key, compute):
+        ''' Return the cached value of key, or compute() it and cache the result
+        '''
+        value = self.get(key, self._MISSING)
+        if value is self._MISSING:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        self.entries.clear()
+        self.bytes = 0
+
+    def info(self):
+        return CacheInfo(self.hits, self.misses, self.evictions, len(self.entries), self.bytes, self.max_entries, self.max_bytes)
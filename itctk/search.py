@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+Single-pass regular expression search over the whole corpus.
+The corpus is rendered once as lowercased 'word/pos' sentences (one per line) into a contiguous buffer,
+one finditer() call scans the buffer and hits are mapped back to sentences with bisect.
+
+@author: Le Tuan Anh <tuananh.ke@gmail.com>
+'''
+
+# Copyright (c) 2016, Le Tuan Anh <tuananh.ke@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+__author__ = "Le Tuan Anh <tuananh.ke@gmail.com>"
+__copyright__ = "Copyright 2016, itctk"
+__credits__ = ["Le Tuan Anh"]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "Le Tuan Anh"
+__email__ = "<tuananh.ke@gmail.com>"
+__status__ = "Prototype"
+
+########################################################################
+
+
+import re
+import mmap
+from array import array
+from bisect import bisect_right
+from collections import namedtuple
+
+from .itctk import DocumentView
+
+# ----------------------------------------------------------------------------
+# DATA STRUCTURES
+# ----------------------------------------------------------------------------
+
+# start and end are offsets (in characters) inside the rendered sentence
+SearchHit = namedtuple('SearchHit', ['sid', 'start', 'end', 'text'])
+
+
+class CorpusSearcher:
+    ''' Search a document with regular expressions in a single pass.
+    The rendered corpus is kept in memory, or written into a file and memory-mapped when path is given
+    (in that case patterns are matched as UTF-8 bytes, so \\w etc. only match ASCII characters).
+    Patterns are compiled with re.MULTILINE so ^ and $ match at the start and the end of each sentence.
+    '''
+
+    def __init__(self, doc, path=None, lower=True):
+        self.doc = doc
+        self.version = getattr(doc, 'version', None)  # results are stale when the document changes
+        self.lower = lower
+        self.path = path
+        self.starts = array('Q')  # start offset of each sentence (plus the end of the buffer)
+        lines = self._lines_compact(doc) if hasattr(doc, 'token_ids') else (str(sent).lower() if lower else str(sent) for sent in doc)
+        if path is None:
+            self._render(lines)
+        else:
+            self._render_file(lines, path)
+        self._patterns = {}
+
+    def _lines_compact(self, doc):
+        ''' Render sentences of a CompactDocument, each distinct word/POS pair is rendered only once '''
+        rendered = {}
+        vocab = doc.vocab
+        tagset = doc.tagset
+        token_ids = doc.token_ids
+        pos_ids = doc.pos_ids
+        offsets = doc.offsets
+        for sid in range(len(offsets) - 1):
+            tokens = []
+            for idx in range(offsets[sid], offsets[sid + 1]):
+                key = (token_ids[idx], pos_ids[idx])
+                token = rendered.get(key)
+                if token is None:
+                    token = '%s/%s' % (vocab[key[0]], tagset[key[1]])
+                    if self.lower:
+                        token = token.lower()
+                    rendered[key] = token
+                tokens.append(token)
+            yield ' '.join(tokens)
+
+    def _render(self, lines):
+        chunks = []
+        position = 0
+        for line in lines:
+            self.starts.append(position)
+            chunks.append(line)
+            position += len(line) + 1
+        self.starts.append(position)
+        chunks.append('')
+        self.buffer = '\n'.join(chunks)
+
+    def _render_file(self, lines, path):
+        position = 0
+        with open(path, 'wb') as outfile:
+            for line in lines:
+                data = line.encode('utf-8') + b'\n'
+                self.starts.append(position)
+                outfile.write(data)
+                position += len(data)
+        self.starts.append(position)
+        if position == 0:
+            self.buffer = b''
+            return
+        with open(path, 'rb') as infile:
+            self.buffer = mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __len__(self):
+        return len(self.starts) - 1
+
+    def _compile(self, pattern_text, flags):
+        key = (pattern_text, flags)
+        pattern = self._patterns.get(key)
+        if pattern is None:
+            if self.path is not None and isinstance(pattern_text, str):
+                pattern_text = pattern_text.encode('utf-8')
+            pattern = re.compile(pattern_text, flags | re.MULTILINE)
+            if len(self._patterns) > 128:
+                self._patterns.clear()
+            self._patterns[key] = pattern
+        return pattern
+
+    def _hit(self, sid, start, end):
+        offset = self.starts[sid]
+        text = self.buffer[start:end]
+        if self.path is not None:
+            # convert byte offsets into character offsets
+            prefix = len(self.buffer[offset:start].decode('utf-8'))
+            text = text.decode('utf-8')
+            return SearchHit(sid, prefix, prefix + len(text), text)
+        return SearchHit(sid, start - offset, end - offset, text)
+
+    def finditer(self, pattern_text, flags=0):
+        ''' Yield a SearchHit for each match of a regular expression.
+        Matches never span two sentences, the hits are the same as running finditer() on each sentence.
+        '''
+        pattern = self._compile(pattern_text, flags)
+        buf = self.buffer
+        starts = self.starts
+        position = 0
+        size = len(buf)
+        while position <= size:
+            m = pattern.search(buf, position)
+            if not m:
+                break
+            start, end = m.span()
+            sid = bisect_right(starts, start) - 1
+            if sid >= len(self):
+                break
+            sent_end = starts[sid + 1] - 1  # position of the line break
+            if end > sent_end:
+                # the match crosses a sentence boundary, search this sentence on its own
+                for m in pattern.finditer(buf, max(position, starts[sid]), sent_end):
+                    yield self._hit(sid, m.start(), m.end())
+                position = sent_end + 1
+                continue
+            yield self._hit(sid, start, end)
+            position = end if end > start else end + 1
+
+    def search(self, pattern_text, flags=0):
+        ''' Return IDs of sentences which contain a match, in document order
+        '''
+        sids = []
+        last = -1
+        for hit in self.finditer(pattern_text, flags):
+            if hit.sid != last:
+                sids.append(hit.sid)
+                last = hit.sid
+        return sids
+
+    def find(self, pattern_text, flags=0):
+        ''' Return a view of sentences which contain a match
+        '''
+        return DocumentView(self.doc, self.search(pattern_text, flags))
@@ -0,0 +1,424 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+Sentiment scores of ITC sentences from Barasa (Bahasa SentiWordNet).
+The Barasa file (synset, language, goodness, lemma, PosScore, NegScore) is compiled once into a lexicon of
+per-lemma score arrays (the mean over the senses of each lemma, and the scores of each sense)
+and cached next to it (barasa.txt -> barasa.txt.itcs). The lexicon only needs the standard library.
+Documents are scored in bulk (requires NumPy): the vocabulary is aligned with the lexicon once, then every token
+is scored with array indexing and summed per sentence.
+
+Usage:
+    lexicon = load_lexicon()
+    lexicon['kebaikan']         # SentiScore(positive, negative, objective, senses), means over the senses
+    lexicon.synsets('kebaikan') # [SenseScore(synset, positive, negative, objective), ...]
+    scores = score_document(doc, lexicon, pos=('JJ', 'VB', 'RB'))
+    scores.most_positive(10)    # [(polarity, sentence), ...], best first
+    scores.document()           # totals of the whole document
+
+@author: Le Tuan Anh <tuananh.ke@gmail.com>
+'''
+
+# Copyright (c) 2016, Le Tuan Anh <tuananh.ke@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+__author__ = "Le Tuan Anh <tuananh.ke@gmail.com>"
+__copyright__ = "Copyright 2016, itctk"
+__credits__ = ["Le Tuan Anh"]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "Le Tuan Anh"
+__email__ = "<tuananh.ke@gmail.com>"
+__status__ = "Prototype"
+
+########################################################################
+
+import os
+import json
+import struct
+import threading
+from array import array
+from collections import namedtuple
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .tagset import POS_TAGSET
+from .stats import encode_document
+from .cache import source_key, is_valid
+
+# -----------------------------------------------------------------------
+# CONFIGURATION
+# -----------------------------------------------------------------------
+
+BARASA_FILE = 'data/barasa.txt'
+LEXICON_EXT = '.itcs'
+MAGIC = b'ITCS\x00\x00\x00\x02'  # the last byte is the format version
+ALIGNMENT = 8
+RANK_KEYS = ('polarity', 'positive', 'negative', 'objective')
+
+SentiScore = namedtuple('SentiScore', ['positive', 'negative', 'objective', 'senses'])
+SenseScore = namedtuple('SenseScore', ['synset', 'positive', 'negative', 'objective'])
+SentenceSentiment = namedtuple('SentenceSentiment', ['sid', 'positive', 'negative', 'objective', 'polarity', 'matched', 'tokens'])
+
+
+# ----------------------------------------------------------------------------
+# FUNCTIONS
+# ----------------------------------------------------------------------------
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("Sentiment scoring requires NumPy (pip install numpy)")
+
+
+def lexicon_path(source_path):
+    ''' Location of the compiled lexicon of a Barasa file
+    '''
+    return source_path + LEXICON_EXT
+
+
+def read_barasa(source_path=BARASA_FILE):
+    ''' Yield (synset, language, goodness, lemma, positive score, negative score) of each entry of a Barasa file.
+    Lines starting with # are comments. A ValueError is raised when a line is malformed.
+    '''
+    with open(source_path, encoding='utf-8') as infile:
+        for line_number, line in enumerate(infile, 1):
+            line = line.rstrip('\r\n')
+            if not line or line.startswith('#'):
+                continue
+            parts = line.split('\t')
+            try:
+                synset, lang, goodness, lemma, positive, negative = parts[:6]
+                yield synset, lang, goodness, lemma, float(positive), float(negative)
+            except ValueError:
+                raise ValueError("Malformed Barasa entry at {}:{}: {}".format(source_path, line_number, line))
+
+
+def load_lexicon(source_path=BARASA_FILE, cache=True):
+    ''' Load the lexicon of a Barasa file from its compiled cache, the cache is (re)built when it is missing or stale
+    '''
+    path = lexicon_path(source_path)
+    if cache and os.path.isfile(path):
+        try:
+            with open(path, 'rb') as infile:
+                lexicon, header = SentiLexicon.from_bytes(infile.read())
+            if lexicon is not None and is_valid(header, source_path):
+                key = source_key(source_path, with_hash=False)
+                if header.get('mtime') != key['mtime']:
+                    # same content, store the new modification time so the file isn't hashed again
+                    key['sha1'] = header.get('sha1')
+                    lexicon.save(path, key)
+                return lexicon
+        except (OSError, ValueError, KeyError):
+            # broken cache file, it will be rebuilt
+            pass
+    key = source_key(source_path)
+    lexicon = SentiLexicon.from_barasa(source_path)
+    if cache:
+        lexicon.save(path, key)
+    return lexicon
+
+
+def _frombytes(typecode, data):
+    values = array(typecode)
+    values.frombytes(data)
+    return values
+
+
+def _tag_mask(pos, tags):
+    ''' Boolean mask over tag IDs (in the order of tags) of the POS tags to score, None to score every tag '''
+    if pos is None:
+        return None
+    if isinstance(pos, str):
+        pos = (pos,)
+    mask = np.zeros(len(tags), dtype=bool)
+    for tag in pos:
+        if tag not in POS_TAGSET:
+            raise ValueError("Unknown POS tag: {} (see POS_TAGSET)".format(tag))
+        if tag in tags:
+            mask[tags.index(tag)] = True
+    return mask
+
+
+def _sentence_sums(values, offsets):
+    ''' Sum values per sentence (empty sentences sum to 0) '''
+    totals = np.zeros(len(values) + 1, dtype=np.float64)
+    np.cumsum(values, out=totals[1:])
+    return totals[offsets[1:]] - totals[offsets[:-1]]
+
+
+def score_document(doc, lexicon=None, pos=None):
+    ''' Score every sentence of a Document (or CompactDocument) with a SentiLexicon (default: load_lexicon()).
+    pos: a POS tag or some POS tags, only tokens with these tags are scored (e.g. ('JJ', 'VB', 'RB', 'NN'))
+    '''
+    if lexicon is None:
+        lexicon = load_lexicon()
+    return SentimentScorer(doc, lexicon).score(pos)
+
+
+# ----------------------------------------------------------------------------
+# DATA STRUCTURES
+# ----------------------------------------------------------------------------
+
+class SentiLexicon:
+    ''' Barasa scores per lemma (lowercased): positive, negative (mean over the senses of the lemma) and sense count,
+    and the scores of each sense (see synsets()). The objective score is 1 - positive - negative.
+    Scores are stored in arrays (array module), so looking up words doesn't need NumPy.
+    '''
+
+    def __init__(self, lemmas, positive, negative, senses, synsets=(), sense_positive=(), sense_negative=()):
+        self.lemmas = list(lemmas)
+        self.ids = {lemma: idx for idx, lemma in enumerate(self.lemmas)}
+        self.positive = array('d', positive)
+        self.negative = array('d', negative)
+        self.senses = array('I', senses)
+        # senses of lemma i are sense_offsets[i]:sense_offsets[i+1]
+        self.synset_names = list(synsets)
+        self.sense_positive = array('d', sense_positive)
+        self.sense_negative = array('d', sense_negative)
+        self.sense_offsets = array('I', [0])
+        total = 0
+        for count in self.senses:
+            total += count
+            self.sense_offsets.append(total)
+
+    @staticmethod
+    def from_entries(entries):
+        ''' Build a lexicon from (lemma, positive, negative, synset) tuples, scores of the same lemma are averaged
+        '''
+        ids = {}
+        senses = []
+        for lemma, pos_score, neg_score, synset in entries:
+            lemma = lemma.replace('_', ' ').lower()
+            lid = ids.get(lemma)
+            if lid is None:
+                lid = ids[lemma] = len(ids)
+                senses.append([])
+            senses[lid].append((synset, pos_score, neg_score))
+        counts = [len(lemma_senses) for lemma_senses in senses]
+        entries = [entry for lemma_senses in senses for entry in lemma_senses]
+        return SentiLexicon(list(ids), [sum(pos_score for _, pos_score, _ in lemma_senses) / len(lemma_senses) for lemma_senses in senses],
+                            [sum(neg_score for _, _, neg_score in lemma_senses) / len(lemma_senses) for lemma_senses in senses], counts,
+                            [synset for synset, _, _ in entries], [pos_score for _, pos_score, _ in entries], [neg_score for _, _, neg_score in entries])
+
+    @staticmethod
+    def from_barasa(source_path=BARASA_FILE):
+        ''' Compile a Barasa file (see read_barasa)
+        '''
+        return SentiLexicon.from_entries((lemma, pos_score, neg_score, synset) for synset, _, _, lemma, pos_score, neg_score in read_barasa(source_path))
+
+    def __len__(self):
+        return len(self.lemmas)
+
+    def __contains__(self, lemma):
+        return lemma.lower() in self.ids
+
+    def __getitem__(self, lemma):
+        lid = self.ids[lemma.lower()]
+        positive = self.positive[lid]
+        negative = self.negative[lid]
+        return SentiScore(positive, negative, 1.0 - positive - negative, self.senses[lid])
+
+    def get(self, lemma, default=None):
+        return self[lemma] if lemma in self else default
+
+    def synsets(self, lemma):
+        ''' Scores of each sense of a lemma (in Barasa order), a KeyError is raised when the lemma is not in the lexicon
+        '''
+        lid = self.ids[lemma.lower()]
+        return [SenseScore(self.synset_names[idx], self.sense_positive[idx], self.sense_negative[idx],
+                           1.0 - self.sense_positive[idx] - self.sense_negative[idx])
+                for idx in range(self.sense_offsets[lid], self.sense_offsets[lid + 1])]
+
+    def align(self, words):
+        ''' Lexicon ID of each word (-1 when the word is not in the lexicon), words are looked up lowercased
+        '''
+        ids = self.ids
+        return array('q', [ids.get(word.lower(), -1) for word in words])
+
+    def to_bytes(self, header=None):
+        ''' Serialise the lexicon: MAGIC | header length (uint32) | header (JSON) | padding
+        | positive | negative | senses | lemmas | sense positive | sense negative | synsets
+        '''
+        sections = [self.positive.tobytes(), self.negative.tobytes(), self.senses.tobytes(), '\n'.join(self.lemmas).encode('utf-8'),
+                    self.sense_positive.tobytes(), self.sense_negative.tobytes(), '\n'.join(self.synset_names).encode('utf-8')]
+        header = dict(header) if header else {}
+        header['size'] = len(self.lemmas)
+        header['sections'] = [len(data) for data in sections]
+        header_bytes = json.dumps(header).encode('utf-8')
+        chunks = [MAGIC, struct.pack('<I', len(header_bytes)), header_bytes]
+        chunks.append(b'\x00' * (-sum(len(chunk) for chunk in chunks) % ALIGNMENT))
+        for data in sections:
+            chunks.append(data)
+            chunks.append(b'\x00' * (-len(data) % ALIGNMENT))
+        return b''.join(chunks)
+
+    @staticmethod
+    def from_bytes(data):
+        ''' Return (lexicon, header) from to_bytes() data, or (None, None) if it's not a compiled lexicon
+        '''
+        if len(data) < len(MAGIC) + 4 or data[:len(MAGIC)] != MAGIC:
+            return None, None
+        header_len, = struct.unpack('<I', data[len(MAGIC):len(MAGIC) + 4])
+        position = len(MAGIC) + 4
+        header = json.loads(data[position:position + header_len].decode('utf-8'))
+        position += header_len
+        position += -position % ALIGNMENT
+        sections = []
+        for size in header['sections']:
+            sections.append(data[position:position + size])
+            position += size + (-size % ALIGNMENT)
+        positive, negative, senses, lemmas, sense_positive, sense_negative, synsets = sections
+        lemmas = lemmas.decode('utf-8').split('\n') if header['size'] else []
+        synsets = synsets.decode('utf-8').split('\n') if sense_positive else []
+        lexicon = SentiLexicon(lemmas, _frombytes('d', positive), _frombytes('d', negative), _frombytes('I', senses),
+                               synsets, _frombytes('d', sense_positive), _frombytes('d', sense_negative))
+        return lexicon, header
+
+    def save(self, path, header=None):
+        ''' Write the compiled lexicon into path. Return path, or None if it can't be written
+        '''
+        temp_path = '%s.%s.%s.tmp' % (path, os.getpid(), threading.get_ident())  # unique per process and thread
+        try:
+            with open(temp_path, 'wb') as outfile:
+                outfile.write(self.to_bytes(header))
+            os.replace(temp_path, path)
+            return path
+        except OSError:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return None
+
+
+class SentimentScorer:
+    ''' Score the sentences of a document with a SentiLexicon.
+    The document vocabulary (lowercased) is aligned with the lexicon once, every score() call is a few array operations.
+    '''
+
+    def __init__(self, doc, lexicon):
+        _require_numpy()
+        self.doc = doc
+        self.version = getattr(doc, 'version', None)  # results are stale when the document changes
+        self.lexicon = lexicon
+        words, token_ids, self.tags, self.pos_ids, self.offsets = encode_document(doc, lower=True)
+        lexicon_ids = np.asarray(lexicon.align(words), dtype=np.int64)
+        found = lexicon_ids >= 0
+        lexicon_positive = np.asarray(lexicon.positive, dtype=np.float64)
+        lexicon_negative = np.asarray(lexicon.negative, dtype=np.float64)
+        word_positive = np.where(found, lexicon_positive[lexicon_ids], 0.0) if len(words) else np.zeros(0)
+        word_negative = np.where(found, lexicon_negative[lexicon_ids], 0.0) if len(words) else np.zeros(0)
+        # scores of each token
+        self.positive = word_positive[token_ids]
+        self.negative = word_negative[token_ids]
+        self.found = found[token_ids]
+
+    def score(self, pos=None):
+        ''' Return SentimentScores of every sentence, only tokens with one of the tags in pos are scored (default: all)
+        '''
+        found = self.found
+        positive = self.positive
+        negative = self.negative
+        mask = _tag_mask(pos, self.tags)
+        if mask is not None:
+            selected = mask[self.pos_ids] if len(self.pos_ids) else np.zeros(0, dtype=bool)
+            found = found & selected
+            positive = np.where(selected, positive, 0.0)
+            negative = np.where(selected, negative, 0.0)
+        offsets = self.offsets
+        return SentimentScores(self.doc, _sentence_sums(positive, offsets), _sentence_sums(negative, offsets),
+                               np.rint(_sentence_sums(found, offsets)).astype(np.int64), np.diff(offsets))
+
+
+class SentimentScores:
+    ''' Sentiment of each sentence of a document (arrays indexed by sentence ID):
+    - positive, negative: sums of the scores of the matched tokens
+    - objective: matched - positive - negative, polarity: positive - negative
+    - matched: number of tokens found in the lexicon, tokens: number of tokens
+    '''
+
+    def __init__(self, doc, positive, negative, matched, tokens):
+        self.doc = doc
+        self.positive = positive
+        self.negative = negative
+        self.matched = matched
+        self.tokens = tokens
+
+    @property
+    def objective(self):
+        return self.matched - self.positive - self.negative
+
+    @property
+    def polarity(self):
+        return self.positive - self.negative
+
+    def __len__(self):
+        return len(self.positive)
+
+    def __getitem__(self, sid):
+        return SentenceSentiment(sid, float(self.positive[sid]), float(self.negative[sid]), float(self.objective[sid]),
+                                 float(self.polarity[sid]), int(self.matched[sid]), int(self.tokens[sid]))
+
+    def __iter__(self):
+        for sid in range(len(self)):
+            yield self[sid]
+
+    def document(self):
+        ''' Totals of the whole document (sid is None)
+        '''
+        positive = float(self.positive.sum())
+        negative = float(self.negative.sum())
+        matched = int(self.matched.sum())
+        return SentenceSentiment(None, positive, negative, matched - positive - negative, positive - negative, matched, int(self.tokens.sum()))
+
+    def values(self, by='polarity', normalize=False):
+        ''' Score of each sentence, divided by its number of matched tokens when normalize is True
+        '''
+        if by not in RANK_KEYS:
+            raise ValueError("Unknown score: {} (scores: {})".format(by, ', '.join(RANK_KEYS)))
+        values = getattr(self, by)
+        if normalize:
+            values = values / np.maximum(self.matched, 1)
+        return values
+
+    def rank(self, by='polarity', k=None, reverse=True, normalize=False):
+        ''' Sentence IDs sorted by a score (highest first unless reverse is False), only the first k when k is given.
+        Ties are kept in document order.
+        '''
+        values = self.values(by, normalize)
+        order = np.argsort(-values if reverse else values, kind='stable')
+        if k is not None:
+            order = order[:k]
+        return order.tolist()
+
+    def most_positive(self, k=10, normalize=False):
+        ''' The k sentences with the highest polarity, best first: [(polarity, sentence), ...]
+        '''
+        return self._ranked(k, True, normalize)
+
+    def most_negative(self, k=10, normalize=False):
+        ''' The k sentences with the lowest polarity, worst first: [(polarity, sentence), ...]
+        '''
+        return self._ranked(k, False, normalize)
+
+    def _ranked(self, k, reverse, normalize):
+        values = self.values('polarity', normalize)
+        return [(float(values[sid]), self.doc[sid]) for sid in self.rank('polarity', k, reverse, normalize)]
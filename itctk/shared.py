@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+Share a parsed corpus between processes.
+A CompactDocument is published once into a shared memory block (same flat layout as the binary cache:
+token IDs, POS IDs, sentence offsets and vocabulary), other processes attach to the block by name and
+get a read-only CompactDocument whose columns point into the shared memory, without parsing or copying.
+(For a memory-mapped file, itc(compact=True) already maps the binary cache, see itctk.cache)
+Latest version can be found at https://github.com/neocl/itctk
+
+@author: Le Tuan Anh <tuananh.ke@gmail.com>
+'''
+
+# Copyright (c) 2016, Le Tuan Anh <tuananh.ke@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+__author__ = "Le Tuan Anh <tuananh.ke@gmail.com>"
+__copyright__ = "Copyright 2016, itctk"
+__credits__ = ["Le Tuan Anh"]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "Le Tuan Anh"
+__email__ = "<tuananh.ke@gmail.com>"
+__status__ = "Prototype"
+
+########################################################################
+
+import sys
+from multiprocessing import shared_memory, resource_tracker
+
+from .itctk import CompactDocument
+from .cache import to_bytes, from_buffer
+
+
+# ----------------------------------------------------------------------------
+# DATA STRUCTURES
+# ----------------------------------------------------------------------------
+
+class SharedCorpus:
+    ''' A corpus in a shared memory block.
+    - SharedCorpus.publish(doc) copies a document into a new block (the owner should call unlink() when done)
+    - SharedCorpus.attach(name) opens an existing block, doc is a read-only CompactDocument on top of it
+    '''
+
+    def __init__(self, shm, owner=False):
+        self.shm = shm
+        self.owner = owner
+        self.doc = from_buffer(shm.buf.toreadonly())
+        if self.doc is None:
+            shm.close()
+            raise ValueError("Shared memory block {} does not contain a corpus".format(shm.name))
+        self.doc.shared = self
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    @staticmethod
+    def publish(doc, name=None):
+        if not isinstance(doc, CompactDocument):
+            doc = CompactDocument.from_sentences(doc)
+        data = to_bytes(doc)
+        shm = shared_memory.SharedMemory(name=name, create=True, size=len(data))
+        shm.buf[:len(data)] = data
+        return SharedCorpus(shm, owner=True)
+
+    @staticmethod
+    def attach(name):
+        if sys.version_info >= (3, 13):
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        else:
+            # only the publisher manages the block, otherwise it would be removed when this process exits
+            register = resource_tracker.register
+            resource_tracker.register = lambda name, rtype: None
+            try:
+                shm = shared_memory.SharedMemory(name=name)
+            finally:
+                resource_tracker.register = register
+        return SharedCorpus(shm)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+        if self.owner:
+            self.unlink()
+
+    def close(self):
+        ''' Detach from the block. The document can't be used after this '''
+        if self.doc is not None:
+            for column in (self.doc.token_ids, self.doc.pos_ids, self.doc.offsets):
+                if isinstance(column, memoryview):
+                    column.release()
+            self.doc.shared = None
+            self.doc = None
+            self.shm.close()
+
+    def unlink(self):
+        ''' Remove the block (publisher only), attached processes keep their mapping until they close it '''
+        self.shm.unlink()
+
+
+# ----------------------------------------------------------------------------
+# FUNCTIONS
+# ----------------------------------------------------------------------------
+
+def publish(doc, name=None):
+    ''' Publish a document into shared memory, return a SharedCorpus (use .name to attach from other processes)
+    '''
+    return SharedCorpus.publish(doc, name)
+
+
+def attach(name):
+    ''' Attach to a published corpus, return a read-only CompactDocument
+    '''
+    return SharedCorpus.attach(name).doc
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+Frequency, n-gram and POS transition statistics of ITC documents (requires NumPy).
+Tokens are encoded as integer arrays (words, POS tags and word/POS pairs), n-grams inside sentences are encoded
+into one int64 key per n-gram (key = ((id0 * base) + id1) * base + ...) and counted with numpy.unique/bincount.
+Counts of separate shards can be merged (CorpusStats.merge(), a + b).
+Latest version can be found at https://github.com/neocl/itctk
+
+@author: Le Tuan Anh <tuananh.ke@gmail.com>
+'''
+
+# Copyright (c) 2016, Le Tuan Anh <tuananh.ke@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+__author__ = "Le Tuan Anh <tuananh.ke@gmail.com>"
+__copyright__ = "Copyright 2016, itctk"
+__credits__ = ["Le Tuan Anh"]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "Le Tuan Anh"
+__email__ = "<tuananh.ke@gmail.com>"
+__status__ = "Prototype"
+
+########################################################################
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .itctk import CompactDocument
+from .tagset import POS_TAGSET
+
+# -----------------------------------------------------------------------
+# CONFIGURATION
+# -----------------------------------------------------------------------
+
+KINDS = ('word', 'pos', 'word_pos')
+MAX_KEY = 1 << 63
+
+
+# ----------------------------------------------------------------------------
+# FUNCTIONS
+# ----------------------------------------------------------------------------
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("itctk.stats requires NumPy (pip install numpy)")
+
+
+def _check_base(base, n):
+    if base ** n >= MAX_KEY:
+        raise ValueError("Too many distinct units ({}) to encode {}-grams into 64-bit keys".format(base, n))
+
+
+def _count(codes):
+    keys, counts = np.unique(codes, return_counts=True)
+    return keys.astype(np.int64), counts.astype(np.int64)
+
+
+def count_ngrams(ids, offsets, n, base):
+    ''' Count n-grams of unit IDs which do not cross sentence boundaries.
+    ids: unit ID of each token, offsets: sentence offsets (len = sentence count + 1), base: number of distinct units.
+    Return (keys, counts), keys are sorted encoded n-grams.
+    '''
+    _check_base(base, n)
+    ids = np.asarray(ids, dtype=np.int64)
+    if n == 1:
+        counts = np.bincount(ids, minlength=base) if len(ids) else np.zeros(base, dtype=np.int64)
+        keys = np.flatnonzero(counts)
+        return keys.astype(np.int64), counts[keys].astype(np.int64)
+    size = len(ids) - n + 1
+    if size <= 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    offsets = np.asarray(offsets, dtype=np.int64)
+    # end of the sentence of each token, an n-gram is valid if it ends before the end of its sentence
+    ends = np.repeat(offsets[1:], np.diff(offsets))
+    valid = np.arange(n, size + n) <= ends[:size]
+    codes = np.zeros(size, dtype=np.int64)
+    for i in range(n):
+        codes = codes * base + ids[i:i + size]
+    return _count(codes[valid])
+
+
+def decode_keys(keys, n, base):
+    ''' Split encoded n-grams into a (len(keys), n) array of unit IDs
+    '''
+    columns = np.empty((len(keys), n), dtype=np.int64)
+    keys = np.asarray(keys, dtype=np.int64)
+    for i in range(n - 1, -1, -1):
+        columns[:, i] = keys % base
+        keys = keys // base
+    return columns
+
+
+def encode_columns(columns, base):
+    ''' Encode a (k, n) array of unit IDs into n-gram keys
+    '''
+    _check_base(base, columns.shape[1])
+    keys = np.zeros(len(columns), dtype=np.int64)
+    for i in range(columns.shape[1]):
+        keys = keys * base + columns[:, i]
+    return keys
+
+
+def tag_order(tags=()):
+    ''' Order of POS tags for matrices: all tags of POS_TAGSET, then unknown tags in the given order
+    '''
+    return list(POS_TAGSET) + [tag for tag in tags if tag not in POS_TAGSET]
+
+
+def encode_document(doc, lower=False):
+    ''' Integer arrays of a document: (words, token_ids, tags, pos_ids, offsets).
+    POS IDs follow tag_order(), words are lowercased (and merged) when lower is True.
+    '''
+    _require_numpy()
+    cdoc = doc if isinstance(doc, CompactDocument) else CompactDocument.from_sentences(doc)
+    token_ids = np.frombuffer(cdoc.token_ids, dtype=np.uint32).astype(np.int64)
+    pos_ids = np.frombuffer(cdoc.pos_ids, dtype=np.uint8).astype(np.int64)
+    offsets = np.frombuffer(cdoc.offsets, dtype=np.uint32).astype(np.int64)
+    words = list(cdoc.vocab)
+    if lower:
+        words, remap = np.unique(np.array([w.lower() for w in words], dtype=object), return_inverse=True)
+        words = words.tolist()
+        token_ids = remap[token_ids] if len(token_ids) else token_ids
+    tags = tag_order(list(cdoc.tagset))
+    if tags != list(cdoc.tagset):
+        # the tagset of a document built by hand may not start with POS_TAGS
+        tag_remap = np.array([tags.index(tag) for tag in cdoc.tagset], dtype=np.int64)
+        pos_ids = tag_remap[pos_ids] if len(pos_ids) else pos_ids
+    return words, token_ids, tags, pos_ids, offsets
+
+
+# ----------------------------------------------------------------------------
+# DATA STRUCTURES
+# ----------------------------------------------------------------------------
+
+class NgramCounts:
+    ''' Sparse counts of n-grams of one kind of unit.
+    - labels: label of each unit ID (a word, a POS tag or a (word, POS) pair)
+    - keys: sorted encoded n-grams (base = len(labels)), counts: count of each key
+    '''
+
+    def __init__(self, labels, n, keys, counts):
+        self.labels = labels
+        self.n = n
+        self.keys = keys
+        self.counts = counts
+        self._ids = None
+
+    def __len__(self):
+        return len(self.keys)
+
+    @property
+    def total(self):
+        return int(self.counts.sum())
+
+    @property
+    def ids(self):
+        if self._ids is None:
+            self._ids = {label: uid for uid, label in enumerate(self.labels)}
+        return self._ids
+
+    def _label(self, uids):
+        return self.labels[uids[0]] if self.n == 1 else tuple(self.labels[u] for u in uids)
+
+    def __getitem__(self, gram):
+        ''' Count of a unit (n = 1) or of a tuple of units '''
+        grams = (gram,) if self.n == 1 else gram
+        if len(grams) != self.n or any(g not in self.ids for g in grams):
+            return 0
+        key = 0
+        for g in grams:
+            key = key * len(self.labels) + self.ids[g]
+        idx = np.searchsorted(self.keys, key)
+        return int(self.counts[idx]) if idx < len(self.keys) and self.keys[idx] == key else 0
+
+    def items(self):
+        ''' (n-gram, count) in key order, an n-gram is a label when n = 1 and a tuple of labels otherwise '''
+        for uids, count in zip(decode_keys(self.keys, self.n, len(self.labels)).tolist(), self.counts.tolist()):
+            yield self._label(uids), count
+
+    def most_common(self, k=None):
+        order = np.argsort(-self.counts, kind='stable')
+        if k is not None:
+            order = order[:k]
+        columns = decode_keys(self.keys[order], self.n, len(self.labels)).tolist()
+        return [(self._label(uids), count) for uids, count in zip(columns, self.counts[order].tolist())]
+
+    def to_dict(self):
+        return dict(self.items())
+
+    def to_dense(self):
+        ''' Dense count array of shape (len(labels),) * n, indexed by unit IDs '''
+        base = len(self.labels)
+        dense = np.zeros(base ** self.n, dtype=np.int64)
+        dense[self.keys] = self.counts
+        return dense.reshape((base,) * self.n)
+
+    def merge(self, other):
+        ''' Return the sum of two counts (e.g. of two shards), labels of other which are new are appended '''
+        if self.n != other.n:
+            raise ValueError("Can't merge {}-grams with {}-grams".format(self.n, other.n))
+        labels = list(self.labels)
+        ids = dict(self.ids)
+        for label in other.labels:
+            if label not in ids:
+                ids[label] = len(labels)
+                labels.append(label)
+        base = len(labels)
+        remap = np.array([ids[label] for label in other.labels], dtype=np.int64)
+        mine = encode_columns(decode_keys(self.keys, self.n, len(self.labels)), base)
+        theirs = encode_columns(remap[decode_keys(other.keys, other.n, len(other.labels))], base)
+        keys, inverse = np.unique(np.concatenate([mine, theirs]), return_inverse=True)
+        counts = np.bincount(inverse, weights=np.concatenate([self.counts, other.counts])).astype(np.int64)
+        return NgramCounts(labels, self.n, keys.astype(np.int64), counts)
+
+    __add__ = merge
+
+
+class CorpusStats:
+    ''' Unigram and n-gram counts (n <= max_n) of words, POS tags and word/POS pairs of a corpus.
+    POS tags are ordered as POS_TAGSET (unknown tags are appended), so tag matrices are indexed by that order.
+    '''
+
+    def __init__(self, counts, sentence_count, token_count, max_n):
+        self.counts = counts  # (kind, n) -> NgramCounts
+        self.sentence_count = sentence_count
+        self.token_count = token_count
+        self.max_n = max_n
+
+    @staticmethod
+    def from_document(doc, max_n=3, lower=False):
+        ''' Count a Document or CompactDocument. When lower is True, words are lowercased. '''
+        words, token_ids, tags, pos_ids, offsets = encode_document(doc, lower)
+        # word/POS pairs are new units
+        pair_keys, pair_ids = np.unique(token_ids * len(tags) + pos_ids, return_inverse=True)
+        pairs = [(words[k // len(tags)], tags[k % len(tags)]) for k in pair_keys.tolist()]
+        units = {'word': (words, token_ids), 'pos': (tags, pos_ids), 'word_pos': (pairs, pair_ids.reshape(-1))}
+        counts = {}
+        for kind, (labels, ids) in units.items():
+            for n in range(1, max_n + 1):
+                keys, values = count_ngrams(ids, offsets, n, max(len(labels), 1))
+                counts[(kind, n)] = NgramCounts(labels, n, keys, values)
+        return CorpusStats(counts, len(offsets) - 1, len(token_ids), max_n)
+
+    def ngrams(self, kind='word', n=1):
+        ''' NgramCounts of a kind of unit (word, pos or word_pos) '''
+        if (kind, n) not in self.counts:
+            raise ValueError("No {}-gram counts of {} (kinds: {}, max_n: {})".format(n, kind, ', '.join(KINDS), self.max_n))
+        return self.counts[(kind, n)]
+
+    def frequencies(self, kind='word', k=None):
+        ''' Most common units of a kind, [(unit, count), ...] '''
+        return self.ngrams(kind, 1).most_common(k)
+
+    @property
+    def tags(self):
+        return self.counts[('pos', 1)].labels
+
+    def transition_matrix(self, n=2, normalize=False):
+        ''' Dense POS n-gram count array (tags x tags for n = 2), indexed by self.tags order.
+        When normalize is True, return transition probabilities P(last tag | previous tags).
+        '''
+        dense = self.ngrams('pos', n).to_dense().astype(np.float64 if normalize else np.int64)
+        if normalize:
+            totals = dense.sum(axis=-1, keepdims=True)
+            dense = np.divide(dense, totals, out=np.zeros_like(dense), where=totals > 0)
+        return dense
+
+    def lexicon_sizes(self):
+        ''' Number of distinct words of each POS tag, {tag: size} in tag order '''
+        pairs = self.ngrams('word_pos', 1)
+        sizes = dict.fromkeys(self.tags, 0)
+        for (_, tag) in (pairs.labels[k] for k in pairs.keys.tolist()):
+            sizes[tag] += 1
+        return sizes
+
+    def merge(self, other):
+        ''' Return the sum of the counts of two shards '''
+        max_n = min(self.max_n, other.max_n)
+        counts = {key: self.counts[key].merge(other.counts[key]) for key in self.counts if key[1] <= max_n}
+        return CorpusStats(counts, self.sentence_count + other.sentence_count, self.token_count + other.token_count, max_n)
+
+    __add__ = merge
+
+
+def compute_stats(doc, max_n=3, lower=False):
+    ''' Compute CorpusStats of a document (see CorpusStats.from_document)
+    '''
+    return CorpusStats.from_document(doc, max_n, lower)
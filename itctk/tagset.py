@@ -195,3 +195,64 @@ A word or part of a sentence which its category is unknown or uncertain is label
 Typo is also labeled X.""", "statemen")
 
 POS_TAGSET["Z"] = TagInfo("Z", """Punctuation.""", '"...", ?, .')
+
+# -----------------------------------------------------------------------
+# INTEGER ENCODING AND TAG CLASSES
+# -----------------------------------------------------------------------
+
+# Stable tag IDs in the order of POS_TAGSET: the order never changes, new tags must be added at the end
+POS_TAGS = tuple(POS_TAGSET)
+TAG_IDS = {tag: tid for tid, tag in enumerate(POS_TAGS)}
+ANY_TAG = (1 << len(POS_TAGS)) - 1
+
+
+def tag_id(tag):
+    ''' Stable integer ID of a POS tag (see POS_TAGS). Raise ValueError if the tag is unknown.
+    '''
+    tid = TAG_IDS.get(tag)
+    if tid is None:
+        raise ValueError("Unknown POS tag: {} (see POS_TAGSET)".format(tag))
+    return tid
+
+
+def tag_mask(tags):
+    ''' Bitmask of some POS tags (bit tag_id(tag) is set for each tag), e.g. tag_mask(['NN', 'NNP'])
+    '''
+    if isinstance(tags, str):
+        tags = (tags,)
+    mask = 0
+    for tag in tags:
+        mask |= 1 << tag_id(tag)
+    return mask
+
+
+def mask_tags(mask):
+    ''' POS tags of a bitmask, in stable ID order
+    '''
+    return [tag for tid, tag in enumerate(POS_TAGS) if mask >> tid & 1]
+
+
+# Tag classes, e.g. TAG_CLASSES['nominal'] & tag_mask('NN') is true
+TAG_CLASSES = {
+    'nominal': tag_mask(('NN', 'NNP', 'NND', 'PRP')),
+    'noun': tag_mask(('NN', 'NNP', 'NND')),
+    'pronoun': tag_mask(('PR', 'PRP')),
+    'verbal': tag_mask(('VB', 'MD')),
+    'modifier': tag_mask(('JJ', 'RB')),
+    'numeral': tag_mask(('CD', 'OD')),
+    'function': tag_mask(('CC', 'DT', 'IN', 'MD', 'NEG', 'PR', 'RP', 'SC', 'WH')),
+    'content': tag_mask(('FW', 'JJ', 'NN', 'NNP', 'NND', 'RB', 'VB')),
+    'punctuation': tag_mask(('SYM', 'Z')),
+    'other': tag_mask(('FW', 'UH', 'X')),
+}
+
+
+def class_mask(name):
+    ''' Bitmask of a tag class (see TAG_CLASSES, case-insensitive) or of a single POS tag
+    '''
+    mask = TAG_CLASSES.get(name.lower())
+    if mask is not None:
+        return mask
+    if name.upper() in TAG_IDS:
+        return 1 << TAG_IDS[name.upper()]
+    raise ValueError("Unknown tag class: {} (classes: {})".format(name, ', '.join(sorted(TAG_CLASSES))))
@@ -96,8 +96,9 @@ setup(
         'License :: OSI Approved :: MIT License',
         'Operating System :: OS Independent',
         'Topic :: Software Development :: Libraries :: Python Modules',
-        ]#,
-    #extras_require={
-        # 'testing': ['pytest'],
-    #}
+        ],
+    extras_require={
+        'stats': ['numpy'],
+        'sentiment': ['numpy'],
+    }
 )
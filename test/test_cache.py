@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+Script for testing ITCtk binary cache
+Latest version can be found at https://github.com/neocl/itctk
+
+References:
+    Python documentation:
+        https://docs.python.org/
+    Python unittest
+        https://docs.python.org/3/library/unittest.html
+    --
+    argparse module:
+        https://docs.python.org/3/howto/argparse.html
+    PEP 257 - Python Docstring Conventions:
+        https://www.python.org/dev/peps/pep-0257/
+
+@author: Le Tuan Anh <tuananh.ke@gmail.com>
+'''
+
+# Copyright (c) 2016, Le Tuan Anh <tuananh.ke@gmail.com>
+#
+#Permission is hereby granted, free of charge, to any person obtaining a copy
+#of this software and associated documentation files (the "Software"), to deal
+#in the Software without restriction, including without limitation the rights
+#to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#copies of the Software, and to permit persons to whom the Software is
+#furnished to do so, subject to the following conditions:
+#
+#The above copyright notice and this permission notice shall be included in
+#all copies or substantial portions of the Software.
+#
+#THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#THE SOFTWARE.
+
+__author__ = "Le Tuan Anh <tuananh.ke@gmail.com>"
+__copyright__ = "Copyright 2016, itctk"
+__credits__ = [ "Le Tuan Anh" ]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "Le Tuan Anh"
+__email__ = "<tuananh.ke@gmail.com>"
+__status__ = "Prototype"
+
+########################################################################
+
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest import mock
+from itctk import itc, parse_data, corpus_stats, cached_stats, Document, CompactDocument, Sentence, Word
+from itctk.cache import cache_path, load_cache, load_header, save_cache
+
+########################################################################
+
+TEST_FILE = 'data/test.tsv'
+
+
+class TestCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.source = os.path.join(self.tempdir, 'test.tsv')
+        shutil.copy(TEST_FILE, self.source)
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def test_cache_roundtrip(self):
+        self.assertIsNone(load_cache(self.source))
+        doc = parse_data(self.source, cache=True)
+        self.assertTrue(os.path.isfile(cache_path(self.source)))
+        cached = load_cache(self.source)
+        self.assertIsInstance(cached, CompactDocument)
+        self.assertEqual([str(x) for x in cached], [str(x) for x in doc])
+        self.assertEqual(cached.lexicon, parse_data(self.source).lexicon)
+        self.assertEqual(len(cached.find_word('mem.+')), 7)
+        # cached documents are read-only views but can still be extended
+        cached.new_sentence().new_word('Kera', 'NN')
+        self.assertEqual(len(cached), 25)
+
+    def test_stale_cache(self):
+        itc(self.source)
+        self.assertIsNotNone(load_cache(self.source))
+        with open(self.source, 'a') as outfile:
+            outfile.write('\nKera\tNN\n')
+        self.assertIsNone(load_cache(self.source))
+        doc = itc(self.source)
+        self.assertEqual(len(doc), 25)
+        self.assertEqual(len(load_cache(self.source)), 25)
+
+    def test_touched_source(self):
+        itc(self.source)
+        info = os.stat(self.source)
+        os.utime(self.source, ns=(info.st_atime_ns, info.st_mtime_ns + 10 ** 9))
+        # same content, the cache is still valid
+        self.assertIsNotNone(load_cache(self.source))
+        # and the new modification time is stored, the file is not hashed again
+        self.assertEqual(load_header(self.source)['mtime'], os.stat(self.source).st_mtime_ns)
+        with mock.patch('itctk.cache.file_hash') as file_hash:
+            self.assertIsNotNone(load_cache(self.source))
+            self.assertFalse(file_hash.called)
+
+    def test_cache_compact(self):
+        self.assertIsInstance(parse_data(self.source, cache=True, compact=True), CompactDocument)
+        doc = parse_data(self.source, cache=True, compact=False)
+        self.assertIsInstance(doc, Document)
+        self.assertNotIsInstance(doc, CompactDocument)
+        self.assertEqual(len(doc), 24)
+        self.assertEqual(doc.lexicon, parse_data(self.source).lexicon)
+        # the cache is transparent, itc() returns a Document unless compact=True
+        doc = itc(self.source)
+        self.assertTrue(os.path.isfile(cache_path(self.source)))
+        self.assertNotIsInstance(doc, CompactDocument)
+        self.assertIsInstance(doc[0], Sentence)
+        self.assertEqual(doc[0][0], Word('Kera', 'NN', doc[0]))
+        doc.add_word(Word('Kera', 'NN'))
+        self.assertNotIsInstance(itc(self.source, cache=False), CompactDocument)
+        self.assertIsInstance(itc(self.source, compact=True), CompactDocument)
+        self.assertIsInstance(itc(self.source, cache=False, compact=True), CompactDocument)
+
+    def test_concurrent_save(self):
+        doc = parse_data(self.source, compact=True)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(save_cache(doc, self.source))) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, [cache_path(self.source)] * 8)
+        self.assertEqual(len(load_cache(self.source)), 24)
+        self.assertEqual([f for f in os.listdir(self.tempdir) if f.endswith('.tmp')], [])
+
+    def test_cached_stats(self):
+        self.assertIsNone(cached_stats(self.source))
+        doc = itc(self.source)
+        self.assertEqual(cached_stats(self.source), corpus_stats(doc))
+        with open(self.source, 'a') as outfile:
+            outfile.write('\nKera\tNN\n')
+        self.assertIsNone(cached_stats(self.source))
+
+    def test_unwritable_cache(self):
+        doc = parse_data(self.source, compact=True)
+        missing = os.path.join(self.tempdir, 'missing', 'test.tsv')
+        self.assertIsNone(save_cache(doc, missing, key={'source': missing}))
+
+
+########################################################################
+
+def main():
+    unittest.main()
+
+if __name__ == "__main__":
+    main()
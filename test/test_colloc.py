@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+Script for testing ITCtk collocation mining
+Latest version can be found at https://github.com/neocl/itctk
+
+References:
+    Python documentation:
+        https://docs.python.org/
+    Python unittest
+        https://docs.python.org/3/library/unittest.html
+    --
+    argparse module:
+        https://docs.python.org/3/howto/argparse.html
+    PEP 257 - Python Docstring Conventions:
+        https://www.python.org/dev/peps/pep-0257/
+
+@author: Le Tuan Anh <tuananh.ke@gmail.com>
+'''
+
+# Copyright (c) 2016, Le Tuan Anh <tuananh.ke@gmail.com>
+#
+#Permission is hereby granted, free of charge, to any person obtaining a copy
+#of this software and associated documentation files (the "Software"), to deal
+#in the Software without restriction, including without limitation the rights
+#to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#copies of the Software, and to permit persons to whom the Software is
+#furnished to do so, subject to the following conditions:
+#
+#The above copyright notice and this permission notice shall be included in
+#all copies or substantial portions of the Software.
+#
+#THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#THE SOFTWARE.
+
+__author__ = "Le Tuan Anh <tuananh.ke@gmail.com>"
+__copyright__ = "Copyright 2016, itctk"
+__credits__ = [ "Le Tuan Anh" ]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "Le Tuan Anh"
+__email__ = "<tuananh.ke@gmail.com>"
+__status__ = "Prototype"
+
+########################################################################
+
+
+import math
+import unittest
+from collections import Counter
+from itctk import itc
+try:
+    import numpy
+    from itctk.colloc import collocations
+except ImportError:
+    numpy = None
+
+########################################################################
+
+TEST_FILE = 'data/test.tsv'
+
+
+def count_loop(doc, window, pos_pairs=None):
+    pairs = Counter()
+    for sent in doc:
+        for i, node in enumerate(sent):
+            for collocate in sent[i + 1:i + 1 + window]:
+                if pos_pairs is None or (node.pos, collocate.pos) in pos_pairs:
+                    pairs[(node.text.lower(), collocate.text.lower())] += 1
+    return pairs
+
+
+@unittest.skipIf(numpy is None, "NumPy is not installed")
+class TestCollocations(unittest.TestCase):
+
+    def test_counts(self):
+        doc = itc(TEST_FILE, cache=False)
+        for window, pos_pairs in ((1, None), (3, None), (3, [('VB', 'NN'), ('JJ', 'NN')])):
+            expected = count_loop(doc, window, pos_pairs)
+            colloc = collocations(doc, window, pos_pairs, min_count=1)
+            actual = {(colloc.words[a], colloc.words[b]): c for a, b, c in zip(colloc.nodes.tolist(), colloc.collocates.tolist(), colloc.counts.tolist())}
+            self.assertEqual(actual, dict(expected))
+            self.assertEqual(colloc.total, sum(expected.values()))
+        self.assertRaises(ValueError, collocations, doc, 2, [('VB', 'XYZ')])
+
+    def test_scores(self):
+        doc = itc(TEST_FILE, cache=False)
+        pairs = count_loop(doc, 2)
+        total = sum(pairs.values())
+        rows, cols = Counter(), Counter()
+        for (a, b), c in pairs.items():
+            rows[a] += c
+            cols[b] += c
+        colloc = collocations(doc, 2, min_count=2)
+        self.assertEqual(len(colloc), len([c for c in pairs.values() if c >= 2]))
+        for collocate, score, count in colloc.top('untuk', 'pmi', 3):
+            self.assertEqual(count, pairs[('untuk', collocate)])
+            expected = math.log2(count * total / (rows['untuk'] * cols[collocate]))
+            self.assertAlmostEqual(score, expected)
+        top = colloc.most_associated('log_likelihood', 5)
+        self.assertEqual(len(top), 5)
+        self.assertTrue(all(x[2] >= y[2] for x, y in zip(top, top[1:])))
+        self.assertEqual(colloc.top('xyz'), [])
+        self.assertRaises(ValueError, colloc.scores, 'dice')
+
+    def test_top_k(self):
+        colloc = collocations(itc(TEST_FILE, cache=False), 3, min_count=1)
+        top_k = colloc.top_k('t_score', 2)
+        for word in ('untuk', 'monyet', 'di'):
+            self.assertEqual(top_k[word], colloc.top(word, 't_score', 2))
+
+    def test_min_freq(self):
+        doc = itc(TEST_FILE, cache=False)
+        colloc = collocations(doc, 2, min_count=1, min_freq=5)
+        frequencies = Counter(w.text.lower() for w in doc.words)
+        for wid in set(colloc.nodes.tolist()) | set(colloc.collocates.tolist()):
+            self.assertGreaterEqual(frequencies[colloc.words[wid]], 5)
+
+
+########################################################################
+
+def main():
+    unittest.main()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+Script for testing ITCtk concordance and proximity queries
+Latest version can be found at https://github.com/neocl/itctk
+
+References:
+    Python documentation:
+        https://docs.python.org/
+    Python unittest
+        https://docs.python.org/3/library/unittest.html
+    --
+    argparse module:
+        https://docs.python.org/3/howto/argparse.html
+    PEP 257 - Python Docstring Conventions:
+        https://www.python.org/dev/peps/pep-0257/
+
+@author: Le Tuan Anh <tuananh.ke@gmail.com>
+'''
+
+# Copyright (c) 2016, Le Tuan Anh <tuananh.ke@gmail.com>
+#
+#Permission is hereby granted, free of charge, to any person obtaining a copy
+#of this software and associated documentation files (the "Software"), to deal
+#in the Software without restriction, including without limitation the rights
+#to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#copies of the Software, and to permit persons to whom the Software is
+#furnished to do so, subject to the following conditions:
+#
+#The above copyright notice and this permission notice shall be included in
+#all copies or substantial portions of the Software.
+#
+#THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#THE SOFTWARE.
+
+__author__ = "Le Tuan Anh <tuananh.ke@gmail.com>"
+__copyright__ = "Copyright 2016, itctk"
+__credits__ = [ "Le Tuan Anh" ]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "Le Tuan Anh"
+__email__ = "<tuananh.ke@gmail.com>"
+__status__ = "Prototype"
+
+########################################################################
+
+
+import re
+import unittest
+from itctk import itc
+from itctk.concordance import KwicLine, ProximityHit
+
+########################################################################
+
+TEST_FILE = 'data/test.tsv'
+
+
+def kwic_loop(doc, query, left, right, pos=None):
+    pattern = re.compile(query)
+    lines = []
+    for sid, sent in enumerate(doc):
+        texts = [w.text for w in sent]
+        for position, word in enumerate(sent):
+            if pattern.match(word.text) and (pos is None or word.pos == pos):
+                lines.append(KwicLine(sid, position, texts[max(0, position - left):position], word.text, texts[position + 1:position + 1 + right]))
+    return lines
+
+
+class TestConcordance(unittest.TestCase):
+
+    def check_doc(self, doc):
+        for query, pos in (('monyet$', None), ('di$', 'IN'), ('mem.+', 'VB'), ('xyz', None)):
+            self.assertEqual(list(doc.kwic(query, 3, 4, pos=pos)), kwic_loop(doc, query, 3, 4, pos))
+        # proximity
+        expected = []
+        for sid, sent in enumerate(doc):
+            for i, a in enumerate(sent):
+                for j, b in enumerate(sent):
+                    if i != j and abs(i - j) <= 3 and a.text == 'monyet' and b.text == 'di' and b.pos == 'IN':
+                        expected.append(ProximityHit(sid, i, j))
+        self.assertEqual(list(doc.proximity('monyet$', 'di$', 3, second_pos='IN')), expected)
+        ordered = list(doc.proximity('monyet$', 'di$', 3, ordered=True))
+        self.assertEqual(ordered, [hit for hit in expected if hit.second > hit.first])
+
+    def test_document(self):
+        self.check_doc(itc(TEST_FILE, cache=False))
+
+    def test_compact(self):
+        self.check_doc(itc(TEST_FILE, compact=True, cache=False))
+
+    def test_cross_sentence(self):
+        doc = itc(TEST_FILE, cache=False)
+        line = next(doc.kwic('Kera', 3, 3, cross_sentence=True))
+        self.assertEqual((line.sid, line.position, line.left), (0, 0, []))
+        line = next(doc.kwic('\\.', 2, 2, cross_sentence=True))
+        self.assertEqual(line.right, [w.text for w in doc[line.sid + 1]][:2])
+        line = next(doc.kwic('Beberapa', 3, 3, cross_sentence=True))
+        self.assertEqual(line.left, [w.text for w in doc[line.sid - 1]][-3:])
+        lines = list(doc.kwic('Beberapa', 30, 0, cross_sentence=True))
+        self.assertEqual(len(lines[0].left), len(doc[0]) + len(doc[1]))
+        self.assertIn('[', str(lines[0]))
+
+    def test_streaming(self):
+        doc = itc(TEST_FILE, cache=False)
+        lines = doc.kwic('.+', 2, 2)
+        self.assertEqual(next(lines).keyword, doc[0][0].text)
+        self.assertEqual(sum(1 for _ in lines) + 1, len(doc.words))
+
+
+########################################################################
+
+def main():
+    unittest.main()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+Script for testing ITCtk exporter
+Latest version can be found at https://github.com/neocl/itctk
+
+References:
+    Python documentation:
+        https://docs.python.org/
+    Python unittest
+        https://docs.python.org/3/library/unittest.html
+    --
+    argparse module:
+        https://docs.python.org/3/howto/argparse.html
+    PEP 257 - Python Docstring Conventions:
+        https://www.python.org/dev/peps/pep-0257/
+
+@author: Le Tuan Anh <tuananh.ke@gmail.com>
+'''
+
+# Copyright (c) 2016, Le Tuan Anh <tuananh.ke@gmail.com>
+#
+#Permission is hereby granted, free of charge, to any person obtaining a copy
+#of this software and associated documentation files (the "Software"), to deal
+#in the Software without restriction, including without limitation the rights
+#to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#copies of the Software, and to permit persons to whom the Software is
+#furnished to do so, subject to the following conditions:
+#
+#The above copyright notice and this permission notice shall be included in
+#all copies or substantial portions of the Software.
+#
+#THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#THE SOFTWARE.
+
+__author__ = "Le Tuan Anh <tuananh.ke@gmail.com>"
+__copyright__ = "Copyright 2016, itctk"
+__credits__ = [ "Le Tuan Anh" ]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "Le Tuan Anh"
+__email__ = "<tuananh.ke@gmail.com>"
+__status__ = "Prototype"
+
+########################################################################
+
+
+import io
+import os
+import gzip
+import json
+import lzma
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from itctk import itc, iter_sentences, export_itc
+from itctk.itctk import main as itctk_main
+from itctk.export import export, export_file, default_outputs, open_output
+
+########################################################################
+
+TEST_FILE = 'data/test.tsv'
+
+
+class TestExport(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def path(self, name):
+        return os.path.join(self.tmpdir, name)
+
+    def test_formats(self):
+        doc = itc(TEST_FILE, cache=False)
+        outputs = {'conllu': self.path('itc.conllu'), 'nltk': self.path('itc.txt.gz'),
+                   'jsonl': self.path('itc.jsonl.xz'), 'text': self.path('itc.text.txt')}
+        self.assertEqual(export_file(TEST_FILE, outputs, batch_size=5), len(doc))
+        with gzip.open(outputs['nltk'], 'rt', encoding='utf-8') as infile:
+            self.assertEqual(infile.read().splitlines(), [str(s) for s in doc])
+        with lzma.open(outputs['jsonl'], 'rt', encoding='utf-8') as infile:
+            records = [json.loads(line) for line in infile]
+        self.assertEqual([r['id'] for r in records], list(range(len(doc))))
+        self.assertEqual(records[0], {'id': 0, 'tokens': [w.text for w in doc[0]], 'pos': [w.pos for w in doc[0]]})
+        with open(outputs['text'], encoding='utf-8') as infile:
+            self.assertEqual(infile.read().splitlines(), [s.text() for s in doc])
+        with open(outputs['conllu'], encoding='utf-8') as infile:
+            blocks = infile.read().split('\n\n')
+        self.assertEqual(len([b for b in blocks if b]), len(doc))
+        lines = blocks[0].splitlines()
+        self.assertEqual(lines[:2], ['# sent_id = 1', '# text = %s' % (doc[0].text(),)])
+        self.assertEqual(lines[2].split('\t'), ['1', 'Kera', '_', '_', 'NN', '_', '_', '_', '_', '_'])
+        self.assertEqual(len(lines), len(doc[0]) + 2)
+
+    def test_export_sentences(self):
+        path = self.path('out.txt')
+        self.assertEqual(export(iter_sentences(TEST_FILE), {'nltk': path}), 24)
+        with open_output(self.path('x.txt.bz2')) as outfile:
+            outfile.write('ok')
+        self.assertRaises(ValueError, export, [], {'xml': path})
+
+    def test_default_outputs(self):
+        self.assertEqual(default_outputs(['nltk', 'conllu'], compression='.gz'), {'nltk': 'data/itc.txt.gz', 'conllu': 'data/itc.conllu.gz'})
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError) as cm:
+            default_outputs(['nltk', 'foo'])
+        self.assertIn('conllu, jsonl, nltk, text', str(cm.exception))
+        self.assertRaises(ValueError, export_itc, TEST_FILE, ['foo'], [self.path('out.foo')])
+        # itctk -x -f foo exits with a usage error
+        with mock.patch('sys.argv', ['itctk', '-x', '-i', TEST_FILE, '-f', 'foo']), mock.patch('sys.stderr', io.StringIO()) as stderr:
+            with self.assertRaises(SystemExit) as cm:
+                itctk_main()
+        self.assertEqual(cm.exception.code, 2)
+        self.assertIn('Unknown export format: foo', stderr.getvalue())
+
+    def test_duplicate_format(self):
+        self.assertRaises(ValueError, export_itc, TEST_FILE, ['nltk', 'nltk'], [self.path('a.txt'), self.path('b.txt')])
+        self.assertFalse(os.path.exists(self.path('a.txt')))
+        with mock.patch('sys.argv', ['itctk', '-x', '-i', TEST_FILE, '-f', 'nltk,nltk']), mock.patch('sys.stderr', io.StringIO()) as stderr:
+            with self.assertRaises(SystemExit):
+                itctk_main()
+        self.assertIn('Duplicate export format: nltk', stderr.getvalue())
+
+    def test_outputs_closed_on_error(self):
+        opened = []
+
+        def tracked(path):
+            outfile = open_output(path)
+            opened.append(outfile)
+            return outfile
+        outputs = {'nltk': self.path('ok.txt'), 'text': os.path.join(self.tmpdir, 'missing', 'out.txt')}
+        with mock.patch('itctk.export.open_output', tracked):
+            self.assertRaises(OSError, export, iter_sentences(TEST_FILE), outputs)
+        self.assertEqual(len(opened), 1)
+        self.assertTrue(opened[0].closed)
+
+
+########################################################################
+
+def main():
+    unittest.main()
+
+if __name__ == "__main__":
+    main()
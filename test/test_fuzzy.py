@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+Script for testing ITCtk fuzzy lexicon search
+Latest version can be found at https://github.com/neocl/itctk
+
+References:
+    Python documentation:
+        https://docs.python.org/
+    Python unittest
+        https://docs.python.org/3/library/unittest.html
+    --
+    argparse module:
+        https://docs.python.org/3/howto/argparse.html
+    PEP 257 - Python Docstring Conventions:
+        https://www.python.org/dev/peps/pep-0257/
+
+@author: Le Tuan Anh <tuananh.ke@gmail.com>
+'''
+
+# Copyright (c) 2016, Le Tuan Anh <tuananh.ke@gmail.com>
+#
+#Permission is hereby granted, free of charge, to any person obtaining a copy
+#of this software and associated documentation files (the "Software"), to deal
+#in the Software without restriction, including without limitation the rights
+#to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#copies of the Software, and to permit persons to whom the Software is
+#furnished to do so, subject to the following conditions:
+#
+#The above copyright notice and this permission notice shall be included in
+#all copies or substantial portions of the Software.
+#
+#THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#THE SOFTWARE.
+
+__author__ = "Le Tuan Anh <tuananh.ke@gmail.com>"
+__copyright__ = "Copyright 2016, itctk"
+__credits__ = [ "Le Tuan Anh" ]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "Le Tuan Anh"
+__email__ = "<tuananh.ke@gmail.com>"
+__status__ = "Prototype"
+
+########################################################################
+
+
+import unittest
+from itctk import itc
+from itctk.fuzzy import edit_distance, deletes, SimilarityIndex
+
+########################################################################
+
+TEST_FILE = 'data/test.tsv'
+
+
+class TestFuzzy(unittest.TestCase):
+
+    def test_edit_distance(self):
+        self.assertEqual(edit_distance('monyet', 'monyet'), 0)
+        self.assertEqual(edit_distance('monyet', 'monyt'), 1)
+        self.assertEqual(edit_distance('kitten', 'sitting'), 3)
+        self.assertEqual(edit_distance('', 'abc'), 3)
+        self.assertEqual(edit_distance('kitten', 'sitting', 1), 2)
+        self.assertEqual(deletes('abc', 1), {'abc', 'bc', 'ac', 'ab'})
+
+    def test_search(self):
+        doc = itc(TEST_FILE, cache=False)
+        forms = list(doc.lexicon.keys())
+        index = SimilarityIndex(forms)
+        for word in ('monyet', 'mmeiliki', 'kta', 'xyzxyz', 'pesta olahrga'):
+            for k in (1, 2):
+                expected = sorted(((f, edit_distance(word, f)) for f in forms if edit_distance(word, f) <= k), key=lambda x: (x[1], x[0]))
+                self.assertEqual(index.search(word, k), expected)
+        self.assertRaises(ValueError, index.search, 'monyet', 3)
+
+    def test_find_similar(self):
+        doc = itc(TEST_FILE, cache=False)
+        results = doc.find_similar('Monyt')
+        self.assertEqual([(r.text, r.distance) for r in results], [('monyet', 1)])
+        self.assertEqual(results[0].pos, {'NN'})
+        self.assertEqual(len(results[0].postings), len(doc.find_word('monyet$', case_sensitive=False)))
+        sid, position = results[0].postings[0]
+        self.assertEqual(doc[sid][position].text.lower(), 'monyet')
+        # the index follows changes of the document
+        doc.new_sentence().new_word('monyed', 'X')
+        self.assertEqual([r.text for r in doc.find_similar('monyet')], ['monyet', 'monyed'])
+
+    def test_cluster_similar(self):
+        doc = itc(TEST_FILE, compact=True, cache=False)
+        clusters = doc.cluster_similar(1)
+        self.assertIn(['akan', 'ikan'], clusters)
+        self.assertIn(['kata', 'kaya', 'kota'], clusters)
+        for cluster in clusters:
+            self.assertEqual(cluster, sorted(cluster))
+            self.assertGreater(len(cluster), 1)
+
+
+########################################################################
+
+def main():
+    unittest.main()
+
+if __name__ == "__main__":
+    main()
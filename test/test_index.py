@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+Script for testing ITCtk inverted index
+Latest version can be found at https://github.com/neocl/itctk
+
+References:
+    Python documentation:
+        https://docs.python.org/
+    Python unittest
+        https://docs.python.org/3/library/unittest.html
+    --
+    argparse module:
+        https://docs.python.org/3/howto/argparse.html
+    PEP 257 - Python Docstring Conventions:
+        https://www.python.org/dev/peps/pep-0257/
+
+@author: Le Tuan Anh <tuananh.ke@gmail.com>
+'''
+
+# Copyright (c) 2016, Le Tuan Anh <tuananh.ke@gmail.com>
+#
+#Permission is hereby granted, free of charge, to any person obtaining a copy
+#of this software and associated documentation files (the "Software"), to deal
+#in the Software without restriction, including without limitation the rights
+#to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#copies of the Software, and to permit persons to whom the Software is
+#furnished to do so, subject to the following conditions:
+#
+#The above copyright notice and this permission notice shall be included in
+#all copies or substantial portions of the Software.
+#
+#THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#THE SOFTWARE.
+
+__author__ = "Le Tuan Anh <tuananh.ke@gmail.com>"
+__copyright__ = "Copyright 2016, itctk"
+__credits__ = [ "Le Tuan Anh" ]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "Le Tuan Anh"
+__email__ = "<tuananh.ke@gmail.com>"
+__status__ = "Prototype"
+
+########################################################################
+
+import unittest
+from itctk import itc
+from itctk.index import InvertedIndex, AffixIndex, split_posting, literal_affixes
+
+########################################################################
+
+TEST_FILE = 'data/test.tsv'
+
+
+class TestInvertedIndex(unittest.TestCase):
+
+    def check_doc(self, doc):
+        queries = ['mem.+', 'monyet', 'Monyet', 'di$', '[0-9]+', 'pesta olahraga', '.+nya$', '^pe.+an$', 'M']
+        for query in queries:
+            for case_sensitive in (True, False):
+                expected = doc.find_word(query, case_sensitive, use_index=False)
+                actual = doc.find_word(query, case_sensitive, use_index=True)
+                self.assertEqual([str(w) for w in actual], [str(w) for w in expected])
+                expected_sents = set(str(s) for s in doc.find(query, case_sensitive, use_index=False))
+                actual_sents = [str(s) for s in doc.find(query, case_sensitive, use_index=True)]
+                self.assertEqual(set(actual_sents), expected_sents)
+                self.assertEqual(len(actual_sents), len(expected_sents))
+
+    def test_document_index(self):
+        self.check_doc(itc(TEST_FILE, cache=False))
+
+    def test_compact_index(self):
+        self.check_doc(itc(TEST_FILE, compact=True, cache=False))
+
+    def test_postings(self):
+        doc = itc(TEST_FILE, cache=False)
+        index = InvertedIndex(doc)
+        self.assertEqual(index.lower_forms['pesta olahraga'], ['pesta olahraga', 'Pesta Olahraga'])
+        postings = index.search('Kera')
+        self.assertEqual([split_posting(p) for p in postings], [(0, 0)])
+        self.assertEqual(index.words(postings)[0], doc[0][0])
+
+    def test_index_invalidation(self):
+        doc = itc(TEST_FILE, cache=False)
+        doc.build_index()
+        self.assertEqual(len(doc.find_word('Kera')), 1)
+        doc.new_sentence().new_word('Kera', 'NN')
+        self.assertEqual(len(doc.find_word('Kera')), 2)
+        self.assertEqual(len(doc.find_word('Kera', use_index=True)), 2)
+
+
+class TestAffixIndex(unittest.TestCase):
+
+    def test_literal_affixes(self):
+        self.assertEqual(literal_affixes('mem.+'), ('mem', ''))
+        self.assertEqual(literal_affixes('^penge.+kan$'), ('penge', 'kan'))
+        self.assertEqual(literal_affixes(r'\w+lah\Z'), ('', 'lah'))
+        self.assertEqual(literal_affixes('di$'), ('di', ''))
+        for text in ('(?i)mem', 'a|b', '[mp]em.+', '.+nya', '('):
+            self.assertEqual(literal_affixes(text), ('', ''))
+
+    def test_affix_queries(self):
+        doc = itc(TEST_FILE, cache=False)
+        forms = list(doc.lexicon.keys())
+        index = AffixIndex(forms)
+        self.assertEqual(len(index), len(forms))
+        for prefix, suffix in (('mem', ''), ('', 'nya'), ('', 'kan'), ('pe', 'an'), ('di', 'di'), ('zzz', '')):
+            expected = sorted(f for f in forms if f.startswith(prefix) and f.endswith(suffix) and len(f) >= len(prefix) + len(suffix))
+            self.assertEqual(index.affix(prefix, suffix), expected)
+            self.assertEqual(doc.find_affix(prefix, suffix), expected)
+        self.assertEqual(sorted(index.suffix('nya')), index.affix(suffix='nya'))
+
+    def test_auto_index(self):
+        doc = itc(TEST_FILE, cache=False)
+        self.assertEqual(len(doc.find_word('[0-9]+')), 3)
+        self.assertIsNone(doc._index)
+        expected = doc.find_word('mem.+', use_index=False)
+        self.assertEqual(doc.find_word('mem.+'), expected)
+        self.assertIsNotNone(doc._index)
+        self.assertIn('memiliki', doc.find_affix('mem'))
+        doc.new_sentence().new_word('memakan', 'VB')
+        self.assertIn('memakan', doc.find_affix('MEM'))
+        self.assertEqual(len(doc.find_word('mem.+')), len(expected) + 1)
+
+
+########################################################################
+
+def main():
+    unittest.main()
+
+if __name__ == "__main__":
+    main()
@@ -52,11 +52,17 @@ __status__ = "Prototype"
 
 import sys
 import os
+import gzip
+import shutil
+import tempfile
 import argparse
 import unittest
 from itctk import itc
 from itctk import Document, Sentence, Word
+from itctk import CompactDocument, DocumentView
 from itctk import ITC_DATA_FILE, parse_data   # Expose low level functions
+from itctk import iter_sentences, corpus_stats, ParseError
+from itctk.itctk import _read_blocks
 
 ########################################################################
 
@@ -68,7 +74,147 @@ class TestICTTK(unittest.TestCase):
         self.assertIsNotNone(doc)
         # self.assertEqual(len(doc.sentences), 10030) # real data
         self.assertEqual(len(doc.sentences), 24)      # test data
-        
+
+    def test_stream(self):
+        doc = itc('data/test.tsv')
+        sents = list(itc('data/test.tsv', stream=True))
+        self.assertEqual(len(sents), 24)
+        self.assertEqual([str(x) for x in doc], [str(x) for x in sents])
+        self.assertEqual(sents[0].words[0].sentence, sents[0])
+
+    def test_fast_engine(self):
+        doc = parse_data('data/test.tsv')
+        fast = parse_data('data/test.tsv', engine='fast')
+        self.assertEqual([str(x) for x in fast], [str(x) for x in doc])
+        self.assertEqual(fast.lexicon, doc.lexicon)
+        self.assertEqual(fast.pos, doc.pos)
+        self.assertEqual(len(fast.words), len(doc.words))
+        self.assertIs(fast.words[-1].sentence, fast[-1])
+        compact = parse_data('data/test.tsv', engine='fast', compact=True)
+        self.assertEqual([str(x) for x in compact], [str(x) for x in doc])
+
+    def test_crlf_line_endings(self):
+        tempdir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tempdir, 'crlf.tsv')
+            with open(path, 'wb') as outfile:
+                outfile.write(b'Kera\tNN\r\nuntuk\tSC\r\n\r\namankan\tVB\r\n')
+            doc = parse_data(path)
+            self.assertEqual(len(doc), 2)
+            self.assertEqual([w.pos for w in doc.words], ['NN', 'SC', 'VB'])
+            for kwargs in ({'engine': 'fast'}, {'engine': 'fast', 'compact': True}, {'workers': 2}):
+                other = parse_data(path, **kwargs)
+                self.assertEqual([str(x) for x in other], [str(x) for x in doc])
+                self.assertEqual([w.pos for w in other.words], ['NN', 'SC', 'VB'])
+            # a \r\n split between two chunks
+            for chunk_size in range(1, 8):
+                self.assertEqual('\n\n'.join(_read_blocks(path, chunk_size)), 'Kera\tNN\nuntuk\tSC\n\namankan\tVB\n')
+        finally:
+            shutil.rmtree(tempdir)
+
+    def test_malformed_line(self):
+        tempdir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tempdir, 'bad.tsv')
+            with open(path, 'w') as outfile:
+                outfile.write('Kera\tNN\nuntuk\tSC\n\namankan\tVB\textra\n')
+            for kwargs in ({}, {'engine': 'fast'}, {'workers': 2}):
+                with self.assertRaises(ParseError) as cm:
+                    parse_data(path, **kwargs)
+                self.assertEqual(cm.exception.lineno, 4)
+                self.assertEqual(cm.exception.line, 'amankan\tVB\textra')
+            # compressed files are reported with their line number too, also by the fast engine
+            gz_path = os.path.join(tempdir, 'bad.tsv.gz')
+            with gzip.open(gz_path, 'wt') as outfile:
+                outfile.write('Kera\tNN\r\n\r\n\r\n' * 1000 + 'untuk\tSC\r\n\r\namankan\tVB\textra\r\n')
+            for kwargs in ({}, {'engine': 'fast'}):
+                with self.assertRaises(ParseError) as cm:
+                    parse_data(gz_path, **kwargs)
+                self.assertEqual((cm.exception.lineno, cm.exception.line, cm.exception.path), (3003, 'amankan\tVB\textra', gz_path))
+        finally:
+            shutil.rmtree(tempdir)
+
+    def test_stats(self):
+        doc = itc('data/test.tsv')
+        info = corpus_stats(iter_sentences('data/test.tsv'))
+        self.assertEqual(info, corpus_stats(doc))
+        self.assertEqual(info.sentence_count, 24)
+        self.assertEqual(info.token_count, len(doc.words))
+        self.assertEqual(info.lexicon_size, len(doc.word_list()))
+        self.assertEqual(info.pos_list, doc.pos_list())
+
+class TestCompactDocument(unittest.TestCase):
+
+    def test_compact_doc(self):
+        doc = itc('data/test.tsv')
+        cdoc = itc('data/test.tsv', compact=True)
+        self.assertIsInstance(cdoc, CompactDocument)
+        self.assertEqual(len(cdoc), 24)
+        self.assertEqual(len(cdoc.words), len(doc.words))
+        self.assertEqual([str(x) for x in cdoc], [str(x) for x in doc])
+        self.assertEqual([x.pos() for x in cdoc], [x.pos() for x in doc])
+        self.assertEqual(cdoc.text(), doc.text())
+        self.assertEqual(cdoc.lexicon, doc.lexicon)
+        self.assertEqual(cdoc.pos, doc.pos)
+        self.assertEqual(cdoc.word_list(), doc.word_list())
+        self.assertEqual(cdoc.pos_list(), doc.pos_list())
+        self.assertEqual(str(cdoc.words[-1]), str(doc.words[-1]))
+        self.assertEqual(cdoc.words[-1].sentence, cdoc[-1])
+
+    def test_compact_find(self):
+        doc = itc('data/test.tsv')
+        cdoc = CompactDocument.from_sentences(doc)
+        self.assertEqual([str(w) for w in cdoc.find_word('mem.+')], [str(w) for w in doc.find_word('mem.+')])
+        self.assertEqual(len(cdoc.find_word('monyet', case_sensitive=False)), len(doc.find_word('monyet', case_sensitive=False)))
+        self.assertEqual(set(str(x) for x in cdoc.find('monyet')), set(str(x) for x in doc.find('monyet')))
+
+    def test_compact_new_word(self):
+        cdoc = CompactDocument()
+        sent = cdoc.new_sentence()
+        sent.new_word('Kera', 'NN')
+        sent.new_word('untuk', 'SC')
+        self.assertEqual(str(sent), 'Kera/NN untuk/SC')
+        self.assertEqual(cdoc.lexicon['kera'], {'NN'})
+        cdoc.new_sentence().new_word('Kera', 'NNP')
+        self.assertEqual(cdoc.lexicon['kera'], {'NN', 'NNP'})
+        self.assertEqual(len(cdoc.vocab), 2)
+        self.assertRaises(ValueError, sent.new_word, 'amankan', 'VB')
+        self.assertEqual(str(cdoc.to_document()[1]), 'Kera/NNP')
+
+
+class TestDocumentView(unittest.TestCase):
+
+    def test_find_view(self):
+        doc = itc('data/test.tsv', cache=False)
+        found = doc.find('monyet$')
+        self.assertIsInstance(found, DocumentView)
+        expected = [sent for sent in doc if any(w.text == 'monyet' for w in sent)]
+        self.assertEqual(found.sentences, expected)
+        self.assertEqual(len(found.words), sum(len(x) for x in expected))
+        self.assertEqual(found.lexicon, Document(expected).lexicon)
+        self.assertEqual(found.pos_list(), Document(expected).pos_list())
+
+    def test_chained_find(self):
+        for use_index in (False, True):
+            doc = itc('data/test.tsv', cache=False)
+            chained = doc.find('monyet$', use_index=use_index).find('di$', use_index=use_index)
+            expected = [sent for sent in doc if 'monyet' in sent.text().split() and 'di' in sent.text().split()]
+            self.assertEqual(chained.sentences, expected)
+            self.assertIs(chained.parent, doc)
+            words = doc.find('monyet$', use_index=use_index).find_word('di$', use_index=use_index)
+            self.assertEqual(len(words), sum(w.text == 'di' for sent in expected for w in sent))
+
+    def test_set_algebra(self):
+        doc = itc('data/test.tsv')
+        monyet = doc.find('monyet')
+        di = doc.find('di')
+        self.assertEqual(list((monyet & di).ids), sorted(set(monyet.ids) & set(di.ids)))
+        self.assertEqual(list((monyet | di).ids), sorted(set(monyet.ids) | set(di.ids)))
+        self.assertEqual(list((monyet - di).ids), sorted(set(monyet.ids) - set(di.ids)))
+        self.assertEqual(len(~monyet) + len(monyet), len(doc))
+        self.assertRaises(ValueError, lambda: monyet & itc('data/test.tsv', cache=False).find('di'))
+
+
 class TestWord(unittest.TestCase):
 
     def test_word_comparison(self):
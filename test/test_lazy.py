@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+Script for testing ITCtk lazy values
+Latest version can be found at https://github.com/neocl/itctk
+
+References:
+    Python documentation:
+        https://docs.python.org/
+    Python unittest
+        https://docs.python.org/3/library/unittest.html
+    --
+    argparse module:
+        https://docs.python.org/3/howto/argparse.html
+    PEP 257 - Python Docstring Conventions:
+        https://www.python.org/dev/peps/pep-0257/
+
+@author: Le Tuan Anh <tuananh.ke@gmail.com>
+'''
+
+# Copyright (c) 2016, Le Tuan Anh <tuananh.ke@gmail.com>
+#
+#Permission is hereby granted, free of charge, to any person obtaining a copy
+#of this software and associated documentation files (the "Software"), to deal
+#in the Software without restriction, including without limitation the rights
+#to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#copies of the Software, and to permit persons to whom the Software is
+#furnished to do so, subject to the following conditions:
+#
+#The above copyright notice and this permission notice shall be included in
+#all copies or substantial portions of the Software.
+#
+#THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#THE SOFTWARE.
+
+__author__ = "Le Tuan Anh <tuananh.ke@gmail.com>"
+__copyright__ = "Copyright 2016, itctk"
+__credits__ = [ "Le Tuan Anh" ]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "Le Tuan Anh"
+__email__ = "<tuananh.ke@gmail.com>"
+__status__ = "Prototype"
+
+########################################################################
+
+import threading
+import unittest
+from itctk import itc, Document
+from itctk.lazy import Lazy, resolve
+
+########################################################################
+
+TEST_FILE = 'data/test.tsv'
+
+
+class TestLazy(unittest.TestCase):
+
+    def test_background(self):
+        release = threading.Event()
+        loaded = []
+
+        def load():
+            release.wait(5)
+            return itc(TEST_FILE, cache=False)
+        doc = Lazy(load, 'ITC', loaded.append).start()
+        self.assertFalse(doc.ready)
+        self.assertIn('loading', repr(doc))
+        self.assertRaises(TimeoutError, doc.result, 0.01)
+        release.set()
+        self.assertEqual(len(doc), 24)
+        self.assertTrue(doc.ready)
+        self.assertEqual(len(doc.find('kita')), len(resolve(doc).find('kita')))
+        self.assertEqual(str(doc[0]), str(resolve(doc)[0]))
+        self.assertIsInstance(resolve(doc), Document)
+        self.assertEqual(loaded, [resolve(doc)])
+
+    def test_not_started(self):
+        calls = []
+        value = Lazy(lambda: calls.append(1) or {'a': 1})
+        self.assertEqual(calls, [])
+        self.assertIn('a', value)
+        self.assertEqual(value['a'], 1)
+        self.assertEqual(calls, [1])
+        self.assertEqual(resolve(3), 3)
+
+    def test_error(self):
+        def load():
+            raise IOError("missing corpus")
+        value = Lazy(load, 'ITC').start()
+        self.assertRaises(IOError, len, value)
+        self.assertRaises(IOError, getattr, value, 'sentences')
+        self.assertIn('failed', repr(value))
+
+
+########################################################################
+
+def main():
+    unittest.main()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+Script for testing ITCtk multiword expression matcher
+Latest version can be found at https://github.com/neocl/itctk
+
+References:
+    Python documentation:
+        https://docs.python.org/
+    Python unittest
+        https://docs.python.org/3/library/unittest.html
+    --
+    argparse module:
+        https://docs.python.org/3/howto/argparse.html
+    PEP 257 - Python Docstring Conventions:
+        https://www.python.org/dev/peps/pep-0257/
+
+@author: Le Tuan Anh <tuananh.ke@gmail.com>
+'''
+
+# Copyright (c) 2016, Le Tuan Anh <tuananh.ke@gmail.com>
+#
+#Permission is hereby granted, free of charge, to any person obtaining a copy
+#of this software and associated documentation files (the "Software"), to deal
+#in the Software without restriction, including without limitation the rights
+#to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#copies of the Software, and to permit persons to whom the Software is
+#furnished to do so, subject to the following conditions:
+#
+#The above copyright notice and this permission notice shall be included in
+#all copies or substantial portions of the Software.
+#
+#THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#THE SOFTWARE.
+
+__author__ = "Le Tuan Anh <tuananh.ke@gmail.com>"
+__copyright__ = "Copyright 2016, itctk"
+__credits__ = [ "Le Tuan Anh" ]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "Le Tuan Anh"
+__email__ = "<tuananh.ke@gmail.com>"
+__status__ = "Prototype"
+
+########################################################################
+
+
+import unittest
+from itctk import itc
+from itctk.mwe import MWEMatcher, MWEMatch, IN_FLIGHT_PER_WORKER
+
+########################################################################
+
+TEST_FILE = 'data/test.tsv'
+TEXT = "Menurut Kantor Berita, perdana menteri makan malam di Pesta Olahraga."
+
+
+class TestMWEMatcher(unittest.TestCase):
+
+    def test_leftmost_longest(self):
+        matcher = MWEMatcher([('a b c', ['X']), ('b c d e', ['Y']), ('b', ['Z']), ('c d', ['W'])])
+        self.assertEqual(len(matcher), 4)
+        self.assertEqual(matcher.match_tokens('a b c d e'.split()), [MWEMatch(0, 3, 'a b c', ('X',))])
+        self.assertEqual(matcher.match_tokens('x B c d e'.split()), [MWEMatch(1, 5, 'b c d e', ('Y',))])
+        self.assertEqual(matcher.match_tokens('b c d'.split()), [MWEMatch(0, 1, 'b', ('Z',)), MWEMatch(1, 3, 'c d', ('W',))])
+        self.assertEqual(matcher.match_tokens([]), [])
+        # entries can be added after matching
+        matcher.add('c d e f', ['V'])
+        self.assertEqual(matcher.match_tokens('b c d e f'.split()), [MWEMatch(0, 4, 'b c d e', ('Y',))])
+        self.assertEqual(matcher.match_tokens('x c d e f'.split()), [MWEMatch(1, 5, 'c d e f', ('V',))])
+
+    def test_document_matcher(self):
+        doc = itc(TEST_FILE, cache=False)
+        matcher = MWEMatcher.from_document(doc, min_tokens=2)
+        matches = matcher.match_text(TEXT)
+        self.assertEqual([m.text for m in matches], ['kantor berita', 'perdana menteri', 'makan malam', 'pesta olahraga'])
+        self.assertEqual(matches[-1].pos, ('NN', 'NNP'))
+        self.assertEqual(TEXT[matches[0].start:matches[0].end], 'Kantor Berita')
+        units = MWEMatcher.from_document(doc).segment(TEXT)
+        self.assertEqual(units, ['Menurut', 'Kantor Berita', ',', 'perdana menteri', 'makan malam', 'di', 'Pesta Olahraga', '.'])
+
+    def test_match_lines(self):
+        doc = itc(TEST_FILE, cache=False)
+        matcher = MWEMatcher.from_document(doc, min_tokens=2)
+        lines = [sent.text() for sent in doc]
+        expected = [matcher.match_text(line) for line in lines]
+        self.assertEqual(list(matcher.match_lines(lines)), expected)
+        self.assertEqual(list(matcher.match_lines(iter(lines), workers=2, batch_size=5)), expected)
+        # the input is read as a stream, only a bounded number of batches is submitted ahead
+        consumed = []
+
+        def stream():
+            for line in lines * 50:
+                consumed.append(line)
+                yield line
+        results = matcher.match_lines(stream(), workers=2, batch_size=5)
+        self.assertEqual(next(results), expected[0])
+        self.assertLessEqual(len(consumed), 2 * IN_FLIGHT_PER_WORKER * 5)
+        self.assertEqual(len(list(results)), len(lines) * 50 - 1)
+
+
+########################################################################
+
+def main():
+    unittest.main()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+Script for testing ITCtk parallel parser
+Latest version can be found at https://github.com/neocl/itctk
+
+References:
+    Python documentation:
+        https://docs.python.org/
+    Python unittest
+        https://docs.python.org/3/library/unittest.html
+    --
+    argparse module:
+        https://docs.python.org/3/howto/argparse.html
+    PEP 257 - Python Docstring Conventions:
+        https://www.python.org/dev/peps/pep-0257/
+
+@author: Le Tuan Anh <tuananh.ke@gmail.com>
+'''
+
+# Copyright (c) 2016, Le Tuan Anh <tuananh.ke@gmail.com>
+#
+#Permission is hereby granted, free of charge, to any person obtaining a copy
+#of this software and associated documentation files (the "Software"), to deal
+#in the Software without restriction, including without limitation the rights
+#to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#copies of the Software, and to permit persons to whom the Software is
+#furnished to do so, subject to the following conditions:
+#
+#The above copyright notice and this permission notice shall be included in
+#all copies or substantial portions of the Software.
+#
+#THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#THE SOFTWARE.
+
+__author__ = "Le Tuan Anh <tuananh.ke@gmail.com>"
+__copyright__ = "Copyright 2016, itctk"
+__credits__ = [ "Le Tuan Anh" ]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "Le Tuan Anh"
+__email__ = "<tuananh.ke@gmail.com>"
+__status__ = "Prototype"
+
+########################################################################
+
+import os
+import bz2
+import gzip
+import lzma
+import shutil
+import tempfile
+import unittest
+from itctk import parse_data, itc, iter_sentences, ParseError, PosMatcher, CorpusSearcher, CompactDocument
+from itctk.cache import cache_path
+from itctk.parallel import split_ranges, ShardedExecutor
+
+########################################################################
+
+TEST_FILE = 'data/test.tsv'
+
+
+class TestParallelParser(unittest.TestCase):
+
+    def test_split_ranges(self):
+        with open(TEST_FILE, 'rb') as infile:
+            content = infile.read()
+        for parts in (1, 2, 5, 100):
+            ranges = split_ranges(TEST_FILE, parts)
+            self.assertLessEqual(len(ranges), parts)
+            self.assertEqual(ranges[0][0], 0)
+            self.assertEqual(ranges[-1][1], len(content))
+            for (_, end), (start, _) in zip(ranges, ranges[1:]):
+                self.assertEqual(end, start)
+                self.assertEqual(content[end - 2:end], b'\n\n')
+
+    def test_parallel_parse(self):
+        serial = parse_data(TEST_FILE, compact=True)
+        parallel = parse_data(TEST_FILE, compact=True, workers=3)
+        self.assertEqual(list(parallel.vocab), list(serial.vocab))
+        self.assertEqual(list(parallel.tagset), list(serial.tagset))
+        self.assertEqual(parallel.token_ids, serial.token_ids)
+        self.assertEqual(parallel.pos_ids, serial.pos_ids)
+        self.assertEqual(parallel.offsets, serial.offsets)
+
+    def test_parallel_document(self):
+        serial = parse_data(TEST_FILE)
+        doc = parse_data(TEST_FILE, workers=2)
+        self.assertEqual([str(x) for x in doc], [str(x) for x in serial])
+        self.assertEqual(doc.lexicon, serial.lexicon)
+        self.assertEqual(doc.pos, serial.pos)
+
+
+class TestMultiFileInput(unittest.TestCase):
+
+    def setUp(self):
+        # split the test corpus into three (compressed) shards
+        self.tmpdir = tempfile.mkdtemp()
+        with open(TEST_FILE, 'rb') as infile:
+            blocks = infile.read().rstrip(b'\n').split(b'\n\n')
+        self.paths = []
+        for name, opener, part in (('a.tsv', open, blocks[:8]), ('b.tsv.gz', gzip.open, blocks[8:16]),
+                                   ('c.tsv.bz2', bz2.open, blocks[16:20]), ('d.tsv.xz', lzma.open, blocks[20:])):
+            path = os.path.join(self.tmpdir, name)
+            with opener(path, 'wb') as outfile:
+                outfile.write(b'\n\n'.join(part) + b'\n')
+            self.paths.append(path)
+        with open(os.path.join(self.tmpdir, 'README'), 'w') as outfile:
+            outfile.write('not a corpus file')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_directory(self):
+        serial = parse_data(TEST_FILE)
+        for workers in (1, 3):
+            doc = parse_data(self.tmpdir, workers=workers)
+            self.assertEqual([str(x) for x in doc], [str(x) for x in serial])
+            self.assertEqual([shard[1:] for shard in doc.shards], [(0, 8), (8, 16), (16, 20), (20, 24)])
+            self.assertEqual([shard[0] for shard in doc.shards], self.paths)
+            self.assertEqual(doc.shard_of(9), self.paths[1])
+            self.assertIsNone(doc.shard_of(24))
+        compact = parse_data(self.tmpdir, compact=True)
+        self.assertEqual(compact.token_ids, parse_data(TEST_FILE, compact=True).token_ids)
+
+    def test_directory_cache_and_engine(self):
+        serial = parse_data(TEST_FILE, compact=True)
+        for workers in (1, 3):
+            doc = parse_data(self.tmpdir, compact=True, cache=True, workers=workers, engine='fast')
+            self.assertTrue(all(os.path.isfile(cache_path(path)) for path in self.paths))
+            self.assertEqual(doc.token_ids, serial.token_ids)
+            self.assertEqual([shard[1:] for shard in doc.shards], [(0, 8), (8, 16), (16, 20), (20, 24)])
+        # a directory gives the same type as a single file
+        self.assertIsInstance(itc(self.tmpdir, compact=True), CompactDocument)
+        self.assertIsInstance(itc(self.paths[0], compact=True), CompactDocument)
+        doc = itc(self.tmpdir)
+        self.assertNotIsInstance(doc, CompactDocument)
+        self.assertNotIsInstance(itc(self.paths[0]), CompactDocument)
+        self.assertEqual([str(x) for x in doc], [str(x) for x in serial])
+        self.assertEqual(doc.shard_of(9), self.paths[1])
+        self.assertRaises(ValueError, parse_data, self.tmpdir, engine='turbo')
+
+    def test_glob_and_compressed(self):
+        doc = itc(os.path.join(self.tmpdir, '*.tsv.*'), cache=False)
+        self.assertEqual(len(doc), 16)
+        self.assertEqual(len(itc(self.paths[1])), 8)
+        self.assertEqual(len(parse_data(self.paths[3], workers=2, engine='fast')), 4)
+        self.assertEqual(sum(1 for _ in iter_sentences(self.tmpdir)), 24)
+        self.assertRaises(FileNotFoundError, parse_data, os.path.join(self.tmpdir, '*.conll'))
+
+    def test_parse_error(self):
+        with gzip.open(os.path.join(self.tmpdir, 'e.tsv.gz'), 'wb') as outfile:
+            outfile.write(b'a\tNN\nb\tNN\tX\n')
+        with self.assertRaises(ParseError) as cm:
+            parse_data(self.tmpdir)
+        self.assertEqual((cm.exception.lineno, cm.exception.path), (2, os.path.join(self.tmpdir, 'e.tsv.gz')))
+
+
+class TestShardedExecutor(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.doc = parse_data(TEST_FILE)
+        cls.executor = ShardedExecutor(cls.doc, workers=3)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.executor.close()
+
+    def test_shards(self):
+        self.assertEqual(len(self.executor), 3)
+        shards = self.executor.shards
+        self.assertEqual(shards[0][0], 0)
+        self.assertEqual(shards[-1][1], len(self.doc))
+        for (_, end), (start, _) in zip(shards, shards[1:]):
+            self.assertEqual(end, start)
+
+    def test_find(self):
+        for text in ('^mem.+', 'monyet$', 'Aku'):
+            self.assertEqual(self.executor.find_word(text), self.doc.find_word(text))
+            self.assertEqual(self.executor.find_word(text, False), self.doc.find_word(text, False))
+            self.assertEqual(list(self.executor.find(text).ids), list(self.doc.find(text).ids))
+
+    def test_lookup(self):
+        searcher = CorpusSearcher(self.doc)
+        for pattern in (r'\w+/rb \w+/jj', r'monyet/nn', r'^\w+/nnp'):
+            self.assertEqual(list(self.executor.lookup(pattern).ids), searcher.search(pattern))
+            self.assertEqual(self.executor.lookup_hits(pattern), list(searcher.finditer(pattern)))
+
+    def test_lookup_c(self):
+        matcher = PosMatcher(self.doc)
+        for pattern in ('NN VB', 'JJ+ NN', 'PRP (MD|RB)? VB'):
+            self.assertEqual(list(self.executor.lookup_c(pattern).ids), matcher.search(pattern))
+        self.assertRaises(ValueError, self.executor.lookup_c, 'NN (')
+
+
+########################################################################
+
+def main():
+    unittest.main()
+
+if __name__ == "__main__":
+    main()
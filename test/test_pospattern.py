@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+Script for testing ITCtk POS pattern matcher
+Latest version can be found at https://github.com/neocl/itctk
+
+References:
+    Python documentation:
+        https://docs.python.org/
+    Python unittest
+        https://docs.python.org/3/library/unittest.html
+    --
+    argparse module:
+        https://docs.python.org/3/howto/argparse.html
+    PEP 257 - Python Docstring Conventions:
+        https://www.python.org/dev/peps/pep-0257/
+
+@author: Le Tuan Anh <tuananh.ke@gmail.com>
+'''
+
+# Copyright (c) 2016, Le Tuan Anh <tuananh.ke@gmail.com>
+#
+#Permission is hereby granted, free of charge, to any person obtaining a copy
+#of this software and associated documentation files (the "Software"), to deal
+#in the Software without restriction, including without limitation the rights
+#to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#copies of the Software, and to permit persons to whom the Software is
+#furnished to do so, subject to the following conditions:
+#
+#The above copyright notice and this permission notice shall be included in
+#all copies or substantial portions of the Software.
+#
+#THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#THE SOFTWARE.
+
+__author__ = "Le Tuan Anh <tuananh.ke@gmail.com>"
+__copyright__ = "Copyright 2016, itctk"
+__credits__ = [ "Le Tuan Anh" ]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "Le Tuan Anh"
+__email__ = "<tuananh.ke@gmail.com>"
+__status__ = "Prototype"
+
+########################################################################
+
+import re
+import unittest
+from itctk import itc, CompactDocument, POS_TAGSET
+from itctk.pospattern import PosMatcher, PosMatch, PosPatternError, compile_pos_pattern, tag_sequence
+from itctk.tagset import POS_TAGS, TAG_IDS, TAG_CLASSES, tag_id, tag_mask, mask_tags, class_mask
+
+########################################################################
+
+TEST_FILE = 'data/test.tsv'
+
+
+class TestPosPattern(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.doc = itc(TEST_FILE, cache=False)
+        cls.matcher = PosMatcher(cls.doc)
+
+    def check(self, pattern, regex):
+        expected = [sid for sid, sent in enumerate(self.doc) if re.search(regex, sent.pos())]
+        self.assertEqual(self.matcher.search(pattern), expected)
+
+    def test_sequences(self):
+        self.check('NN VB', r'(?<!\S)NN VB(?!\S)')
+        self.check('NEG _ VB', r'(?<!\S)NEG \S+ VB(?!\S)')
+        self.check('NEG \\w+ VB', r'(?<!\S)NEG \S+ VB(?!\S)')
+        self.check('(NN|NNP) IN', r'(?<!\S)(NN|NNP) IN(?!\S)')
+        self.check('NN+ SC VB', r'(?<!\S)(NN )+SC VB(?!\S)')
+        self.check('(NNP ){3}', r'(?<!\S)NNP NNP NNP(?!\S)')
+        self.check('VB (NN|JJ)* Z$', r'(?<!\S)VB( NN| JJ)* Z$')
+        self.check('^NNP{2,}', r'^NNP NNP(?!\S)')
+        self.check('CD NN | NEG', r'(?<!\S)(CD NN|NEG)(?!\S)')
+
+    def test_words(self):
+        sids = self.matcher.search('monyet/_ (untuk/SC|dan/CC)')
+        self.assertEqual(sids, [1, 3])
+        self.assertEqual(self.matcher.search('MONYET/NN'), self.matcher.search('monyet/NN'))
+        self.assertEqual(self.matcher.search('monyet/VB'), [])
+
+    def test_finditer(self):
+        matches = list(self.matcher.finditer('NN VB'))
+        self.assertIn(PosMatch(2, 1, 3), matches)
+        for m in matches:
+            self.assertEqual([w.pos for w in self.doc[m.sid][m.start:m.end]], ['NN', 'VB'])
+        matches = list(self.matcher.finditer('NNP+'))
+        self.assertEqual(matches[0], PosMatch(1, 0, 3))
+
+    def test_requirements(self):
+        pattern = compile_pos_pattern('NN+ SC? VB')
+        self.assertEqual(pattern.unigrams, {'NN', 'VB'})
+        self.assertEqual(pattern.bigrams, set())
+        pattern = compile_pos_pattern('(NNP ){12}')
+        self.assertEqual(pattern.bigrams, {('NNP', 'NNP')})
+
+    def test_invalid(self):
+        for pattern in ('NN.*', 'NN (VB', '*NN', 'NN{3,1}', 'NN ^ VB', '', '()', 'NN||VB', '^$', '@badclass', 'kita/@badclass'):
+            self.assertRaises(PosPatternError, compile_pos_pattern, pattern)
+        self.assertRaises(PosPatternError, self.matcher.search, '@badclass')
+        # tags match whole POS tags, NN does not match NNP
+        self.check('NN', r'(?<!\S)NN(?!\S)')
+
+    def test_tag_classes(self):
+        self.check('@nominal VB', r'(?<!\S)(NN|NNP|NND|PRP) VB(?!\S)')
+        self.check('^@Nominal', r'^(NN|NNP|NND|PRP)(?!\S)')
+        self.check('@function+ @punctuation$', r'(?<!\S)((CC|DT|IN|MD|NEG|PR|RP|SC|WH) )+(SYM|Z)$')
+        self.assertEqual(self.matcher.search('monyet/@noun'), self.matcher.search('monyet/NN'))
+        self.assertRaises(PosPatternError, compile_pos_pattern, '@nouns VB')
+
+    def test_bitmap(self):
+        # fixed-length tag sequences are matched with bitmaps, `_{0}` forces the DFA with the same semantics
+        for pattern in ('NN VB', '@nominal _ VB', '^NNP NNP', 'NN Z$', '^_$', '_ _ _ _ _ _', 'Z', 'NNP NNP NNP'):
+            self.assertIsNotNone(tag_sequence(compile_pos_pattern(pattern)))
+            if pattern.startswith('^'):
+                dfa_pattern = '^_{0} ' + pattern[1:]
+            else:
+                dfa_pattern = '_{0} ' + pattern
+            self.assertIsNone(tag_sequence(compile_pos_pattern(dfa_pattern)))
+            self.assertEqual(self.matcher.search(pattern), self.matcher.search(dfa_pattern))
+            self.assertEqual(list(self.matcher.finditer(pattern)), list(self.matcher.finditer(dfa_pattern)))
+        self.assertIsNone(tag_sequence(compile_pos_pattern('NN+ VB')))
+        self.assertIsNone(tag_sequence(compile_pos_pattern('kita/PRP VB')))
+
+    def test_bitmap_boundaries(self):
+        cdoc = CompactDocument()
+        cdoc.add_sentence([('a', 'NN'), ('b', 'NN')])
+        cdoc.new_sentence()
+        cdoc.add_sentence([('c', 'VB'), ('d', 'NN'), ('e', 'XX')])
+        matcher = PosMatcher(cdoc)
+        self.assertEqual(matcher.search('NN VB'), [])  # across sentences
+        self.assertEqual(list(matcher.finditer('NN')), [PosMatch(0, 0, 1), PosMatch(0, 1, 2), PosMatch(2, 1, 2)])
+        self.assertEqual(list(matcher.finditer('@noun @noun')), [PosMatch(0, 0, 2)])
+        self.assertEqual(matcher.search('_ _ _'), [2])
+        self.assertEqual(matcher.search('NN _$'), [0, 2])
+        self.assertEqual(matcher.search('NN XX'), [2])  # unknown tags use the DFA
+
+    def test_tagset(self):
+        self.assertEqual(len(set(POS_TAGS)), len(POS_TAGS))
+        self.assertEqual(set(POS_TAGS), set(POS_TAGSET))
+        self.assertEqual(tag_id('CC'), 0)
+        self.assertEqual(TAG_IDS['Z'], len(POS_TAGS) - 1)
+        self.assertEqual(mask_tags(TAG_CLASSES['nominal']), ['NN', 'NNP', 'NND', 'PRP'])
+        self.assertTrue(class_mask('nominal') & tag_mask('PRP'))
+        self.assertFalse(class_mask('nominal') & tag_mask(['VB', 'JJ']))
+        self.assertEqual(class_mask('vb'), tag_mask('VB'))
+        self.assertRaises(ValueError, tag_id, 'XX')
+        self.assertRaises(ValueError, class_mask, 'nouns')
+        # compact documents store the stable tag IDs, unknown tags come after POS_TAGS
+        cdoc = CompactDocument()
+        cdoc.add_sentence([('Kera', 'NN'), ('itu', 'XX'), ('.', 'Z')])
+        self.assertEqual(list(cdoc.pos_ids), [TAG_IDS['NN'], len(POS_TAGS), TAG_IDS['Z']])
+        self.assertEqual(cdoc.pos_list(), ['NN', 'XX', 'Z'])
+
+    def test_compact(self):
+        cdoc = itc(TEST_FILE, compact=True, cache=False)
+        self.assertEqual(PosMatcher(cdoc).search('NN+ SC VB'), self.matcher.search('NN+ SC VB'))
+        self.assertEqual(len(PosMatcher(cdoc).find('NEG _ VB')), 1)
+
+
+########################################################################
+
+def main():
+    unittest.main()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+Script for testing ITCtk profiling
+Latest version can be found at https://github.com/neocl/itctk
+
+References:
+    Python documentation:
+        https://docs.python.org/
+    Python unittest
+        https://docs.python.org/3/library/unittest.html
+    --
+    argparse module:
+        https://docs.python.org/3/howto/argparse.html
+    PEP 257 - Python Docstring Conventions:
+        https://www.python.org/dev/peps/pep-0257/
+
+@author: Le Tuan Anh <tuananh.ke@gmail.com>
+'''
+
+# Copyright (c) 2016, Le Tuan Anh <tuananh.ke@gmail.com>
+#
+#Permission is hereby granted, free of charge, to any person obtaining a copy
+#of this software and associated documentation files (the "Software"), to deal
+#in the Software without restriction, including without limitation the rights
+#to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#copies of the Software, and to permit persons to whom the Software is
+#furnished to do so, subject to the following conditions:
+#
+#The above copyright notice and this permission notice shall be included in
+#all copies or substantial portions of the Software.
+#
+#THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#THE SOFTWARE.
+
+__author__ = "Le Tuan Anh <tuananh.ke@gmail.com>"
+__copyright__ = "Copyright 2016, itctk"
+__credits__ = [ "Le Tuan Anh" ]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "Le Tuan Anh"
+__email__ = "<tuananh.ke@gmail.com>"
+__status__ = "Prototype"
+
+########################################################################
+
+import os
+import shutil
+import tempfile
+import unittest
+import itctk
+from itctk import Document, CompactDocument
+from itctk import export, profiling
+
+########################################################################
+
+TEST_FILE = 'data/test.tsv'
+
+
+class TestProfiling(unittest.TestCase):
+
+    def setUp(self):
+        profiling.reset()
+
+    def tearDown(self):
+        profiling.disable()
+        profiling.reset()
+
+    def test_disabled(self):
+        original = CompactDocument.find_word
+        itctk.parse_data(TEST_FILE, compact=True).find_word('kita')
+        self.assertEqual(profiling.snapshot(), {})
+        self.assertFalse(profiling.is_enabled())
+        # nothing is wrapped when profiling is off
+        self.assertIs(CompactDocument.find_word, original)
+        self.assertIs(itctk.parse_data, itctk.itctk.parse_data)
+
+    def test_enable_disable(self):
+        original = (Document.find, itctk.parse_data)
+        profiling.enable()
+        profiling.enable()
+        self.assertTrue(profiling.is_enabled())
+        self.assertIsNot(Document.find, original[0])
+        self.assertIsNot(itctk.parse_data, original[1])
+        self.assertIs(itctk.parse_data, itctk.itctk.parse_data)
+        profiling.disable()
+        self.assertEqual((Document.find, itctk.parse_data), original)
+
+    def test_snapshot(self):
+        profiling.enable()
+        doc = itctk.parse_data(TEST_FILE, compact=True)
+        doc.find_word('kita')
+        doc.find_word('kita')
+        profiling.disable()
+        doc.find_word('aku')
+        stats = profiling.snapshot()
+        tokens = len(doc.token_ids)
+        self.assertEqual(stats['parse_data']['calls'], 1)
+        self.assertEqual(stats['parse_data']['tokens'], tokens)
+        self.assertGreater(stats['parse_data']['bytes'], 0)
+        self.assertEqual(stats['CompactDocument.add_sentence']['calls'], len(doc))
+        self.assertEqual(stats['CompactDocument.add_sentence']['tokens'], tokens)
+        self.assertEqual(stats['CompactDocument.find_word']['calls'], 2)
+        self.assertEqual(stats['CompactDocument.find_word']['tokens'], 2 * tokens)
+        self.assertEqual(set(stats['parse_data']), set(profiling.FIELDS))
+        self.assertGreaterEqual(stats['parse_data']['seconds'], stats['CompactDocument.add_sentence']['seconds'])
+        self.assertIn('CompactDocument.find_word', profiling.report())
+
+    def test_document_and_results(self):
+        expected = itctk.parse_data(TEST_FILE).find('kita')
+        profiling.enable()
+        doc = itctk.parse_data(TEST_FILE)
+        sents = doc.find('kita')
+        self.assertEqual([str(s) for s in sents], [str(s) for s in expected])
+        stats = profiling.snapshot()
+        # the parser builds the document in bulk, add_word() is only used when the document is edited
+        self.assertNotIn('Document.add_word', stats)
+        self.assertEqual(stats['parse_data']['tokens'], len(doc.words))
+        self.assertEqual(stats['Document.find']['tokens'], len(doc.words))
+        doc.new_sentence().new_word('Kera', 'NN')
+        self.assertEqual(profiling.snapshot()['Document.add_word']['calls'], 1)
+
+    def test_keyword_arguments_and_export(self):
+        profiling.enable()
+        doc = itctk.parse_data(datafile_path=TEST_FILE, compact=True)
+        tempdir = tempfile.mkdtemp()
+        try:
+            export.export_file(TEST_FILE, {'nltk': os.path.join(tempdir, 'itc.txt')})
+        finally:
+            shutil.rmtree(tempdir)
+        stats = profiling.snapshot()
+        self.assertEqual(stats['parse_data']['bytes'], os.path.getsize(TEST_FILE))
+        self.assertEqual(stats['export_file']['calls'], 1)
+        self.assertEqual(stats['export_file']['tokens'], len(doc.token_ids))
+        self.assertEqual(stats['export_file']['bytes'], os.path.getsize(TEST_FILE))
+
+    def test_section(self):
+        with profiling.section('skipped'):
+            pass
+        profiling.enable()
+        with profiling.section('step', nbytes=10) as sec:
+            sec.tokens += 5
+        stats = profiling.snapshot()
+        self.assertNotIn('skipped', stats)
+        self.assertEqual((stats['step']['calls'], stats['step']['tokens'], stats['step']['bytes']), (1, 5, 10))
+
+
+########################################################################
+
+def main():
+    unittest.main()
+
+
+if __name__ == "__main__":
+    main()
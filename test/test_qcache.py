@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+Script for testing ITCtk query cache
+Latest version can be found at https://github.com/neocl/itctk
+
+References:
+    Python documentation:
+        https://docs.python.org/
+    Python unittest
+        https://docs.python.org/3/library/unittest.html
+    --
+    argparse module:
+        https://docs.python.org/3/howto/argparse.html
+    PEP 257 - Python Docstring Conventions:
+        https://www.python.org/dev/peps/pep-0257/
+
+@author: Le Tuan Anh <tuananh.ke@gmail.com>
+'''
+
+# Copyright (c) 2016, Le Tuan Anh <tuananh.ke@gmail.com>
+#
+#Permission is hereby granted, free of charge, to any person obtaining a copy
+#of this software and associated documentation files (the "Software"), to deal
+#in the Software without restriction, including without limitation the rights
+#to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#copies of the Software, and to permit persons to whom the Software is
+#furnished to do so, subject to the following conditions:
+#
+#The above copyright notice and this permission notice shall be included in
+#all copies or substantial portions of the Software.
+#
+#THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#THE SOFTWARE.
+
+__author__ = "Le Tuan Anh <tuananh.ke@gmail.com>"
+__copyright__ = "Copyright 2016, itctk"
+__credits__ = [ "Le Tuan Anh" ]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "Le Tuan Anh"
+__email__ = "<tuananh.ke@gmail.com>"
+__status__ = "Prototype"
+
+########################################################################
+
+import sys
+import unittest
+from array import array
+from itctk import itc, DocumentView, SearchHit
+from itctk.qcache import QueryCache, estimate_size
+
+########################################################################
+
+TEST_FILE = 'data/test.tsv'
+
+
+class TestQueryCache(unittest.TestCase):
+
+    def test_lru_entries(self):
+        cache = QueryCache(max_entries=2)
+        cache.put('a', [1])
+        cache.put('b', [2])
+        self.assertEqual(cache.get('a'), [1])  # a is now the most recently used
+        cache.put('c', [3])
+        self.assertNotIn('b', cache)
+        self.assertIn('a', cache)
+        info = cache.info()
+        self.assertEqual((info.hits, info.misses, info.evictions, info.entries), (1, 0, 1, 2))
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.info().misses, 1)
+
+    def test_lru_bytes(self):
+        cache = QueryCache(max_entries=100, max_bytes=1000)
+        cache.put('small', [1])
+        cache.put('big', list(range(1000)))  # larger than the whole cache
+        self.assertNotIn('big', cache)
+        for i in range(20):
+            cache.put(i, array('I', range(50)))
+        self.assertLessEqual(cache.info().bytes, 1000)
+        self.assertNotIn('small', cache)
+
+    def test_estimate_size(self):
+        hits = [SearchHit(100000 + i, 1000, 1002, 'lebih/rb kecil/jj %s' % i) for i in range(100)]
+        self.assertGreater(estimate_size(hits), sum(len(hit.text) for hit in hits) + sys.getsizeof(hits))
+        self.assertGreater(estimate_size(DocumentView(itc(TEST_FILE, cache=False))), sys.getsizeof(array('I', range(24))))
+
+    def test_document_cache(self):
+        doc = itc(TEST_FILE, cache=False)
+        doc.enable_query_cache()
+        first = doc.find('monyet$')
+        self.assertEqual(doc.find('monyet$').ids, first.ids)
+        # callers get their own view, the words they compute are not kept in the cache
+        first.words
+        (cached, size), = doc.query_cache.entries.values()
+        self.assertIsNot(cached, first)
+        self.assertIsNone(cached._words)
+        self.assertEqual(size, estimate_size(cached))
+        self.assertIsNot(doc.find('monyet$', case_sensitive=False), first)
+        self.assertEqual(len(doc.find_word('mem.+')), 7)
+        self.assertEqual(len(doc.find_word('mem.+')), 7)
+        info = doc.query_cache.info()
+        self.assertEqual((info.hits, info.misses), (2, 3))
+        self.assertEqual(info.entries, 3)
+        # mutation clears the cache
+        doc.new_sentence().new_word('monyet', 'NN')
+        self.assertEqual(len(doc.query_cache), 0)
+        self.assertEqual(len(doc.find('monyet$')), len(first) + 1)
+
+    def test_compact_cache(self):
+        doc = itc(TEST_FILE, compact=True, cache=False)
+        doc.enable_query_cache(max_entries=10)
+        found = doc.cached_query('lookup', 'kera', 0, lambda: DocumentView(doc, [0]))
+        self.assertEqual(doc.cached_query('lookup', 'kera', 0, lambda: None).ids, found.ids)
+        doc.new_sentence().new_word('Kera', 'NN')
+        self.assertIsNone(doc.cached_query('lookup', 'kera', 0, lambda: None))
+
+
+########################################################################
+
+def main():
+    unittest.main()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+Script for testing ITCtk corpus searcher
+Latest version can be found at https://github.com/neocl/itctk
+
+References:
+    Python documentation:
+        https://docs.python.org/
+    Python unittest
+        https://docs.python.org/3/library/unittest.html
+    --
+    argparse module:
+        https://docs.python.org/3/howto/argparse.html
+    PEP 257 - Python Docstring Conventions:
+        https://www.python.org/dev/peps/pep-0257/
+
+@author: Le Tuan Anh <tuananh.ke@gmail.com>
+'''
+
+# Copyright (c) 2016, Le Tuan Anh <tuananh.ke@gmail.com>
+#
+#Permission is hereby granted, free of charge, to any person obtaining a copy
+#of this software and associated documentation files (the "Software"), to deal
+#in the Software without restriction, including without limitation the rights
+#to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#copies of the Software, and to permit persons to whom the Software is
+#furnished to do so, subject to the following conditions:
+#
+#The above copyright notice and this permission notice shall be included in
+#all copies or substantial portions of the Software.
+#
+#THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#THE SOFTWARE.
+
+__author__ = "Le Tuan Anh <tuananh.ke@gmail.com>"
+__copyright__ = "Copyright 2016, itctk"
+__credits__ = [ "Le Tuan Anh" ]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "Le Tuan Anh"
+__email__ = "<tuananh.ke@gmail.com>"
+__status__ = "Prototype"
+
+########################################################################
+
+import os
+import re
+import shutil
+import tempfile
+import unittest
+from itctk import itc
+from itctk.search import CorpusSearcher, SearchHit
+
+########################################################################
+
+TEST_FILE = 'data/test.tsv'
+PATTERNS = [r'monyet/nn', r'\w+/rb \w+/jj', r'^\w+/nnp', r'/z$', r'di/in\s+\w+/nn', r'\./z\n\w', r'kecil/jj \./z']
+
+
+class TestCorpusSearcher(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.doc = itc(TEST_FILE, cache=False)
+
+    def check(self, searcher):
+        for pattern_text in PATTERNS:
+            pattern = re.compile(pattern_text)
+            expected = [sid for sid, sent in enumerate(self.doc) if pattern.search(str(sent).lower())]
+            self.assertEqual(searcher.search(pattern_text), expected)
+            expected_hits = [(sid, m.start(), m.end(), m.group()) for sid, sent in enumerate(self.doc)
+                             for m in pattern.finditer(str(sent).lower())]
+            self.assertEqual([tuple(h) for h in searcher.finditer(pattern_text)], expected_hits)
+
+    def test_memory_buffer(self):
+        self.check(CorpusSearcher(self.doc))
+
+    def test_mmap_buffer(self):
+        tempdir = tempfile.mkdtemp()
+        try:
+            self.check(CorpusSearcher(self.doc, path=os.path.join(tempdir, 'itc.txt')))
+        finally:
+            shutil.rmtree(tempdir)
+
+    def test_compact_doc(self):
+        cdoc = itc(TEST_FILE, compact=True, cache=False)
+        self.assertEqual(CorpusSearcher(cdoc).buffer, CorpusSearcher(self.doc).buffer)
+
+    def test_find(self):
+        searcher = CorpusSearcher(self.doc)
+        sents = searcher.find(r'lebih/rb \w+/jj')
+        self.assertEqual(len(sents), 1)
+        hit = next(searcher.finditer(r'lebih/rb \w+/jj'))
+        self.assertEqual(hit, SearchHit(1, hit.start, hit.end, 'lebih/rb kecil/jj'))
+        self.assertEqual(str(self.doc[1]).lower()[hit.start:hit.end], hit.text)
+
+
+########################################################################
+
+def main():
+    unittest.main()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+Script for testing ITCtk sentiment scores
+Latest version can be found at https://github.com/neocl/itctk
+
+References:
+    Python documentation:
+        https://docs.python.org/
+    Python unittest
+        https://docs.python.org/3/library/unittest.html
+    --
+    argparse module:
+        https://docs.python.org/3/howto/argparse.html
+    PEP 257 - Python Docstring Conventions:
+        https://www.python.org/dev/peps/pep-0257/
+
+@author: Le Tuan Anh <tuananh.ke@gmail.com>
+'''
+
+# Copyright (c) 2016, Le Tuan Anh <tuananh.ke@gmail.com>
+#
+#Permission is hereby granted, free of charge, to any person obtaining a copy
+#of this software and associated documentation files (the "Software"), to deal
+#in the Software without restriction, including without limitation the rights
+#to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#copies of the Software, and to permit persons to whom the Software is
+#furnished to do so, subject to the following conditions:
+#
+#The above copyright notice and this permission notice shall be included in
+#all copies or substantial portions of the Software.
+#
+#THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#THE SOFTWARE.
+
+__author__ = "Le Tuan Anh <tuananh.ke@gmail.com>"
+__copyright__ = "Copyright 2016, itctk"
+__credits__ = [ "Le Tuan Anh" ]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "Le Tuan Anh"
+__email__ = "<tuananh.ke@gmail.com>"
+__status__ = "Prototype"
+
+########################################################################
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from itctk import itc, parse_data
+from itctk import sentiment
+from itctk.sentiment import SentiLexicon, SenseScore, SentimentScorer, load_lexicon, lexicon_path, score_document
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+########################################################################
+
+TEST_FILE = 'data/test.tsv'
+BARASA_LINES = ['# synset\tlanguage\tgoodness\tlemma\tPosScore\tNegScore',
+                '00001740-a\tB\tY\tkecil\t0.0\t0.25',
+                '00002098-a\tB\tY\tkecil\t0.0\t0.75',
+                '00005205-a\tB\tM\tbesar\t0.5\t0.0',
+                '00006885-v\tI\tY\tmengusir\t0.125\t0.5',
+                '00007012-n\tB\tY\tpesta_olahraga\t0.625\t0.0']
+
+
+def score_loop(doc, lexicon, tags=None):
+    scores = []
+    for sent in doc:
+        positive = negative = 0.0
+        for word in sent:
+            if word.text.lower() in lexicon and (tags is None or word.pos in tags):
+                positive += lexicon[word.text].positive
+                negative += lexicon[word.text].negative
+        scores.append((positive, negative))
+    return scores
+
+
+class TestLexicon(unittest.TestCase):
+
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.source = os.path.join(self.tempdir, 'barasa.txt')
+        with open(self.source, 'w') as outfile:
+            outfile.write('\n'.join(BARASA_LINES) + '\n')
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def test_lexicon(self):
+        lexicon = SentiLexicon.from_barasa(self.source)
+        self.assertEqual(len(lexicon), 4)
+        self.assertEqual(lexicon['Kecil'], (0.0, 0.5, 0.5, 2))
+        self.assertIn('pesta olahraga', lexicon)
+        self.assertIsNone(lexicon.get('kita'))
+        self.assertEqual(lexicon.align(['BESAR', 'kita']).tolist(), [lexicon.ids['besar'], -1])
+
+    def test_cache(self):
+        lexicon = load_lexicon(self.source)
+        self.assertTrue(os.path.isfile(lexicon_path(self.source)))
+        cached = load_lexicon(self.source)
+        self.assertEqual(cached.lemmas, lexicon.lemmas)
+        self.assertEqual(cached.positive.tolist(), lexicon.positive.tolist())
+        self.assertEqual(cached['kecil'], lexicon['kecil'])
+        self.assertEqual(cached.synsets('kecil'), lexicon.synsets('kecil'))
+        # stale cache
+        with open(self.source, 'a') as outfile:
+            outfile.write('00008000-a\tB\tY\tbaik\t0.75\t0.0\n')
+        self.assertIn('baik', load_lexicon(self.source))
+        with open(self.source, 'a') as outfile:
+            outfile.write('broken line\n')
+        self.assertRaises(ValueError, load_lexicon, self.source)
+
+    def test_synsets(self):
+        lexicon = SentiLexicon.from_barasa(self.source)
+        self.assertEqual(lexicon.synsets('KECIL'), [SenseScore('00001740-a', 0.0, 0.25, 0.75), SenseScore('00002098-a', 0.0, 0.75, 0.25)])
+        self.assertEqual(lexicon.synsets('pesta olahraga'), [SenseScore('00007012-n', 0.625, 0.0, 0.375)])
+        self.assertRaises(KeyError, lexicon.synsets, 'kita')
+
+    def test_without_numpy(self):
+        with mock.patch.object(sentiment, 'np', None):
+            lexicon = load_lexicon(self.source)
+            self.assertEqual(load_lexicon(self.source)['besar'], (0.5, 0.0, 0.5, 1))
+            self.assertEqual(len(lexicon.synsets('mengusir')), 1)
+            self.assertRaises(ImportError, SentimentScorer, itc(TEST_FILE, cache=False), lexicon)
+
+
+@unittest.skipIf(numpy is None, "NumPy is not installed")
+class TestSentiment(unittest.TestCase):
+
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.source = os.path.join(self.tempdir, 'barasa.txt')
+        with open(self.source, 'w') as outfile:
+            outfile.write('\n'.join(BARASA_LINES) + '\n')
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def test_scores(self):
+        lexicon = SentiLexicon.from_barasa(self.source)
+        for doc in (itc(TEST_FILE, cache=False), parse_data(TEST_FILE, compact=True)):
+            for tags in (None, ('JJ',), ('JJ', 'NNP')):
+                scores = score_document(doc, lexicon, tags)
+                expected = score_loop(doc, lexicon, tags)
+                self.assertEqual(len(scores), len(doc))
+                self.assertTrue(numpy.allclose(scores.positive, [p for p, _ in expected]))
+                self.assertTrue(numpy.allclose(scores.negative, [n for _, n in expected]))
+        scores = score_document(doc, lexicon, 'JJ')
+        self.assertEqual(scores[1].matched, 1)
+        self.assertEqual(scores[1].tokens, len(doc[1]))
+        self.assertEqual(scores.document().matched, scores.matched.sum())
+        self.assertRaises(ValueError, score_document, doc, lexicon, 'ADJ')
+
+    def test_rank(self):
+        doc = itc(TEST_FILE, cache=False)
+        scores = SentimentScorer(doc, SentiLexicon.from_barasa(self.source)).score()
+        best = scores.rank(k=2)
+        self.assertEqual(best, sorted(range(len(doc)), key=lambda sid: -scores.polarity[sid])[:2])
+        worst = scores.rank(k=3, reverse=False)
+        self.assertEqual([sent for _, sent in scores.most_negative(3)], [doc[sid] for sid in worst])
+        self.assertEqual([value for value, _ in scores.most_negative(3)], [scores.polarity[sid] for sid in worst])
+        self.assertEqual(scores.most_positive(1), [(scores.polarity[best[0]], doc[best[0]])])
+        self.assertEqual(len(scores.rank('objective', normalize=True)), len(doc))
+        self.assertRaises(ValueError, scores.rank, 'neutral')
+
+
+########################################################################
+
+def main():
+    unittest.main()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+Script for testing ITCtk shared memory corpus
+Latest version can be found at https://github.com/neocl/itctk
+
+References:
+    Python documentation:
+        https://docs.python.org/
+    Python unittest
+        https://docs.python.org/3/library/unittest.html
+    --
+    argparse module:
+        https://docs.python.org/3/howto/argparse.html
+    PEP 257 - Python Docstring Conventions:
+        https://www.python.org/dev/peps/pep-0257/
+
+@author: Le Tuan Anh <tuananh.ke@gmail.com>
+'''
+
+# Copyright (c) 2016, Le Tuan Anh <tuananh.ke@gmail.com>
+#
+#Permission is hereby granted, free of charge, to any person obtaining a copy
+#of this software and associated documentation files (the "Software"), to deal
+#in the Software without restriction, including without limitation the rights
+#to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#copies of the Software, and to permit persons to whom the Software is
+#furnished to do so, subject to the following conditions:
+#
+#The above copyright notice and this permission notice shall be included in
+#all copies or substantial portions of the Software.
+#
+#THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#THE SOFTWARE.
+
+__author__ = "Le Tuan Anh <tuananh.ke@gmail.com>"
+__copyright__ = "Copyright 2016, itctk"
+__credits__ = [ "Le Tuan Anh" ]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "Le Tuan Anh"
+__email__ = "<tuananh.ke@gmail.com>"
+__status__ = "Prototype"
+
+########################################################################
+
+
+import unittest
+import multiprocessing
+from itctk import parse_data, itc
+from itctk.shared import SharedCorpus, publish, attach
+
+########################################################################
+
+TEST_FILE = 'data/test.tsv'
+
+
+def _child_summary(name, queue):
+    doc = attach(name)
+    queue.put((len(doc), str(doc[3]), [str(w) for w in doc.find_word('^mem.+')]))
+    doc.shared.close()
+
+
+class TestSharedCorpus(unittest.TestCase):
+
+    def test_publish_attach(self):
+        doc = parse_data(TEST_FILE)
+        with publish(doc) as corpus:
+            shared_doc = attach(corpus.name)
+            self.assertEqual([str(x) for x in shared_doc], [str(x) for x in doc])
+            self.assertIsInstance(shared_doc.token_ids, memoryview)
+            self.assertTrue(shared_doc.token_ids.readonly)
+            shared_doc.shared.close()
+            shared_doc = itc(shared=corpus.name)
+            self.assertEqual(len(shared_doc), len(doc))
+            shared_doc.shared.close()
+
+    def test_other_process(self):
+        doc = parse_data(TEST_FILE, compact=True)
+        with SharedCorpus.publish(doc) as corpus:
+            queue = multiprocessing.Queue()
+            child = multiprocessing.Process(target=_child_summary, args=(corpus.name, queue))
+            child.start()
+            size, sent, words = queue.get(timeout=30)
+            child.join()
+            self.assertEqual(size, len(doc))
+            self.assertEqual(sent, str(doc[3]))
+            self.assertEqual(words, [str(w) for w in doc.find_word('^mem.+')])
+            # the block is still there after the child exits
+            with SharedCorpus.attach(corpus.name) as other:
+                self.assertEqual(len(other.doc), len(doc))
+
+    def test_invalid_block(self):
+        from multiprocessing import shared_memory
+        shm = shared_memory.SharedMemory(create=True, size=64)
+        try:
+            self.assertRaises(ValueError, SharedCorpus.attach, shm.name)
+        finally:
+            shm.close()
+            shm.unlink()
+
+
+########################################################################
+
+def main():
+    unittest.main()
+
+if __name__ == "__main__":
+    main()
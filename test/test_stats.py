@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+Script for testing ITCtk corpus statistics
+Latest version can be found at https://github.com/neocl/itctk
+
+References:
+    Python documentation:
+        https://docs.python.org/
+    Python unittest
+        https://docs.python.org/3/library/unittest.html
+    --
+    argparse module:
+        https://docs.python.org/3/howto/argparse.html
+    PEP 257 - Python Docstring Conventions:
+        https://www.python.org/dev/peps/pep-0257/
+
+@author: Le Tuan Anh <tuananh.ke@gmail.com>
+'''
+
+# Copyright (c) 2016, Le Tuan Anh <tuananh.ke@gmail.com>
+#
+#Permission is hereby granted, free of charge, to any person obtaining a copy
+#of this software and associated documentation files (the "Software"), to deal
+#in the Software without restriction, including without limitation the rights
+#to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#copies of the Software, and to permit persons to whom the Software is
+#furnished to do so, subject to the following conditions:
+#
+#The above copyright notice and this permission notice shall be included in
+#all copies or substantial portions of the Software.
+#
+#THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#THE SOFTWARE.
+
+__author__ = "Le Tuan Anh <tuananh.ke@gmail.com>"
+__copyright__ = "Copyright 2016, itctk"
+__credits__ = [ "Le Tuan Anh" ]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "Le Tuan Anh"
+__email__ = "<tuananh.ke@gmail.com>"
+__status__ = "Prototype"
+
+########################################################################
+
+
+import unittest
+from collections import Counter
+from itctk import itc, CompactDocument
+try:
+    import numpy
+    from itctk.stats import compute_stats, count_ngrams, decode_keys
+except ImportError:
+    numpy = None
+
+########################################################################
+
+TEST_FILE = 'data/test.tsv'
+
+
+def count_loop(doc, unit, n):
+    counts = Counter()
+    for sent in doc:
+        units = [unit(w) for w in sent]
+        for i in range(len(units) - n + 1):
+            counts[units[i] if n == 1 else tuple(units[i:i + n])] += 1
+    return dict(counts)
+
+
+@unittest.skipIf(numpy is None, "NumPy is not installed")
+class TestStats(unittest.TestCase):
+
+    def test_count_ngrams(self):
+        # two sentences: [1 2 3] [3 1], bigrams must not cross the boundary
+        keys, counts = count_ngrams([1, 2, 3, 3, 1], [0, 3, 5], 2, 4)
+        self.assertEqual(decode_keys(keys, 2, 4).tolist(), [[1, 2], [2, 3], [3, 1]])
+        self.assertEqual(counts.tolist(), [1, 1, 1])
+        keys, counts = count_ngrams([1, 2], [0, 2], 3, 4)
+        self.assertEqual(len(keys), 0)
+
+    def test_counts(self):
+        doc = itc(TEST_FILE, cache=False)
+        stats = compute_stats(doc)
+        units = {'word': lambda w: w.text, 'pos': lambda w: w.pos, 'word_pos': lambda w: (w.text, w.pos)}
+        for kind, unit in units.items():
+            for n in (1, 2, 3):
+                self.assertEqual(stats.ngrams(kind, n).to_dict(), count_loop(doc, unit, n))
+        self.assertEqual(stats.frequencies('pos', 1), [('NN', 105)])
+        self.assertEqual(stats.ngrams('pos', 2)[('NN', 'VB')], count_loop(doc, units['pos'], 2)[('NN', 'VB')])
+        self.assertEqual(stats.ngrams('word', 1)['tidak-ada'], 0)
+        self.assertEqual(stats.lexicon_sizes()['NN'], len(set(w.text for w in doc.words if w.pos == 'NN')))
+        self.assertRaises(ValueError, stats.ngrams, 'word', 4)
+
+    def test_transition_matrix(self):
+        stats = compute_stats(itc(TEST_FILE, cache=False), max_n=2)
+        tags = stats.tags
+        self.assertEqual(tags[:3], ['CC', 'CD', 'OD'])
+        matrix = stats.transition_matrix()
+        self.assertEqual(matrix.shape, (len(tags), len(tags)))
+        self.assertEqual(matrix[tags.index('NN'), tags.index('VB')], stats.ngrams('pos', 2)[('NN', 'VB')])
+        probs = stats.transition_matrix(normalize=True)
+        self.assertAlmostEqual(probs[tags.index('NN')].sum(), 1.0)
+
+    def test_merge(self):
+        doc = itc(TEST_FILE, cache=False)
+        whole = compute_stats(doc)
+        merged = compute_stats(CompactDocument.from_sentences(doc.sentences[:10])) + compute_stats(CompactDocument.from_sentences(doc.sentences[10:]))
+        self.assertEqual((merged.sentence_count, merged.token_count), (whole.sentence_count, whole.token_count))
+        for key in whole.counts:
+            self.assertEqual(merged.counts[key].to_dict(), whole.counts[key].to_dict())
+        self.assertTrue((merged.transition_matrix() == whole.transition_matrix()).all())
+
+
+########################################################################
+
+def main():
+    unittest.main()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+Script for testing the synthetic corpus generator of the benchmark suite
+Latest version can be found at https://github.com/neocl/itctk
+
+References:
+    Python documentation:
+        https://docs.python.org/
+    Python unittest
+        https://docs.python.org/3/library/unittest.html
+    --
+    argparse module:
+        https://docs.python.org/3/howto/argparse.html
+    PEP 257 - Python Docstring Conventions:
+        https://www.python.org/dev/peps/pep-0257/
+
+@author: Le Tuan Anh <tuananh.ke@gmail.com>
+'''
+
+# Copyright (c) 2016, Le Tuan Anh <tuananh.ke@gmail.com>
+#
+#Permission is hereby granted, free of charge, to any person obtaining a copy
+#of this software and associated documentation files (the "Software"), to deal
+#in the Software without restriction, including without limitation the rights
+#to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#copies of the Software, and to permit persons to whom the Software is
+#furnished to do so, subject to the following conditions:
+#
+#The above copyright notice and this permission notice shall be included in
+#all copies or substantial portions of the Software.
+#
+#THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#THE SOFTWARE.
+
+__author__ = "Le Tuan Anh <tuananh.ke@gmail.com>"
+__copyright__ = "Copyright 2016, itctk"
+__credits__ = [ "Le Tuan Anh" ]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "Le Tuan Anh"
+__email__ = "<tuananh.ke@gmail.com>"
+__status__ = "Prototype"
+
+########################################################################
+
+
+import os
+import shutil
+import tempfile
+import unittest
+from itctk import parse_data, POS_TAGSET
+from bench.synthetic import generate, corpus_file, parse_size
+from bench.run import compare
+
+########################################################################
+
+
+class TestSynthetic(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_generate(self):
+        paths = [os.path.join(self.tmpdir, name) for name in ('a.tsv', 'b.tsv', 'c.tsv')]
+        count = generate(paths[0], 5000)
+        generate(paths[1], 5000)
+        generate(paths[2], 5000, seed=7)
+        with open(paths[0], 'rb') as a, open(paths[1], 'rb') as b, open(paths[2], 'rb') as c:
+            content = a.read()
+            self.assertEqual(content, b.read())
+            self.assertNotEqual(content, c.read())
+        doc = parse_data(paths[0], compact=True)
+        self.assertEqual(len(doc), count)
+        self.assertGreaterEqual(len(doc.token_ids), 5000)
+        self.assertLess(len(doc.token_ids), 5100)
+        self.assertTrue(set(doc.tagset) <= set(POS_TAGSET))
+        self.assertGreater(len(doc.tagset), 15)
+        self.assertTrue(all(str(sent).endswith('./Z') for sent in doc))
+
+    def test_corpus_file(self):
+        path = corpus_file(1000, directory=self.tmpdir)
+        self.assertEqual(os.path.basename(path), 'synthetic-1000-42.tsv')
+        self.assertEqual(corpus_file(1000, directory=self.tmpdir), path)
+        self.assertEqual(parse_size('10k'), 10000)
+        self.assertEqual(parse_size('1.5M'), 1500000)
+
+    def test_compare(self):
+        baseline = {'results': [{'name': 'parse', 'tokens': 10, 'seconds': 1.0}, {'name': 'find', 'tokens': 10, 'seconds': 0.001}]}
+        report = {'results': [{'name': 'parse', 'tokens': 10, 'seconds': 1.5}, {'name': 'find', 'tokens': 10, 'seconds': 0.002}]}
+        self.assertEqual([r['name'] for r in compare(report, baseline)], ['parse'])
+        self.assertEqual(compare(report, baseline, threshold=2.0), [])
+
+
+########################################################################
+
+def main():
+    unittest.main()
+
+if __name__ == "__main__":
+    main()